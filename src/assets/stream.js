@@ -0,0 +1,57 @@
+// Live LLL reduction (lattice_reduction/stream.py): opens the server-sent
+// events of the session and appends each frame to the figure of the panel
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    stream: {
+        start: function (n_clicks, url) {
+            if (!n_clicks || !url) {
+                return window.dash_clientside.no_update;
+            }
+            // One stream at a time
+            if (window.avacpqStream) {
+                window.avacpqStream.close();
+            }
+            const source = new EventSource(url);
+            window.avacpqStream = source;
+            let finished = false;
+            let started = false;
+            const status = function (text) {
+                window.dash_clientside.set_props('stream-status', {children: text});
+            };
+            source.addEventListener('frame', function (message) {
+                const graph = document.querySelector('#stream-graph .js-plotly-plot');
+                if (!graph) {
+                    // The panel left the page (next step or reset)
+                    source.close();
+                    return;
+                }
+                started = true;
+                const frame = JSON.parse(message.data);
+                Plotly.extendTraces(graph, {
+                    x: [frame.steps, frame.steps, frame.steps],
+                    y: [frame.log_potential, frame.hadamard_ratio, frame.root_hermite]
+                }, [0, 1, 2]);
+                const last = frame.events[frame.events.length - 1];
+                status(`${frame.operations} operações, ${frame.swaps} trocas` +
+                       (last ? ` (última: ${last.join(' ')})` : ''));
+            });
+            source.addEventListener('done', function (message) {
+                const done = JSON.parse(message.data);
+                finished = true;
+                source.close();
+                status(`Concluída: ${done.operations} operações, ${done.swaps} trocas ` +
+                       `em ${done.time.toFixed(2)} s`);
+            });
+            // Without this the browser would reconnect and reduce again
+            source.onerror = function () {
+                source.close();
+                if (!started) {
+                    // 429 (too many streams): EventSource hides the status
+                    status('Não foi possível iniciar: tente novamente em instantes.');
+                } else if (!finished) {
+                    status('Conexão perdida.');
+                }
+            };
+            return 'Conectando…';
+        }
+    }
+});
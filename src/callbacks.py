@@ -1,12 +1,15 @@
-from dash import html, State, dcc, callback, no_update
+from dash import html, State, dcc, callback, no_update, ClientsideFunction
 import plotly.graph_objects as go
 import numpy as np
-from dash.dependencies import Input, Output
+from dash.dependencies import Input, Output, MATCH
 from dash.exceptions import PreventUpdate
 import json
 from flask_login import current_user
 from lattice_based.algorithms import BaseAlgorithm
+from lattice_based.formatting import array_chunks
+from lattice_based.session import bundle_name, export_session, load_session, session_path
 from lattice_reduction.methods import LatticeBasedMethod
+from jobs import POLL_INTERVAL, run_session, session_data
 
 # Graph with no data
 def blank_figure():
@@ -24,7 +27,19 @@ def not_supported(algorithm_selected):
                     ]),
                     None,
                     True,
-                    False)
+                    False,
+                    None)
+
+# Data of the session in the store, which holds either the data itself or a
+# reference to it (a saved bundle or the session of a background job)
+def resolve_session(dados_carry):
+    if isinstance(dados_carry, str):
+        dados_carry = json.loads(dados_carry)
+    if dados_carry.get('bundle'):
+        return load_session(session_path(dados_carry['bundle']))
+    if dados_carry.get('job'):
+        return session_data(dados_carry)
+    return dados_carry
 
 def get_callbacks(app):
 
@@ -33,63 +48,157 @@ def get_callbacks(app):
     # with the selected algorithm or method's data.
     # If no algorithm or method is selected, it returns a message
     # indicating that the selection is invalid.
+    # The initialization runs as a background job (see jobs.py): the page polls
+    # its progress, Reset cancels it, and the store only receives the job key
+    # of the session, whose data stays in the job cache.
     @app.callback(
         [Output('visualization-results', 'children'),
         Output('keygen-data', 'data', allow_duplicate=True), 
         Output('btn-next', 'disabled', allow_duplicate=True),
-        Output('start', 'disabled', allow_duplicate=True)],
+        Output('start', 'disabled', allow_duplicate=True),
+        Output('rendered-step', 'data', allow_duplicate=True)],
         Input('start', 'n_clicks'),
         [State('checklist-Algorithms', 'value'),
         State('checklist-Methods', 'value'),
         State('keygen-data', 'data'),
         State('algorithm-dimension', 'value')],
+        background=True,
+        progress=[Output('job-progress', 'value'),
+                  Output('job-status', 'children')],
+        running=[(Output('job-progress', 'style'), {'display': 'block'}, {'display': 'none'}),
+                 (Output('reset-btn', 'children'), "Cancelar", "Reset")],
+        cancel=[Input('reset-btn', 'n_clicks')],
+        interval=POLL_INTERVAL,
         prevent_initial_call=True,
         allow_duplicate=True
         )
-    def generate_data(n_clicks, algorithm_selected, method_selected, dados_carry, dimension):
+    def generate_data(set_progress, n_clicks, algorithm_selected, method_selected, dados_carry, dimension):
         if n_clicks is None:
             raise PreventUpdate
 
+        def progress(fraction, label):
+            set_progress((round(100 * fraction), label))
+
         if algorithm_selected:
             algorithm = BaseAlgorithm.get_algorithm_by_name(algorithm_selected, dimension)
             if algorithm:
                 # Dados_carry is a dictionary of data
                 # Is essential the field ('algorithm' or 'method') and 'dimension' to be present
-                dados_carry = algorithm.initialize(dimension)
-                return '', json.dumps(dados_carry), False, True
+                dados_carry = run_session(algorithm, dimension, progress=progress)
+                set_progress((100, "Sessão pronta."))
+                return '', json.dumps(dados_carry), False, True, None
             else:
                 return not_supported(algorithm_selected)
 
         if method_selected:
             method = LatticeBasedMethod.get_method_by_name(method_selected, dimension)
             if method:
-                dados_carry = method.initialize(dimension)
-                return '', json.dumps(dados_carry), False, True
+                dados_carry = run_session(method, dimension, progress=progress)
+                set_progress((100, "Sessão pronta."))
+                return '', json.dumps(dados_carry), False, True, None
             else:
                 return not_supported(method_selected)
 
-        return '', None, True, False
+        return '', None, True, False, None
+
+    # Opens a saved session instead of initializing a new one. The store only
+    # keeps the name of the bundle: every step reopens it (memory-mapped), so
+    # large sessions never go through the browser.
+    @app.callback(
+        [Output('visualization-results', 'children', allow_duplicate=True),
+        Output('keygen-data', 'data', allow_duplicate=True),
+        Output('btn-next', 'disabled', allow_duplicate=True),
+        Output('start', 'disabled', allow_duplicate=True),
+        Output('rendered-step', 'data', allow_duplicate=True)],
+        Input('session-bundle', 'value'),
+        prevent_initial_call=True
+        )
+    def load_saved_session(name):
+        if not name:
+            raise PreventUpdate
+        try:
+            bundle = load_session(session_path(name))
+        except OSError:
+            return (html.Div(className="not-supported", children=[
+                        html.H3(f"Sessão '{name}' não encontrada.")]),
+                    None, True, False, None)
+        except (ValueError, KeyError) as error:
+            return (html.Div(className="not-supported", children=[
+                        html.H3(f"Sessão '{name}' não pôde ser aberta."),
+                        html.P(str(error))]),
+                    None, True, False, None)
+        reference = {'bundle': name, 'dimension': bundle['dimension']}
+        for field in ('algorithm', 'method'):
+            if field in bundle:
+                reference[field] = bundle[field]
+        return '', json.dumps(reference), False, True, None
+
+    # Saves the current session as a bundle in the sessions directory
+    @app.callback(
+        Output('export-status', 'children'),
+        Input('export-btn', 'n_clicks'),
+        State('keygen-data', 'data'),
+        prevent_initial_call=True
+        )
+    def export_current_session(n_clicks, dados_carry):
+        if not n_clicks or dados_carry is None:
+            raise PreventUpdate
+        if isinstance(dados_carry, str):
+            dados_carry = json.loads(dados_carry)
+        if dados_carry.get('bundle'):
+            return f"Sessão já salva: {dados_carry['bundle']}"
+        dados_carry = resolve_session(dados_carry)
+        name = bundle_name(dados_carry)
+        export_session(dados_carry, session_path(name))
+        return f"Sessão exportada: {name}"
+
+    # Loads the full text of a summarized matrix of the step panels, a chunk
+    # of rows more at each click (the text is formatted and kept on the server)
+    @app.callback(
+        Output({'type': 'matrix-text', 'key': MATCH}, 'children'),
+        Input({'type': 'matrix-more', 'key': MATCH}, 'n_clicks'),
+        State({'type': 'matrix-more', 'key': MATCH}, 'id'),
+        prevent_initial_call=True
+        )
+    def load_matrix_text(n_clicks, component_id):
+        return array_chunks(component_id['key'], n_clicks)
+
+    # Starts the live reduction of the LLL panel: the browser opens the
+    # server-sent events and extends the figure itself (assets/stream.js)
+    app.clientside_callback(
+        ClientsideFunction(namespace='stream', function_name='start'),
+        Output('stream-status', 'children'),
+        Input('stream-btn', 'n_clicks'),
+        State('stream-url', 'data'),
+        prevent_initial_call=True
+        )
 
     # Handles the step-by-step execution of the algorithm demonstration.
     # On each step, this callback:
     # 1. Processes the main data ('dados_carry') based on the algorithm and step number.
     # 2. Updates the 'visualization-results' with a graph or text.
     # 3. Updates the 'step-content' with a description of the current action.
+    # 4. When the page shows the previous step of the same session, the algorithm
+    #    may send only what the step adds to the visualization (a dash.Patch).
     @app.callback(
          [Output('visualization-results', 'children', allow_duplicate=True),
          Output('step-content', 'children', allow_duplicate=True),
-         Output('btn-next', 'n_clicks', allow_duplicate=True)],
+         Output('btn-next', 'n_clicks', allow_duplicate=True),
+         Output('rendered-step', 'data', allow_duplicate=True)],
          Input('btn-next', 'n_clicks'),
          State('keygen-data', 'data'),
+         State('rendered-step', 'data'),
         prevent_initial_call=True
         )
-    def Process_sign(step,dados_carry):
+    def Process_sign(step,dados_carry,rendered):
             if dados_carry is None:
                 raise PreventUpdate
-            if isinstance(dados_carry, str):
-                dados_carry = json.loads(dados_carry)
+            dados_carry = resolve_session(dados_carry)
+            session = dados_carry.get('seed')
+            shown = {'session': session, 'step': step}
 
             dimension = dados_carry.get('dimension', 2)
+            algorithm_instance = method_instance = None
             if dados_carry.get('algorithm', ''):
                 algorithm_name = dados_carry.get('algorithm', '')
                 algorithm_instance = BaseAlgorithm.get_algorithm_by_name(algorithm_name, dimension)
@@ -102,21 +211,24 @@ def get_callbacks(app):
             # The result of function process_step is a tuple 
             # with the figure and the step description
             if algorithm_instance:
-                result = algorithm_instance.process_step(step, dados_carry)
+                if session is not None and rendered == {'session': session, 'step': step - 1}:
+                    result = algorithm_instance.process_step_patch(step, dados_carry)
+                else:
+                    result = algorithm_instance.process_step(step, dados_carry)
                 max_step = algorithm_instance.get_max_steps()
                 if step >= max_step:
-                    return result[0], result[1], 0
+                    return result[0], result[1], 0, shown
                 else:
-                    return result[0], result[1], step
+                    return result[0], result[1], step, shown
             elif method_instance:
                 result = method_instance.process_step(step, dados_carry)
                 max_step = method_instance.get_max_steps()
                 if step >= max_step:
-                    return result[0], result[1], 0
+                    return result[0], result[1], 0, shown
                 else:
-                    return result[0], result[1], step
+                    return result[0], result[1], step, shown
             else:
-                return blank_figure(), "Algoritmo ou método não encontrado.", 0
+                return blank_figure(), "Algoritmo ou método não encontrado.", 0, None
 
             
     # Both callbacks below are used to disable the checklist of algorithms or methods
@@ -174,13 +286,17 @@ def get_callbacks(app):
      Output('checklist-Algorithms', 'value'),
      Output('checklist-methods-wrapper', 'style',allow_duplicate=True),
      Output('checklist-algorithms-wrapper', 'style',allow_duplicate=True),
+     Output('session-bundle', 'value'),
+     Output('export-status', 'children'),
+     Output('job-status', 'children', allow_duplicate=True),
+     Output('rendered-step', 'data', allow_duplicate=True),
     ],
      Input('reset-btn', 'n_clicks'),
      prevent_initial_call=True
     )
     def ResetSystem(clicks):
         if clicks:            
-            return '', '', None, 0, True,False,None,{"pointerEvents": "auto", "opacity": 1},{"pointerEvents": "auto", "opacity": 1}
+            return '', '', None, 0, True,False,None,{"pointerEvents": "auto", "opacity": 1},{"pointerEvents": "auto", "opacity": 1}, None, '', '', None
 
     # Callback for user status
     @app.callback(
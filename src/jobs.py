@@ -0,0 +1,85 @@
+"""
+Long computations of the interface, run as Dash background callbacks.
+
+``initialize`` of a large GGH, or an LLL/BKZ run, takes far longer than an
+HTTP request should. The callbacks that start them are declared with
+``background=True``: the manager runs each one in its own process, the page
+polls it for progress, and the Reset button cancels it (killing the process).
+
+The manager keeps its jobs in a disk cache shared by all the processes.
+The sessions produced by the jobs are stored there too, under their job key
+(algorithm or method, dimension and seed), so the browser store only holds
+that key and every step reads the session from the cache. A session evicted
+from the cache is replayed from its seed.
+"""
+import os
+import diskcache
+from dash import DiskcacheManager
+from lattice_based.algorithms import BaseAlgorithm
+from lattice_reduction.methods import LatticeBasedMethod
+
+# Directory of the disk cache (jobs of the manager and sessions)
+JOB_CACHE_DIR = os.environ.get('AVACPQ_JOB_CACHE', 'job-cache')
+
+# Seconds a session stays in the cache after its job ends
+SESSION_EXPIRE = 24 * 60 * 60
+
+# Milliseconds between two polls of a running job by the page
+POLL_INTERVAL = 500
+
+cache = diskcache.Cache(JOB_CACHE_DIR)
+
+background_callback_manager = DiskcacheManager(cache)
+
+
+def job_key(reference):
+    """Cache key of the session of a job: kind, name, dimension and seed."""
+    kind = 'algorithm' if reference.get('algorithm') else 'method'
+    return ('session', kind, reference[kind], reference['dimension'], reference['seed'])
+
+
+def job_reference(data):
+    """The few fields of a session that go to the browser store instead of its data."""
+    if data.get('algorithm'):
+        reference = BaseAlgorithm.session_key(data)
+    else:
+        reference = LatticeBasedMethod.session_key(data)
+    return {'job': True, **reference}
+
+
+def run_session(instance, dimension, seed=None, progress=None):
+    """
+    Initializes a session and stores it in the cache.
+
+    Args:
+        instance (BaseAlgorithm | LatticeBasedMethod): The algorithm or method.
+        dimension (int): Dimension of the session.
+        seed (str): Seed of the session (a new one if None).
+        progress (callable): Receives (fraction, label) while ``initialize`` runs.
+
+    Returns:
+        dict: The job reference of the session (see ``job_reference``).
+    """
+    instance.progress = progress
+    data = instance.initialize(dimension, seed=seed)
+    reference = job_reference(data)
+    cache.set(job_key(reference), data, expire=SESSION_EXPIRE)
+    return reference
+
+
+def session_data(reference):
+    """
+    Data of the session of a job reference.
+
+    Read from the cache, or replayed from the seed (and stored again) if the
+    cache no longer has it.
+    """
+    key = job_key(reference)
+    data = cache.get(key)
+    if data is None:
+        if reference.get('algorithm'):
+            data = BaseAlgorithm.replay(reference)
+        else:
+            data = LatticeBasedMethod.replay(reference)
+        cache.set(key, data, expire=SESSION_EXPIRE)
+    return data
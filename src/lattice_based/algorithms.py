@@ -4,10 +4,18 @@ from dash import html
 
 class BaseAlgorithm(ABC):
     """Base class for algorithms in the application."""
+
+    # Called with (fraction, label) during ``initialize`` when it runs as a background job
+    progress = None
     
     @abstractmethod
-    def initialize(self, dimension=2):
-        """Initializes the algorithm with the necessary parameters."""
+    def initialize(self, dimension=2, seed=None):
+        """
+        Initializes the algorithm with the necessary parameters.
+
+        All the randomness comes from ``session_sampler(seed)`` and the seed
+        is returned in the data, so ``replay`` regenerates the same data.
+        """
         pass
     
     @abstractmethod
@@ -15,6 +23,15 @@ class BaseAlgorithm(ABC):
         """Processes a specific step of the algorithm and returns visualization."""
         pass
     
+    def process_step_patch(self, step, data):
+        """
+        Processes a step when the page already shows step - 1 of the same session.
+
+        Algorithms whose steps only add to the previous figure may return a
+        ``dash.Patch`` with the additions instead of the whole figure.
+        """
+        return self.process_step(step, data)
+
     @property
     @abstractmethod
     def step_phases(self):
@@ -37,12 +54,35 @@ class BaseAlgorithm(ABC):
         if name == 'GGH':
             from lattice_based.ggh.ggh import GGH
             return GGH(dimension)
+        elif name == 'Ataque GGH':
+            from lattice_based.ggh.attack import GGHAttack
+            return GGHAttack(dimension)
+        elif name == 'NTRU':
+            from lattice_based.ntru.ntru import NTRU
+            return NTRU(dimension)
         elif name == 'LWE':
             return None  # Implement LWE when needed
         elif name == 'Alkaline':
             return None  # Implement Alkaline when needed
         else:
             return None
+
+    @staticmethod
+    def session_key(data):
+        """The few fields that determine a session: algorithm, dimension and seed."""
+        return {'algorithm': data['algorithm'], 'dimension': data['dimension'], 'seed': data['seed']}
+
+    @classmethod
+    def replay(cls, key):
+        """Regenerates the data of a session from its ``session_key``."""
+        algorithm = cls.get_algorithm_by_name(key['algorithm'], key['dimension'])
+        return algorithm.initialize(key['dimension'], seed=key['seed'])
+
+    def report_progress(self, fraction, label):
+        """Reports how far ``initialize`` is (0 to 1) to the ``progress`` callback, if any."""
+        if self.progress is not None:
+            self.progress(fraction, label)
+
     def get_max_steps(self):
         """Returns the maximum number of steps for the algorithm."""
         # Finds the highest 'end' value across all phases
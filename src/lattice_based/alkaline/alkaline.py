@@ -0,0 +1,75 @@
+import numpy as np
+from lattice_based import modq
+from lattice_based.sampling import Sampler
+
+
+class Alkaline:
+    """
+    Batched version of the Alkaline cipher of ``lattice-based/Alkaline.py``.
+
+    Keys, messages and ciphertexts carry a leading batch axis, so many runs
+    of the cipher are simulated at once.
+    """
+
+    def __init__(self, n=4, k=2, q=23, eta=1, sampler=None):
+        """
+        Args:
+            n (int): Degree of the polynomials.
+            k (int): Dimension of the module.
+            q (int): The modulus.
+            eta (int): The centered binomial parameter.
+            sampler (Sampler): Source of randomness (defaults to the system CSPRNG).
+        """
+        self.n = n
+        self.k = k
+        self.q = q
+        self.eta = eta
+        self.sampler = sampler or Sampler()
+
+    def error_poly(self, shape):
+        """Small polynomials with ``centered_binomial(eta)`` coefficients."""
+        return self.sampler.centered_binomial(self.eta, tuple(shape) + (self.n,))
+
+    def keygen(self, batch):
+        """
+        Generates ``batch`` key pairs: t = A·s + e.
+
+        Returns:
+            tuple: The public keys (A, t) and the secret keys s.
+        """
+        A = self.sampler.uniform_mod(self.q, (batch, self.k, self.k, self.n))
+        s = self.error_poly((batch, self.k))
+        e = self.error_poly((batch, self.k))
+        t = modq.add(modq.poly_vec_dot(A, s[:, None], self.q), modq.reduce(e, self.q), self.q)
+        return (A, t), s
+
+    def encrypt(self, pubkey, messages):
+        """
+        Encrypts binary polynomials: u = Aᵗ·r + e1, v = tᵗ·r + e2 + ⎣q/2⎦·m.
+
+        Args:
+            pubkey (tuple): Arrays A of shape (batch, k, k, n) and t of shape (batch, k, n).
+            messages (numpy.ndarray): Bits of shape (batch, n).
+
+        Returns:
+            tuple: u of shape (batch, k, n) and v of shape (batch, n).
+        """
+        A, t = pubkey
+        batch = len(messages)
+        r = self.error_poly((batch, self.k))
+        e1 = self.error_poly((batch, self.k))
+        e2 = self.error_poly((batch,))
+        A_transposed = np.swapaxes(A, 1, 2)
+        u = modq.add(modq.poly_vec_dot(A_transposed, r[:, None], self.q), modq.reduce(e1, self.q), self.q)
+        noisy = modq.add(modq.poly_vec_dot(t, r, self.q), modq.reduce(e2, self.q), self.q)
+        v = modq.add(noisy, (self.q // 2) * messages, self.q)
+        return u, v
+
+    def residual(self, privkey, u, v):
+        """Value seen by the decoder: v - sᵗ·u mod q."""
+        return modq.sub(v, modq.poly_vec_dot(privkey, u, self.q), self.q)
+
+    def decrypt(self, privkey, u, v):
+        """Decrypts with the rule of Alkaline.py: min(1, round(x / ⎣q/2⎦))."""
+        diff = self.residual(privkey, u, v)
+        return np.minimum(1, np.round(diff / (self.q // 2))).astype(int)
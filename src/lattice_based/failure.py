@@ -0,0 +1,224 @@
+"""
+Exact decryption-failure probabilities for the LWE and Alkaline demos.
+
+Instead of running the schemes many times and counting the failures, the
+noise that reaches the decoder is described by its probability mass function
+(PMF) and convolved exactly. A PMF is represented by a pair ``(probs, low)``
+where ``probs[i]`` is the probability of the value ``low + i``.
+"""
+from functools import lru_cache
+import numpy as np
+
+
+def centered_binomial_pmf(eta):
+    """
+    PMF of ``centered_binomial(eta)``: the sum of eta differences of two bits.
+
+    Args:
+        eta (int): The noise parameter.
+
+    Returns:
+        tuple: ``(probs, low)`` with support ``[-eta, eta]``.
+    """
+    probs = np.ones(1)
+    for _ in range(2 * eta):
+        probs = np.convolve(probs, [0.5, 0.5])
+    return probs, -eta
+
+
+def uniform_pmf(low, high):
+    """
+    PMF of an integer drawn uniformly from ``[low, high]`` (inclusive).
+    """
+    size = high - low + 1
+    return np.full(size, 1.0 / size), low
+
+
+def add_pmf(a, b):
+    """PMF of ``X + Y`` for independent X ~ a and Y ~ b."""
+    return np.convolve(a[0], b[0]), a[1] + b[1]
+
+
+def negate_pmf(a):
+    """PMF of ``-X`` for X ~ a."""
+    probs, low = a
+    return probs[::-1].copy(), -(low + len(probs) - 1)
+
+
+def product_pmf(a, b):
+    """
+    PMF of ``X * Y`` for independent X ~ a and Y ~ b.
+
+    The outer product of both PMFs is accumulated with ``np.bincount`` over
+    the products of the supports, so no Python loop is involved.
+    """
+    xs = np.arange(len(a[0])) + a[1]
+    ys = np.arange(len(b[0])) + b[1]
+    values = np.multiply.outer(xs, ys).ravel()
+    weights = np.multiply.outer(a[0], b[0]).ravel()
+    low = int(values.min())
+    return np.bincount(values - low, weights=weights), low
+
+
+def repeat_add_pmf(a, count):
+    """
+    PMF of the sum of ``count`` independent copies of X ~ a.
+
+    Uses binary exponentiation, so only O(log count) convolutions are needed.
+    """
+    result = (np.ones(1), 0)
+    power = a
+    while count:
+        if count & 1:
+            result = add_pmf(result, power)
+        count >>= 1
+        if count:
+            power = add_pmf(power, power)
+    return result
+
+
+def fold_pmf(a, q):
+    """
+    Reduces a PMF modulo q.
+
+    Returns:
+        numpy.ndarray: Array of length q with the probability of each residue.
+    """
+    probs, low = a
+    residues = (np.arange(len(probs)) + low) % q
+    return np.bincount(residues, weights=probs, minlength=q)
+
+
+def lwe_decoder(q):
+    """Decoding table of ``Decrypt`` in 1BitLWE.py: bit 1 iff res > q/2."""
+    return (np.arange(q) > q / 2).astype(int)
+
+
+def alkaline_decoder(q):
+    """Decoding table of ``decrypt`` in Alkaline.py: ``min(1, round(x / (q // 2)))``."""
+    return np.minimum(1, np.round(np.arange(q) / (q // 2))).astype(int)
+
+
+def centered_decoder(q):
+    """
+    Decoding table of the usual rule: bit 1 iff x is closer to q/2 than to 0.
+    """
+    x = np.arange(q)
+    distance_to_zero = np.minimum(x, q - x)
+    return (np.abs(x - q // 2) < distance_to_zero).astype(int)
+
+
+DECODERS = {
+    'lwe': lwe_decoder,
+    'alkaline': alkaline_decoder,
+    'centered': centered_decoder,
+}
+
+
+def failure_from_noise(noise, q, decoder):
+    """
+    Computes the exact failure probability of each message bit.
+
+    The residue seen by the decoder is ``(noise + (q // 2) * m) mod q``.
+
+    Args:
+        noise (tuple): PMF of the noise that reaches the decoder.
+        q (int): The modulus.
+        decoder (str): One of the keys of ``DECODERS``.
+
+    Returns:
+        tuple: The failure probabilities for m = 0 and m = 1.
+    """
+    table = DECODERS[decoder](q)
+    residues = fold_pmf(noise, q)
+    failures = []
+    for m in (0, 1):
+        decoded = np.roll(table, -(q // 2) * m)
+        failures.append(float(residues[decoded != m].sum()))
+    return tuple(failures)
+
+
+@lru_cache(maxsize=256)
+def alkaline_noise_pmf(n, k, eta):
+    """
+    PMF of one coefficient of the Alkaline decryption noise ``e·r + e2 - s·e1``.
+
+    Each coefficient of a product in Z[x]/(x^n + 1) is a signed sum of n
+    independent products of two ``centered_binomial(eta)`` values, and both
+    inner products run over k polynomials. The product PMF is symmetric, so
+    the signs of the negacyclic reduction do not change the distribution.
+    The result does not depend on q and is cached, so a sweep over q only
+    pays for the final folding.
+    """
+    cbd = centered_binomial_pmf(eta)
+    terms = repeat_add_pmf(product_pmf(cbd, cbd), 2 * k * n)
+    return add_pmf(terms, cbd)
+
+
+def alkaline_failure_probability(n, k, q, eta, decoder='alkaline'):
+    """
+    Exact failure probabilities of Alkaline for the parameters (n, k, q, eta).
+
+    Args:
+        n (int): Degree of the polynomials.
+        k (int): Dimension of the module.
+        q (int): The modulus.
+        eta (int): The centered binomial parameter.
+        decoder (str): ``'alkaline'`` for the rule used in Alkaline.py or
+            ``'centered'`` for the usual distance-based rule.
+
+    Returns:
+        dict: Per-bit and per-coefficient failure probabilities, and for a
+        whole message of n coefficients both the union bound and the value
+        obtained assuming independent coefficients.
+    """
+    p0, p1 = failure_from_noise(alkaline_noise_pmf(n, k, eta), q, decoder)
+    coefficient = (p0 + p1) / 2
+    return {
+        'bit_0': p0,
+        'bit_1': p1,
+        'coefficient': coefficient,
+        'message_union_bound': min(1.0, n * coefficient),
+        'message_independent': float(-np.expm1(n * np.log1p(-coefficient))),
+    }
+
+
+def lwe_failure_probability(nvals, q, error_range=(1, 4), sample_size=None, decoder='lwe'):
+    """
+    Exact failure probability of the 1-bit LWE demo.
+
+    ``Encrypt`` adds ``nvals // 4`` distinct pairs of the public key, so the
+    noise is the sum of that many independent errors from ``stepKeyGen``.
+
+    Args:
+        nvals (int): Number of pairs (a, b) in the public key.
+        q (int): The modulus.
+        error_range (tuple): Inclusive range of the errors of ``stepKeyGen``.
+        sample_size (int): Number of sampled pairs (defaults to nvals // 4).
+        decoder (str): One of the keys of ``DECODERS``.
+
+    Returns:
+        dict: The failure probabilities for each bit and for a random bit.
+    """
+    if sample_size is None:
+        sample_size = nvals // 4
+    noise = repeat_add_pmf(uniform_pmf(*error_range), sample_size)
+    p0, p1 = failure_from_noise(noise, q, decoder)
+    return {'bit_0': p0, 'bit_1': p1, 'message': (p0 + p1) / 2}
+
+
+def alkaline_failure_grid(ns, ks, qs, etas, decoder='alkaline'):
+    """
+    Sweeps the coefficient failure probability over a grid of parameters.
+
+    Returns:
+        numpy.ndarray: Array of shape (len(ns), len(ks), len(qs), len(etas)).
+    """
+    grid = np.empty((len(ns), len(ks), len(qs), len(etas)))
+    for a, n in enumerate(ns):
+        for b, k in enumerate(ks):
+            for c, q in enumerate(qs):
+                for d, eta in enumerate(etas):
+                    result = alkaline_failure_probability(n, k, q, eta, decoder)
+                    grid[a, b, c, d] = result['coefficient']
+    return grid
@@ -0,0 +1,178 @@
+"""
+Bounded text of matrices and vectors for the step-by-step panels.
+
+Printing a whole n x n matrix costs O(n²) characters on every step, which
+for n in the hundreds means megabytes of text per click. Arrays of up to
+``FULL_ENTRIES`` entries are still printed whole. Larger ones become a
+summary of constant size (shape, corners, norms and a short hash) with a
+button that fetches the full text from the server, ``CHUNK_ROWS`` rows per
+click. Summaries and chunks are cached per (session, name), so a matrix
+shown again in a later step is not formatted again; ``cached_value`` does
+the same for other values derived from a session (e.g. quality measures).
+"""
+import hashlib
+import math
+from collections import OrderedDict
+import numpy as np
+from dash import html
+
+# Arrays up to this many entries are printed whole
+FULL_ENTRIES = 64
+
+# Rows of the full text sent per click
+CHUNK_ROWS = 16
+
+# Rows and columns shown at each corner of the summary
+EDGE_ITEMS = 3
+
+# Integers with more digits are abbreviated in the summaries
+_MAX_DIGITS = 12
+
+CACHE_SIZE = 256
+
+# (session, name) -> summary, the array and its chunks of full text already formatted
+_CACHE = OrderedDict()
+
+# (session, name) -> any other value computed from a session
+_VALUES = OrderedDict()
+
+
+def _short(x):
+    """An entry of the summary, with huge integers abbreviated."""
+    if isinstance(x, (int, np.integer)):
+        digits = str(int(x))
+        if len(digits.lstrip('-')) > _MAX_DIGITS:
+            return f"{digits[:7]}…({len(digits.lstrip('-'))} dígitos)"
+        return digits
+    return f"{float(x):.4g}"
+
+
+def _digest(array):
+    """Short hash of the values (to tell matrices apart at a glance)."""
+    if array.dtype == object:
+        payload = ','.join(str(int(x)) for x in array.flat).encode()
+    else:
+        payload = np.ascontiguousarray(array).tobytes()
+    return hashlib.sha256(payload).hexdigest()[:12]
+
+
+def _norms(array):
+    """Largest row norm (or the norm of a vector), as text; integer part only for Python integers."""
+    rows = np.atleast_2d(array)
+    if rows.dtype == object:
+        return _short(math.isqrt(max(sum(int(x) * int(x) for x in row) for row in rows)))
+    return f"{float(np.linalg.norm(rows.astype(float), axis=1).max()):.4g}"
+
+
+def _summary(array):
+    corners = np.array2string(array, threshold=0, edgeitems=EDGE_ITEMS, max_line_width=80,
+                              formatter={'all': _short})
+    shape = ' × '.join(str(size) for size in array.shape)
+    kind = 'matriz' if array.ndim > 1 else 'vetor'
+    label = 'maior norma de linha' if array.ndim > 1 else 'norma'
+    return corners, f"{kind} {shape}, {label} = {_norms(array)}, hash {_digest(array)}"
+
+
+def _remember(key, value, cache=_CACHE):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def cached_value(session, name, compute):
+    """
+    A value derived from a session, computed once per (session, name).
+
+    Args:
+        session (str): Identifier of the session; without it nothing is cached.
+        name (str): Name of the value in the session.
+        compute (callable): Returns the value (called only on a cache miss).
+
+    Returns:
+        The value returned by ``compute``.
+    """
+    if session is None:
+        return compute()
+    key = (str(session), name)
+    if key in _VALUES:
+        _VALUES.move_to_end(key)
+        return _VALUES[key]
+    value = compute()
+    _remember(key, value, _VALUES)
+    return value
+
+
+def format_array(array, name, session=None, precision=2):
+    """
+    Text of an array for a step panel.
+
+    Args:
+        array (array_like | callable): A vector or a matrix, or a function
+            returning it (called only when the summary is not cached, so an
+            inverse shown at every step is computed once).
+        name (str): Name of the array in the session (part of the cache key).
+        session (str): Identifier of the session (e.g. its seed); without it nothing is cached.
+        precision (int): Decimals of the floats printed whole.
+
+    Returns:
+        str | dash component: The whole text for small arrays, otherwise a
+        summary with a button that loads the full text in chunks.
+    """
+    key = None if session is None else (str(session), name)
+    if key is not None and key in _CACHE:
+        _CACHE.move_to_end(key)
+        corners, details = _CACHE[key]['corners'], _CACHE[key]['details']
+    else:
+        array = np.asarray(array() if callable(array) else array)
+        if array.size <= FULL_ENTRIES:
+            return np.array2string(array, precision=precision, suppress_small=True, separator=', ')
+        corners, details = _summary(array)
+        if key is not None:
+            _remember(key, {'corners': corners, 'details': details, 'array': array, 'chunks': {}})
+    children = [html.Div(corners, style={'whiteSpace': 'pre'}), html.Div(f"({details})")]
+    if key is not None:
+        chunk_id = f"{key[0]}/{name}"
+        children.append(html.Details([
+            html.Summary("Texto completo"),
+            html.Div(id={'type': 'matrix-text', 'key': chunk_id},
+                     style={'whiteSpace': 'pre', 'overflowX': 'auto', 'maxHeight': '300px'}),
+            html.Button("Carregar mais linhas", id={'type': 'matrix-more', 'key': chunk_id}, n_clicks=0)
+        ]))
+    return html.Div(children, style={'display': 'inline-block', 'verticalAlign': 'top'})
+
+
+def _row_text(row):
+    return ' '.join(_full(x) for x in row)
+
+
+def _full(x):
+    return str(int(x)) if isinstance(x, (int, np.integer)) else f"{float(x):.6g}"
+
+
+def array_chunks(chunk_id, count):
+    """
+    Full text of the first ``count`` chunks of a summarized array.
+
+    Args:
+        chunk_id (str): The key of the expansion (``session/name``).
+        count (int): Chunks of ``CHUNK_ROWS`` rows wanted.
+
+    Returns:
+        str: The rows, or a notice if the array left the cache.
+    """
+    session, _, name = chunk_id.partition('/')
+    entry = _CACHE.get((session, name))
+    if entry is None:
+        return "A matriz saiu do cache: avance um passo para vê-la novamente."
+    rows = np.atleast_2d(entry['array'])
+    chunks = entry['chunks']
+    total = (len(rows) + CHUNK_ROWS - 1) // CHUNK_ROWS
+    for index in range(min(count, total)):
+        if index not in chunks:
+            start = index * CHUNK_ROWS
+            chunks[index] = '\n'.join(f"[{i}] {_row_text(rows[i])}"
+                                      for i in range(start, min(start + CHUNK_ROWS, len(rows))))
+    text = '\n'.join(chunks[index] for index in range(min(count, total)))
+    remaining = len(rows) - min(count, total) * CHUNK_ROWS
+    return text + (f"\n... {remaining} linhas restantes" if remaining > 0 else '')
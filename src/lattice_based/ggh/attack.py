@@ -0,0 +1,337 @@
+"""
+Ciphertext attack on GGH with the embedding technique (Nguyen, 1999).
+
+The ciphertext c = m·U + e is close to the lattice of the public key U, so
+the lattice generated by the rows of
+
+    [ U  0 ]
+    [ c  M ]
+
+contains the short vector (e, M) = (c, M) - (m·U, 0). Lattice reduction of
+this embedding basis finds it when the error is small compared to the
+lattice, and then m = (c - e)·U⁻¹.
+"""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+import numpy as np
+from dash import html, dcc
+from lattice_based.algorithms import BaseAlgorithm
+from lattice_based.formatting import format_array
+from lattice_based.ggh.ggh import GGH, generate_random_plaintext, plot_vectors, matrix_to_table
+from lattice_based.multimodular import solve_exact
+from lattice_reduction.bkz import bkz_reduce
+from lattice_reduction.lll import lll_reduce
+
+
+def embedding_basis(public_key, ciphertext, factor=1):
+    """
+    Kannan embedding of a ciphertext in the lattice of the public key.
+
+    Args:
+        public_key (array_like): The public basis U (integer).
+        ciphertext (array_like): The ciphertext c (integer).
+        factor (int): The embedding factor M.
+
+    Returns:
+        list: The (n + 1) x (n + 1) basis as rows of Python integers.
+    """
+    rows = [[int(round(x)) for x in row] + [0] for row in np.asarray(public_key)]
+    rows.append([int(round(x)) for x in np.asarray(ciphertext)] + [int(factor)])
+    return rows
+
+
+def extract_plaintext(reduced, public_key, ciphertext, factor=1, error_bound=1):
+    """
+    Looks for a row (±e, ±M) of the reduced basis that decrypts the ciphertext.
+
+    Every such row is a lattice vector, so c - e is always in the lattice
+    of U: only the size of e tells the real error apart. A candidate is
+    accepted if its entries are within ``error_bound`` and (c - e)·U⁻¹,
+    solved exactly, is an integer vector.
+
+    Args:
+        reduced (list): The reduced embedding basis.
+        public_key (array_like): The public basis U.
+        ciphertext (array_like): The ciphertext c.
+        factor (int): The embedding factor M.
+        error_bound (int): Largest |e_i| of the encryption.
+
+    Returns:
+        tuple: The plaintext and the error (lists of Python integers), or None.
+    """
+    U = np.array([[int(round(x)) for x in row] for row in np.asarray(public_key)], dtype=object)
+    c = [int(round(x)) for x in np.asarray(ciphertext)]
+    for row in sorted(reduced, key=lambda row: sum(x * x for x in row)):
+        if abs(row[-1]) != factor or max(abs(x) for x in row[:-1]) > error_bound:
+            continue
+        sign = 1 if row[-1] == factor else -1
+        error = [sign * x for x in row[:-1]]
+        target = np.array([a - b for a, b in zip(c, error)], dtype=object)
+        numerators, denominator = solve_exact(U.T, target)
+        if denominator == 1:
+            return [int(x) for x in numerators], error
+    return None
+
+
+def attack(public_key, ciphertext, factor=1, block_sizes=(10, 20), error_bound=1):
+    """
+    Embedding attack: LLL first, then BKZ with growing block sizes if needed.
+
+    Args:
+        public_key (array_like): The public basis U.
+        ciphertext (array_like): The ciphertext c.
+        factor (int): The embedding factor M.
+        block_sizes (tuple): BKZ block sizes tried after the LLL.
+        error_bound (int): Largest |e_i| of the encryption (see ``extract_plaintext``).
+
+    Returns:
+        dict: The embedding basis, the reduced basis, the reduction that
+        succeeded ('LLL', 'BKZ-β' or None), the recovered plaintext and error,
+        and the time of each stage in seconds.
+    """
+    timings = {}
+    start = time.perf_counter()
+    basis = embedding_basis(public_key, ciphertext, factor)
+    timings['embedding'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reduced = lll_reduce(basis)
+    timings['LLL'] = time.perf_counter() - start
+    method = 'LLL'
+    start = time.perf_counter()
+    found = extract_plaintext(reduced, public_key, ciphertext, factor, error_bound)
+    recovery = time.perf_counter() - start
+    for block_size in block_sizes:
+        if found is not None or block_size > len(basis):
+            break
+        start = time.perf_counter()
+        reduced = bkz_reduce(reduced, block_size)
+        method = f'BKZ-{block_size}'
+        timings[method] = time.perf_counter() - start
+        start = time.perf_counter()
+        found = extract_plaintext(reduced, public_key, ciphertext, factor, error_bound)
+        recovery += time.perf_counter() - start
+    timings['recovery'] = recovery
+
+    plaintext, error = found if found is not None else (None, None)
+    return {
+        'embedding': basis,
+        'reduced': reduced,
+        'method': method if found is not None else None,
+        'plaintext': plaintext,
+        'error': error,
+        'timings': timings,
+    }
+
+
+# Attack results per session of this process, for session data without the
+# attack fields (bundles saved before they were added)
+_SESSION_CACHE = OrderedDict()
+SESSION_CACHE_SIZE = 64
+
+
+def _fingerprint(public_key, ciphertext):
+    payload = json.dumps([np.asarray(public_key).tolist(), np.asarray(ciphertext).tolist()])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cached_attack(session, public_key, ciphertext, factor=1):
+    """
+    ``attack`` cached per session (the most recent sessions are kept).
+
+    The entry of a session is replaced when its instance changes, so a
+    session holds one attack at a time.
+    """
+    fingerprint = _fingerprint(public_key, ciphertext)
+    entry = _SESSION_CACHE.get(session)
+    if entry is None or entry[0] != fingerprint:
+        entry = (fingerprint, attack(public_key, ciphertext, factor))
+        _SESSION_CACHE[session] = entry
+        while len(_SESSION_CACHE) > SESSION_CACHE_SIZE:
+            _SESSION_CACHE.popitem(last=False)
+    _SESSION_CACHE.move_to_end(session)
+    return entry[1]
+
+
+def store_attack(data, result):
+    """
+    Keeps an ``attack`` result in the session data.
+
+    The bases become fields of their own, so a saved bundle stores them as
+    arrays; the rest (reduction, plaintext, error, timings) goes in ``attack``.
+    """
+    data['attack_embedding'] = result['embedding']
+    data['attack_reduced'] = result['reduced']
+    data['attack'] = {key: result[key] for key in ('method', 'plaintext', 'error', 'timings')}
+
+
+def session_attack(data):
+    """The ``attack`` result of a session, from its data or else from ``cached_attack``."""
+    if 'attack' in data:
+        return {'embedding': data['attack_embedding'], 'reduced': data['attack_reduced'], **data['attack']}
+    return cached_attack(data['session'], data['U'], data['ciphertext'])
+
+
+def attack_sweep(dimensions, error_bounds, trials=5, block_sizes=(10, 20), progress=None):
+    """
+    Runs the attack on fresh GGH instances for each dimension and error bound.
+
+    Args:
+        dimensions (list): Dimensions n of the instances.
+        error_bounds (list): Bounds e of the errors (entries in [-e, e]).
+        trials (int): Instances per pair (n, e).
+        block_sizes (tuple): BKZ block sizes tried after the LLL.
+        progress (callable): Called with each row of the result.
+
+    Returns:
+        list: One dict per pair (n, e) with the success rate, the reductions
+        that succeeded and the mean time of each stage (key generation and
+        encryption included).
+    """
+    rows = []
+    for n in dimensions:
+        ggh = GGH(n)
+        for bound in error_bounds:
+            timings = {}
+            successes = 0
+            methods = {}
+            for _ in range(trials):
+                start = time.perf_counter()
+                B, B_prime, U, _ = ggh.generate_keys()
+                plaintext = generate_random_plaintext(n, ggh.rand, ggh.sampler)
+                ciphertext = ggh.encrypt(U, plaintext, ggh.generate_error(bound))
+                timings['keygen'] = timings.get('keygen', 0) + time.perf_counter() - start
+                result = attack(U, ciphertext, block_sizes=block_sizes, error_bound=bound)
+                for stage, seconds in result['timings'].items():
+                    timings[stage] = timings.get(stage, 0) + seconds
+                if result['plaintext'] is not None and np.array_equal(result['plaintext'], plaintext):
+                    successes += 1
+                    methods[result['method']] = methods.get(result['method'], 0) + 1
+            row = {
+                'dimension': n,
+                'error_bound': bound,
+                'success_rate': successes / trials,
+                'methods': methods,
+                'timings': {stage: seconds / trials for stage, seconds in timings.items()},
+            }
+            rows.append(row)
+            if progress is not None:
+                progress(row)
+    return rows
+
+
+class GGHAttack(BaseAlgorithm):
+    """
+    Walk-through of the embedding attack on a fresh GGH instance.
+
+    The instance comes from ``GGH.initialize``; only the public key and the
+    ciphertext are used by the attack, the private data is kept to compare
+    at the end.
+    """
+
+    def __init__(self, n):
+        self.n = n
+
+    @property
+    def step_phases(self):
+        """Phases of the attack."""
+        return {
+            'instance': (0, 1),    # Public key and ciphertext
+            'embedding': (2, 2),   # Embedding basis
+            'reduction': (3, 3),   # Reduced basis
+            'recovery': (4, 5)     # Error and plaintext
+        }
+
+    def initialize(self, dimension=2, seed=None):
+        self.n = dimension
+        ggh = GGH(dimension)
+        # The instance takes a small part of the time, the attack the rest
+        if self.progress is not None:
+            ggh.progress = lambda fraction, label: self.progress(0.2 * fraction, label)
+        data = ggh.initialize(dimension, seed)
+        data['algorithm'] = 'Ataque GGH'
+        data['session'] = data['seed']
+        # Runs the attack now and keeps it in the session data, which the job
+        # stores in its cache, so the steps (in the web process) read it from there
+        self.report_progress(0.2, "Executando o ataque")
+        store_attack(data, attack(data['U'], data['ciphertext']))
+        return data
+
+    def process_step(self, step, data):
+        """Processes a step of the attack (the result comes from the session data)."""
+        result = session_attack(data)
+        phase, _ = self.get_phase_for_step(step)
+        U = np.array(data['U'])
+        ciphertext = np.array(data['ciphertext'])
+
+        if phase == 'embedding':
+            output_fig = html.Div([matrix_to_table(np.array(result['embedding'], dtype=float),
+                                                   "Base de Imersão [[U, 0], [c, M]]")])
+        elif phase == 'reduction':
+            output_fig = html.Div([matrix_to_table(np.array(result['reduced'], dtype=float),
+                                                   f"Base Reduzida ({result['method'] or 'falhou'})")])
+        elif data['dimension'] == 2:
+            vectors = [{'matrix': U, 'color': 'blue', 'dash': None, 'prefix': 'Chave Pública'},
+                       {'point': ciphertext, 'color': 'yellow', 'prefix': 'Ciphertext'}]
+            if phase == 'recovery' and result['plaintext'] is not None:
+                vectors.append({'point': np.dot(result['plaintext'], U), 'color': 'green', 'prefix': 'm × U'})
+            fig = plot_vectors({step: vectors}, step, 2, True, title='Ataque ao GGH')
+            output_fig = dcc.Graph(figure=fig)
+        else:
+            tables = [matrix_to_table(U.astype(float), "Chave Pública"),
+                      matrix_to_table(np.array([ciphertext]), "Ciphertext")]
+            if phase == 'recovery' and result['plaintext'] is not None:
+                tables.insert(0, matrix_to_table(np.array([result['plaintext']], dtype=float),
+                                                 "Mensagem Recuperada"))
+            output_fig = html.Div(tables)
+        return output_fig, attack_steps_content(data, result, step)
+
+
+def attack_steps_content(data, result, step):
+    """Generates the step by step text of the attack."""
+    style = {'fontFamily': 'monospace', 'text-align': 'left'}
+    session = data.get('seed')
+    content = [html.Div([
+        html.H5("Passo 1: Dados Públicos"),
+        html.Div(["U = ", format_array(data['U'], 'U', session), html.Br(),
+                  "ciphertext = ", format_array(data['ciphertext'], 'ciphertext', session)], style=style)
+    ], className='step-box')]
+
+    if step >= 2:
+        content.insert(0, html.Div([
+            html.H5("Passo 2: Imersão de Kannan"),
+            html.P(["O reticulado das linhas [[U, 0], [c, M]] contém o vetor curto (e, M),",
+                    html.Br(), "pois (c, M) - (m × U, 0) = (e, M)"], style=style)
+        ], className='step-box'))
+
+    if step >= 3:
+        timings = ", ".join(f"{stage}: {seconds * 1000:.1f} ms" for stage, seconds in result['timings'].items())
+        content.insert(0, html.Div([
+            html.H5("Passo 3: Redução da Base"),
+            html.P([f"redução usada = {result['method'] or 'nenhuma encontrou o erro'}", html.Br(),
+                    f"tempos = {timings}"], style=style)
+        ], className='step-box'))
+
+    if step >= 4 and result['error'] is not None:
+        content.insert(0, html.Div([
+            html.H5("Passo 4: Erro Encontrado"),
+            html.Div(["linha (±e, ±M) da base reduzida: e = ", format_array(result['error'], 'found_error', session),
+                      html.Br(), "erro real = ", format_array(data['error'], 'error', session)], style=style)
+        ], className='step-box'))
+
+    if step >= 5:
+        if result['plaintext'] is not None:
+            lines = ["m = (c - e) × U⁻¹ = ", format_array(result['plaintext'], 'found_plaintext', session), html.Br(),
+                     "plaintext real = ", format_array(data['plaintext'], 'plaintext', session)]
+        else:
+            lines = ["O ataque não encontrou o erro: aumente o tamanho do bloco do BKZ"]
+        content.insert(0, html.Div([
+            html.H5("Passo 5: Recuperação da Mensagem"),
+            html.Div(lines, style=style)
+        ], className='step-box'))
+
+    return html.Div([html.H3("Passo a Passo", className="algorithm-title"),
+        html.H4("Ataque de Imersão ao GGH"),
+        *content], style={'marginTop': '5px', 'color': 'white', 'fontWeight': 'bold'})
@@ -1,23 +1,49 @@
+import math
 import numpy as np
-from dash import html,dash_table, dcc
+from dash import html,dash_table, dcc, Patch
 import plotly.graph_objects as go
 from numpy.linalg import inv
-import secrets
 from datetime import datetime
 from lattice_based.algorithms import BaseAlgorithm
+from lattice_based.formatting import cached_value, format_array
+from lattice_based.sampling import Sampler, session_sampler
+from lattice_based.multimodular import inverse_exact, integer_array, round_division, solve_exact
+from lattice_reduction.cvp import babai_solver
+from lattice_reduction.hnf import cyclic_hermite_form, hermite_normal_form, is_hermite_normal_form, reduce_modulo_hnf
+from lattice_reduction.quality import basis_quality, quality_panel
+
+def hash_to_points(messages, n, scale=1 << 16):
+    """
+    Hashes messages to integer points of [0, scale)^n.
+
+    Each message seeds a SHAKE-256 ``Sampler``, so the point is a
+    deterministic function of the message.
+
+    Args:
+        messages (list): Messages (bytes or str).
+        n (int): The dimension.
+        scale (int): Bound of the coordinates.
+
+    Returns:
+        numpy.ndarray: The (m x n) int64 points.
+    """
+    return np.array([Sampler(message).uniform_below(scale, n) for message in messages], dtype=np.int64).reshape(-1, n)
 
-def generate_random_plaintext(n, r):
+
+def generate_random_plaintext(n, r, sampler=None):
     """
     Generates a random plaintext vector of specified dimensions and range.
 
     Args:
         n (int): The number of dimensions for the plaintext vector.
         r (int): The range for the random values in the plaintext vector.
+        sampler (Sampler): Source of randomness (defaults to the system CSPRNG).
 
     Returns:
         numpy.ndarray: The generated random plaintext vector.
     """
-    plaintext = np.array([secrets.randbelow(r) - (r / 2) for _ in range(n)])
+    sampler = sampler or Sampler()
+    plaintext = sampler.uniform_below(r, n) - (r / 2)
     return plaintext
 
 
@@ -28,57 +54,87 @@ class GGH(BaseAlgorithm):
     The GGH class provides functionalities for generating keys, encrypting and
     decrypting messages using the GGH encryption system. It operates on vectors
     in a lattice-based cryptosystem.
+
+    In exact mode the bases, plaintexts and ciphertexts are integer object
+    arrays and every inverse or linear solve is done by multi-modular
+    arithmetic (``lattice_based.multimodular``), so nothing depends on the
+    conditioning of B or U.
     """
 
-    def __init__(self, n):
+    # Dimension from which the exact mode is the default
+    EXACT_DIMENSION = 64
+
+    def __init__(self, n, exact=None, rounds=None):
         """
         Initializes the GGH encryption system with the specified dimensionality.
 
         Args:
             n (int): The number of dimensions for the lattice vectors.
+            exact (bool): Use exact integer arithmetic (defaults to
+                n >= ``EXACT_DIMENSION``).
+            rounds (int): Row operations mixing the unimodular matrix
+                (defaults to 2n).
         """
         self.n = n
         self.rand = 20
-    def generate_random_matrix(self, r):
+        self.sampler = Sampler()
+        self.exact = n >= self.EXACT_DIMENSION if exact is None else exact
+        self.rounds = rounds
+    def generate_unimodular_matrix(self, rounds=None):
         """
-        Generates a random matrix of size (n x n) with elements in the range [0, r).
+        Generates a random unimodular matrix (integer, determinant ±1).
+
+        The identity is mixed by random row operations row_i += c * row_j with
+        c in {-2, -1, 1, 2}, which keep the determinant.
         """
-        matrix = np.array(
-            [[secrets.randbelow(r) for _ in range(self.n)] for _ in range(self.n)]
-        )
-        while np.linalg.matrix_rank(matrix) != self.n:
-            matrix = np.array(
-                [[secrets.randbelow(r) for _ in range(self.n)] for _ in range(self.n)]
-            )
+        rounds = rounds or self.rounds or 2 * self.n
+        matrix = np.eye(self.n, dtype=np.int64)
+        if self.exact:
+            matrix = matrix.astype(object)
+        if self.n < 2:
+            return matrix
+        pairs = self.sampler.uniform_below(self.n, (rounds, 2))
+        factors = self.sampler.uniform(1, 2, rounds) * (2 * self.sampler.uniform_below(2, rounds) - 1)
+        for (i, j), c in zip(pairs, factors):
+            if i == j:
+                j = (i + 1) % self.n
+            matrix[i] += int(c) * matrix[j]
         return matrix
-    def generate_keys(self):
-        """
-        Generates the lattice basis B' and computes the public key U.
 
-        Returns:
-            tuple: A tuple containing the desired lattice basis B' (numpy.ndarray)
-                   and the public key U (numpy.ndarray).
+    def generate_private_basis(self, r):
         """
-        # Choose r automatically within a reasonable range
-        
-        r = 11
-        # print(f"Chosen r: {r}")
+        Generates a good (almost orthogonal) basis B' = k·I + R.
 
-        # Given lattice basis
-        B = self.generate_random_matrix(r)
+        R has entries in [-r/2, r/2] and k = r * ceil(sqrt(n)), so the rows
+        are dominated by the diagonal and Babai's algorithm on B' corrects
+        small errors.
+        """
+        k = r * int(np.ceil(np.sqrt(self.n)))
+        basis = k * np.eye(self.n, dtype=np.int64) + self.sampler.uniform(-(r // 2), r // 2, (self.n, self.n))
+        return integer_array(basis) if self.exact else basis
 
-        # print("Lattice basis B:", B)
+    def generate_keys(self):
+        """
+        Generates the private basis B' and computes the public key U = B × B'.
 
-        # Desired lattice basis
-        B_prime = self.generate_random_matrix(r)
-        # print("Desired lattice basis B_prime:", B_prime)
+        B is a random unimodular matrix, so U is another (bad) basis of the
+        same lattice as the good private basis B'.
 
-        # Compute the public key U
-        U = np.dot(B_prime, inv(B))
-        # print("Public key U:", U)
-        
-        public_key_inverse = inv(U)
-        return B,B_prime, U, public_key_inverse
+        Returns:
+            tuple: The unimodular matrix B, the private basis B', the public
+                   key U and its inverse (numpy.ndarray; in exact mode the
+                   inverse is rounded to float64 from the exact one).
+        """
+        r = 11
+        B = self.generate_unimodular_matrix()
+        B_prime = self.generate_private_basis(r)
+        U = np.dot(B, B_prime)
+        if self.exact:
+            numerators, denominator = inverse_exact(U)
+            public_key_inverse = np.array([[x / denominator for x in row] for row in numerators])
+        else:
+            public_key_inverse = inv(U)
+        return B, B_prime, U, public_key_inverse
 
     def generate_error(self, e):
         """
@@ -90,10 +146,10 @@ class GGH(BaseAlgorithm):
         Returns:
             np.array: The generated error vector.
         """
-        error = np.array([secrets.randbelow(2 * e + 1) - e for _ in range(self.n)])
+        error = self.sampler.uniform(-e, e, self.n)
         # print("Error vector:", error)
 
-        return error
+        return integer_array(error) if self.exact else error
 
     def encrypt(self, public_key, plaintext, error):
         """
@@ -107,61 +163,200 @@ class GGH(BaseAlgorithm):
         Returns:
             np.array: The ciphertext resulting from the encryption process.
         """
+        if self.exact:
+            plaintext, public_key, error = integer_array(plaintext), integer_array(public_key), integer_array(error)
         ciphertext = np.dot(plaintext, public_key) + error
         # print("Ciphertext:", ciphertext)
 
         return ciphertext
 
-    def decrypt(self, public_key_inverse, ciphertext):
+    def decrypt(self, private_basis, unimodular, ciphertext, method='nearest_plane'):
         """
-        Decrypt the ciphertext using the public key inverse.
+        Decrypt one ciphertext or an (m x n) stack of ciphertexts.
 
         Args:
-            public_key_inverse (np.array): The inverse of the public key used for decryption.
-            ciphertext (np.array): The encrypted message to be decrypted.
+            private_basis (np.array): The private basis B'.
+            unimodular (np.array): The unimodular matrix B of the key generation.
+            ciphertext (np.array): The encrypted message(s).
+            method (str): ``'nearest_plane'`` or ``'rounding'``.
 
         Returns:
-            np.array: The decrypted plaintext (before Babai rounding).
+            np.array: The recovered plaintext(s).
         """
-        decrypted_plaintext = np.dot(ciphertext, public_key_inverse)
-        # print("Decrypted plaintext (before Babai rounding):", decrypted_plaintext)
+        coefficients = self.babai_rounding(private_basis, ciphertext, method)
+        return self.recover_plaintext(coefficients, unimodular)
 
-        return decrypted_plaintext
+    def babai_rounding(self, private_basis, ciphertext, method='nearest_plane'):
+        """
+        Remove the error finding the lattice vector closest to the ciphertext.
 
-    def babai_rounding(self, decrypted_plaintext, error, inverse_basis):
+        Only the private basis is used: with B' almost orthogonal, Babai's
+        algorithm returns the lattice vector plaintext × U, written in B' as
+        the integer coefficients plaintext × B.
+
+        Args:
+            private_basis (np.array): The private basis B'.
+            ciphertext (np.array): The encrypted message(s).
+            method (str): ``'nearest_plane'`` or ``'rounding'``.
+
+        Returns:
+            np.array: The coefficients of the closest vector in the basis B'.
         """
-        Apply Babai rounding to remove the error term if it's small enough.
+        if self.exact:
+            return self._exact_babai(private_basis, ciphertext, method)
+        solver = babai_solver(private_basis)
+        if method == 'rounding':
+            return solver.rounding(ciphertext)
+        return solver.nearest_plane(ciphertext)
+
+    def recover_plaintext(self, coefficients, unimodular):
+        """
+        Recover the plaintext message multiplying the coefficients by B⁻¹.
 
         Args:
-            decrypted_plaintext (np.array): The decrypted plaintext.
-            error (np.array): The error vector.
-            inverse_basis (np.array): The inverse of the lattice basis used for rounding.
+            coefficients (np.array): The coefficients plaintext × B.
+            unimodular (np.array): The unimodular matrix B (its inverse is integer).
 
         Returns:
-            np.array: The rounded decrypted plaintext.
+            np.array: The recovered plaintext message.
         """
-        rounded_decrypted_plaintext = decrypted_plaintext - np.dot(error, inverse_basis)
-        # print("Rounded decrypted plaintext:", rounded_decrypted_plaintext)
+        if self.exact:
+            # x × B = coefficients, solved exactly (B is unimodular, so x is integer)
+            numerators, _ = solve_exact(integer_array(unimodular).T, integer_array(coefficients).T)
+            return numerators.T
+        unimodular_inverse = np.round(inv(unimodular))
+        plaintext = np.round(np.dot(coefficients, unimodular_inverse)).astype(int)
 
-        return rounded_decrypted_plaintext
+        return plaintext
 
-    def recover_plaintext(self, rounded_decrypted_plaintext, public_key):
+    def generate_hnf_keys(self, attempts=16):
         """
-        Recover the plaintext message by multiplying rounded decrypted plaintext
-        with U-inverse.
+        Generates a private basis B' and Micciancio's public key, the HNF of its lattice.
+
+        Every basis of a lattice has the same HNF, so unlike U = B × B' the
+        public key tells nothing about how it was made. Private bases are
+        drawn until the HNF has the usual form (ones on the diagonal after
+        H[0][0]), so the key is just its first column: the determinant and
+        n - 1 residues below it.
 
         Args:
-            rounded_decrypted_plaintext (np.array): The rounded decrypted plaintext.
-            public_key (np.array): The public key used for encryption.
+            attempts (int): Private bases tried before accepting any HNF.
 
         Returns:
-            np.array: The recovered plaintext message.
+            tuple: The private basis B' and the public key H (object arrays).
         """
-        plaintext = np.dot(rounded_decrypted_plaintext, inv(public_key))
-        plaintext = np.dot(plaintext, public_key)
-        plaintext = np.round(plaintext).astype(int)
+        for _ in range(attempts):
+            B_prime = integer_array(self.generate_private_basis(11))
+            H = cyclic_hermite_form(B_prime)
+            if H is not None:
+                return B_prime, H
+        return B_prime, hermite_normal_form(B_prime)
+
+    def encrypt_hnf(self, public_key, message):
+        """
+        Micciancio's encryption: the message is itself the short error vector.
 
-        return plaintext
+        The ciphertext is the message reduced modulo the HNF (one triangular
+        pass), the unique point of message + L with 0 <= c_i < H[i][i]; with
+        the usual HNF only its first coordinate is nonzero.
+
+        Args:
+            public_key (np.array): The HNF public key H.
+            message (np.array): Short integer vector(s), entries in [-e, e].
+
+        Returns:
+            np.array: The ciphertext(s).
+        """
+        return reduce_modulo_hnf(message, public_key)
+
+    def decrypt_hnf(self, private_basis, ciphertext, method='nearest_plane'):
+        """
+        Recover the message of ``encrypt_hnf``: the ciphertext minus its closest lattice vector.
+
+        The ciphertext has entries up to the determinant, so Babai's
+        algorithm runs in exact arithmetic whatever the mode.
+        """
+        coefficients = self._exact_babai(private_basis, ciphertext, method)
+        return integer_array(ciphertext) - np.dot(coefficients, integer_array(private_basis))
+
+    def signature_radius(self, private_basis):
+        """
+        Distance bound of the signatures, published with the public key.
+
+        Babai rounding leaves h - s = x × B' with x in [-1/2, 1/2]^n, so
+        ||h - s|| <= (1/2) Σ ||b'_i|| for every message.
+        """
+        return 0.5 * sum(math.sqrt(sum(int(x) * int(x) for x in row)) for row in np.asarray(private_basis))
+
+    def sign(self, private_basis, messages, transcript=None):
+        """
+        GGH signatures of a batch of messages: the lattice vectors closest to their hashes.
+
+        Babai rounding against the private basis uses one factorization of
+        B' for the whole (m x n) stack of hashes.
+
+        Args:
+            private_basis (np.array): The private basis B'.
+            messages (list): Messages (bytes or str).
+            transcript (list): If given, receives the differences h - s, which
+                are uniform in the parallelepiped of B' (what a
+                parallelepiped-learning attack collects).
+
+        Returns:
+            np.array: The (m x n) signatures.
+        """
+        hashes = hash_to_points(messages, self.n)
+        if self.exact:
+            signatures = np.dot(self._exact_babai(private_basis, hashes, 'rounding'), integer_array(private_basis))
+        else:
+            signatures = babai_solver(private_basis).closest_vectors(hashes, 'rounding')[1]
+            signatures = np.rint(signatures).astype(np.int64)
+        if transcript is not None:
+            transcript.extend(hashes - signatures)
+        return signatures
+
+    def verify(self, public_key, messages, signatures, radius):
+        """
+        Verifies a batch of signatures against the public basis.
+
+        A signature is valid when it is a lattice vector and it is within
+        ``radius`` of the hash of its message. Membership is checked exactly:
+        with an HNF public key by reducing modulo it, otherwise by solving
+        s = x × U for the whole batch at once and checking x is integer.
+
+        Returns:
+            np.array: One boolean per signature.
+        """
+        signatures = np.atleast_2d(signatures)
+        hashes = hash_to_points(messages, self.n)
+        distances = np.linalg.norm((hashes - signatures).astype(float), axis=1)
+        if is_hermite_normal_form(public_key):
+            member = ~reduce_modulo_hnf(signatures, public_key).any(axis=1)
+        elif self.exact:
+            numerators, denominator = solve_exact(integer_array(public_key).T, integer_array(signatures).T)
+            member = ~(numerators % denominator).any(axis=0)
+        else:
+            coefficients = np.rint(babai_solver(public_key).coordinates(signatures)).astype(np.int64)
+            member = (np.dot(integer_array(coefficients), integer_array(public_key)) == signatures).all(axis=1)
+        return member & (distances <= radius)
+
+    def _exact_babai(self, private_basis, ciphertext, method):
+        """
+        Babai's algorithm without floating point on the large numbers.
+
+        The rounding c × B'⁻¹ is computed exactly. For the nearest plane, the
+        residual of that rounding is small (it is inside the parallelepiped of
+        B'), so the float64 nearest plane on it is safe and its coefficients
+        are added.
+        """
+        private_basis = integer_array(private_basis)
+        ciphertext = integer_array(ciphertext)
+        numerators, denominator = solve_exact(private_basis.T, ciphertext.T)
+        coefficients = round_division(numerators, denominator).T
+        if method == 'rounding':
+            return coefficients
+        residual = (ciphertext - np.dot(coefficients, private_basis)).astype(float)
+        return coefficients + babai_solver(private_basis.astype(float)).nearest_plane(residual)
     @property
     def step_phases(self):
         """Define as fases e limites de steps para o GGH."""
@@ -170,16 +365,22 @@ class GGH(BaseAlgorithm):
             'encrypt': (4, 6),  # Steps 4-6: Encryption
             'decrypt': (7, 10)  # Steps 7-10: Decryption
         }
-    def initialize(self, dimension=2):
+    def initialize(self, dimension=2, seed=None):
         # Update the dimension of the lattice
         self.n = dimension
+        seed, self.sampler = session_sampler(seed)
         
         # Generation of the data for GGH
+        self.report_progress(0, "Gerando as chaves")
         B, B_prime, U, public_key_inverse = self.generate_keys()
+        self.report_progress(0.7, "Cifrando a mensagem")
         error = self.generate_error(e=1)
-        plaintext = generate_random_plaintext(dimension, self.rand)
+        plaintext = generate_random_plaintext(dimension, self.rand, self.sampler)
+        if self.exact:
+            plaintext = integer_array(plaintext)
         ciphertext = self.encrypt(U, plaintext, error) 
-        decrypt = self.decrypt(public_key_inverse, ciphertext)
+        self.report_progress(0.8, "Decifrando a mensagem")
+        decrypt = self.decrypt(B_prime, B, ciphertext)
 
         # Create and return the GGH data dictionary
         ggh_data = {
@@ -192,22 +393,36 @@ class GGH(BaseAlgorithm):
             'error': error.tolist(),
             'ciphertext': ciphertext.tolist(),
             'decrypt': decrypt.tolist(),
+            'exact': self.exact,
+            'seed': seed,
             'algorithm': 'GGH'
         }
         return ggh_data
     # Separate the GGH in steps
-    def process_step(self, step, data):
-        """Processa um step específico reutilizando as funções existentes."""
+    def process_step(self, step, data, patch=False):
+        """
+        Processa um step específico reutilizando as funções existentes.
+
+        With ``patch`` the page already shows step - 1 of this session: when
+        the step only adds vectors or tables, the figure comes back as a
+        ``dash.Patch`` with just those.
+        """
+        self.exact = data.get('exact', False)
         phase, phase_step = self.get_phase_for_step(step)
         if phase == 'keygen':
-            return self._process_keygen(data, phase_step)
+            return self._process_keygen(data, phase_step, patch)
         elif phase == 'encrypt':
-            return self._process_encrypt(data, phase_step)
+            return self._process_encrypt(data, phase_step, patch)
         elif phase == 'decrypt':
-            return self._process_decrypt(data, phase_step)
+            return self._process_decrypt(data, phase_step, patch)
+
+    def process_step_patch(self, step, data):
+        """Processes a step sending only the vectors or tables it adds to step - 1."""
+        return self.process_step(step, data, patch=True)
+
     # Handle plotting of vectors or tables 
     # and call another function to generate the step content
-    def _process_keygen(self, data, step):
+    def _process_keygen(self, data, step, patch=False):
         
         B = np.array(data['B'])
         B_prime = np.array(data['B_prime'])
@@ -216,7 +431,7 @@ class GGH(BaseAlgorithm):
         plaintext = np.array(data['plaintext'])
         if(dimension==2):
             step_vector_mapping = {
-            1: [{'matrix': B, 'color': 'gray', 'dash': None, 'prefix': 'Base Aleatória B'}],
+            1: [{'matrix': B, 'color': 'gray', 'dash': None, 'prefix': 'Matriz Unimodular B'}],
             2: [
                 {'matrix': B_prime, 'color': 'red', 'dash': None, 'prefix': 'Chave Privada' },
             ],
@@ -226,26 +441,28 @@ class GGH(BaseAlgorithm):
                 {'point': plaintext, 'color': 'white', 'prefix': 'Plaintext'}
             ]
                 }
-            fig = plot_vectors(step_vector_mapping, step, dimension,True, title='Bases e Chaves GGH')
-            output_fig = dcc.Graph(figure=fig)
+            output_fig = vectors_patch(step_vector_mapping, step, dimension, True) if patch else None
+            if output_fig is None:
+                fig = plot_vectors(step_vector_mapping, step, dimension,True, title='Bases e Chaves GGH')
+                output_fig = dcc.Graph(figure=fig)
         else:
-            tables = []
-            if(step in [1,2,3]):
-                tables.insert(0,matrix_to_table(B, "Base Aleatória B"))
-            if(step in [2,3]):
-                tables.insert(0,matrix_to_table(B_prime, "Base Privada B'"))
-            if(step in [3]):
-                tables.insert(0,matrix_to_table(U, "Chave Pública"))
-            output_fig = html.Div(tables)
+            # Tables in the order they appear (the last one is shown on top)
+            step_table_mapping = {
+                1: [(B, "Matriz Unimodular B")],
+                2: [(B, "Matriz Unimodular B"), (B_prime, "Base Privada B'")],
+                3: [(B, "Matriz Unimodular B"), (B_prime, "Base Privada B'"), (U, "Chave Pública")]
+            }
+            output_fig = tables_patch(step_table_mapping, step) if patch else None
+            if output_fig is None:
+                output_fig = tables_div(step_table_mapping, step)
         # Generate the content for the keygen step
-        steps_content = generate_keygen_steps_content(B, B_prime, U, step)
+        steps_content = generate_keygen_steps_content(B, B_prime, U, step, data.get('seed'))
 
         return output_fig, steps_content
     # Process the encryption 
-    def _process_encrypt(self, data, step):
+    def _process_encrypt(self, data, step, patch=False):
             dimension = np.array(data['dimension'])
             if(dimension==2):
-                fig = go.Figure()
                 step_vector_mapping = {
                 4: [
                     {'vector': np.dot(data['plaintext'], data['U']), 'color': 'green', 'dash': None, 'prefix': 'plaintext × U'},
@@ -260,72 +477,78 @@ class GGH(BaseAlgorithm):
                     {'vector': data['ciphertext'], 'color': 'yellow', 'dash': None, 'prefix': 'Ciphertext'},
                 ]
                 }
-                fig = plot_vectors(step_vector_mapping, step, dimension, False, title='Encriptação GGH')
-                output_fig = dcc.Graph(figure=fig)
+                output_fig = vectors_patch(step_vector_mapping, step, dimension, False) if patch else None
+                if output_fig is None:
+                    fig = plot_vectors(step_vector_mapping, step, dimension, False, title='Encriptação GGH')
+                    output_fig = dcc.Graph(figure=fig)
             # If dimension is not 2, use tables instead of vectors
             else:
-                tables = []
-                if step in [4, 5, 6]:
-                    plaintext_U = np.dot(data['plaintext'], data['U'])
-                    tables.insert(0,matrix_to_table(np.array([data['plaintext']]), "Plaintext"))
-                if step in [5, 6]:
-                    tables.insert(0,matrix_to_table(np.array([data['error']]), "Erro"))
-                if step == 6:
-                    tables.insert(0,matrix_to_table(np.array([data['ciphertext']]), "Ciphertext"))
-                output_fig = html.Div(tables)
+                plaintext = (np.array([data['plaintext']]), "Plaintext")
+                error = (np.array([data['error']]), "Erro")
+                ciphertext = (np.array([data['ciphertext']]), "Ciphertext")
+                step_table_mapping = {
+                    4: [plaintext],
+                    5: [plaintext, error],
+                    6: [plaintext, error, ciphertext]
+                }
+                output_fig = tables_patch(step_table_mapping, step) if patch else None
+                if output_fig is None:
+                    output_fig = tables_div(step_table_mapping, step)
 
             # Generate the content for the encryption step
             step_content = encrypt_step(data, step)
 
             return output_fig, step_content
     # Process the decryption
-    def _process_decrypt(self, data, step):
+    def _process_decrypt(self, data, step, patch=False):
 
-        U = np.array(data['U'])
-        public_key_inverse = inv(U)
-        decrypted_plaintext = np.dot(data['ciphertext'], public_key_inverse)
-        rounded_decrypted_plaintext = decrypted_plaintext - np.dot(data['error'], public_key_inverse)
-        temp = np.dot(rounded_decrypted_plaintext, public_key_inverse)
-        recovered_plaintext = np.round(np.dot(temp, U)).astype(int)
+        B_prime = np.array(data['B_prime'])
+        coordinates = babai_solver(B_prime).coordinates(data['ciphertext'])
+        coefficients = self.babai_rounding(B_prime, data['ciphertext'])
+        closest_vector = np.dot(coefficients, B_prime)
+        recovered_plaintext = self.recover_plaintext(coefficients, data['B'])
         dimension = np.array(data['dimension'])
         if(dimension==2):
-            fig = go.Figure()
             step_vector_mapping = {
                 7: [
+                    {'matrix': B_prime, 'color': 'red', 'dash': None, 'prefix': 'Chave Privada'},
                     {'vector': data['ciphertext'], 'color': 'yellow', 'dash': None, 'prefix': 'Ciphertext'},
                 ],
                 8: [
+                    {'matrix': B_prime, 'color': 'red', 'dash': None, 'prefix': 'Chave Privada'},
                     {'vector': data['ciphertext'], 'color': 'yellow', 'dash': None, 'prefix': 'Ciphertext'},
-                    {'vector': decrypted_plaintext, 'color': 'purple', 'dash': None, 'prefix': 'Decrypted'},
+                    {'point': closest_vector, 'color': 'blue', 'prefix': 'Vetor Mais Próximo'},
                 ],
                 9: [
                     {'vector': data['ciphertext'], 'color': 'yellow', 'dash': None, 'prefix': 'Ciphertext'},
-                    {'vector': decrypted_plaintext, 'color': 'purple', 'dash': None, 'prefix': 'Decrypted'},
-                    {'vector': rounded_decrypted_plaintext, 'color': 'blue', 'dash': None, 'prefix': 'Rounded'},
+                    {'vector': closest_vector, 'color': 'blue', 'dash': None, 'prefix': 'Vetor Mais Próximo'},
                 ],
                 10: [
-                    {'vector': data['ciphertext'], 'color': 'yellow', 'dash': None, 'prefix': 'Ciphertext'},
-                    {'vector': decrypted_plaintext, 'color': 'purple', 'dash': None, 'prefix': 'Decrypted'},
-                    {'vector': rounded_decrypted_plaintext, 'color': 'blue', 'dash': None, 'prefix': 'Rounded'},
-                    {'vector': recovered_plaintext, 'color': 'green', 'dash': None, 'prefix': 'Recovered'},
+                    {'vector': closest_vector, 'color': 'blue', 'dash': None, 'prefix': 'Vetor Mais Próximo'},
+                    {'point': recovered_plaintext, 'color': 'green', 'prefix': 'Recovered'},
                 ]
             }
-            fig = plot_vectors(step_vector_mapping, step, dimension, False, title='Decriptação GGH')
-            out_fig = dcc.Graph(figure=fig)
+            out_fig = vectors_patch(step_vector_mapping, step, dimension, True) if patch else None
+            if out_fig is None:
+                fig = plot_vectors(step_vector_mapping, step, dimension, True, title='Decriptação GGH')
+                out_fig = dcc.Graph(figure=fig)
         # If dimension is not 2, use tables instead of vectors
         else:
-            tables = []
-            if step in [7, 8, 9, 10]:
-                tables.insert(0,matrix_to_table(np.array([data['ciphertext']]), "Texto Cifrado"))
-            if step in [8, 9, 10]:
-                tables.insert(0,matrix_to_table(np.array([decrypted_plaintext]), "Mensagem Decifrada"))
-            if step in [9, 10]:
-                tables.insert(0,matrix_to_table(np.array([rounded_decrypted_plaintext]), "Arredondamento de Babai"))
-            if step == 10:
-                tables.insert(0,matrix_to_table(np.array([recovered_plaintext]), "Mensagem Recuperada"))
-            out_fig = html.Div(tables)
+            ciphertext = (np.array([data['ciphertext']]), "Texto Cifrado")
+            coordinates = (np.array([coordinates]), "Coordenadas na Base Privada")
+            closest = (np.array([closest_vector]), "Vetor Mais Próximo (Babai)")
+            recovered = (np.array([recovered_plaintext]), "Mensagem Recuperada")
+            step_table_mapping = {
+                7: [ciphertext],
+                8: [ciphertext, coordinates],
+                9: [ciphertext, coordinates, closest],
+                10: [ciphertext, coordinates, closest, recovered]
+            }
+            out_fig = tables_patch(step_table_mapping, step) if patch else None
+            if out_fig is None:
+                out_fig = tables_div(step_table_mapping, step)
         # Generate the content for the decryption step
-        step_content = decrypt_step(data, step)
+        step_content = decrypt_step(data, step, coefficients)
         
         return out_fig, step_content
 
@@ -414,17 +637,52 @@ def plot_vectors(step_vector_mapping, step, dimension, is_matrix=True, title="")
         template='plotly_dark'
     )
     return fig
+# Patch of the figure of plot_vectors from step - 1 to step, or None when
+# the step does not just add vectors to the previous one
+def vectors_patch(step_vector_mapping, step, dimension, is_matrix=True):
+    previous = step_vector_mapping.get(step - 1)
+    current = step_vector_mapping.get(step, [])
+    labels = lambda configs: [(config['prefix'], config['color']) for config in configs]
+    if not previous or len(current) <= len(previous) or labels(current[:len(previous)]) != labels(previous):
+        return None
+    added = plot_vectors({step: current[len(previous):]}, step, dimension, is_matrix)
+    patch = Patch()
+    patch['props']['figure']['data'].extend([trace.to_plotly_json() for trace in added.data])
+    annotations = [annotation.to_plotly_json() for annotation in added.layout.annotations]
+    if annotations:
+        # Points alone draw no arrows, so the previous figure may have no list to extend
+        if plot_vectors({step: previous}, step, dimension, is_matrix).layout.annotations:
+            patch['props']['figure']['layout']['annotations'].extend(annotations)
+        else:
+            patch['props']['figure']['layout']['annotations'] = annotations
+    return patch
+
+# Tables of a step, the last one added on top
+def tables_div(step_table_mapping, step):
+    return html.Div([matrix_to_table(matrix, name)
+                     for matrix, name in reversed(step_table_mapping.get(step, []))])
+
+# Patch inserting on top the tables added since step - 1, or None
+def tables_patch(step_table_mapping, step):
+    previous = [name for _, name in step_table_mapping.get(step - 1, [])]
+    if not previous:
+        return None
+    current = step_table_mapping.get(step, [])
+    if len(current) <= len(previous) or [name for _, name in current[:len(previous)]] != previous:
+        return None
+    patch = Patch()
+    for matrix, name in current[len(previous):]:
+        patch['props']['children'].insert(0, matrix_to_table(matrix, name))
+    return patch
+
 # Function to generate the content for the key generation steps
-def generate_keygen_steps_content(B, B_prime, U, step):
+def generate_keygen_steps_content(B, B_prime, U, step, session=None):
         content = []
 
         if step >= 1:
             content.insert(0,html.Div([
-                html.H5("Passo 1: Base Aleatória B"),
-                html.P(
-                    f"""
-                    B = {np.array2string(B, precision=2, suppress_small=True,separator=', ')}
-                    """,
+                html.H5("Passo 1: Matriz Unimodular Aleatória B (det = ±1)"),
+                html.Div(["B = ", format_array(B, 'B', session)],
                     style={'fontFamily': 'monospace', 
                            'text-align': 'left'}
                         )
@@ -433,33 +691,63 @@ def generate_keygen_steps_content(B, B_prime, U, step):
         if step >= 2:
             content.insert(0,html.Div([
                 html.H5("Passo 2: Base Privada B'"),
-                html.P(
-                    f"""
-                    B' = {np.array2string(B_prime, precision=2, suppress_small=True)}
-                    """,
+                html.Div(["B' = ", format_array(B_prime, 'B_prime', session)],
                     style={'fontFamily': 'monospace','text-align': 'left'}
                 )
             ], className='step-box'))
 
         if step >= 3:
-            B_inv = np.linalg.inv(B)
             content.insert(0,html.Div([
-                html.H5("Passo 3: Cálculo da Chave Pública U = B' × B⁻¹"),
-                html.P([
-                    "U = B' × B⁻¹ =",html.Br(), 
-                    f"{np.array2string(B_prime, precision=2)} × " 
-                    f"{np.array2string(B_inv, precision=2)}",html.Br(), 
-                    f"= {np.array2string(U, precision=2)}"
+                html.H5("Passo 3: Cálculo da Chave Pública U = B × B'"),
+                html.Div([
+                    "U = B × B' =",html.Br(), 
+                    format_array(B, 'B', session), " × ",
+                    format_array(B_prime, 'B_prime', session), html.Br(),
+                    "= ", format_array(U, 'U', session)
                     ],
                     style={'fontFamily': 'monospace','text-align': 'center'}
                 )
             ], className='step-box'))
+            # Same lattice, very different bases: compare their quality
+            content.insert(0, quality_panel(cached_value(session, 'quality_U', lambda: basis_quality(U)),
+                                            "Qualidade da Chave Pública U"))
+            content.insert(0, quality_panel(cached_value(session, 'quality_B_prime', lambda: basis_quality(B_prime)),
+                                            "Qualidade da Base Privada B'"))
+            content.insert(0, hnf_key_panel(B_prime, U, session))
 
         return html.Div([html.H3("Passo a Passo", className="algorithm-title"),
             html.H4("Geração de Chaves"),
             *content] 
         , style={'marginTop': '5px', 'color': 'white', 'fontWeight': 'bold'})
 
+def _bits(matrix):
+    """Total size in bits of the entries of an integer matrix."""
+    return sum(abs(int(x)).bit_length() + 1 for x in np.asarray(matrix).flat if x)
+
+
+def hnf_key_panel(B_prime, U, session=None):
+    """
+    Step box with Micciancio's public key (the HNF of the lattice) next to U.
+
+    The HNF is computed on the first render of step 3 and cached per session,
+    so ``initialize`` does not pay for it.
+    """
+    H = cached_value(session, 'H', lambda: hermite_normal_form(B_prime))
+    bits = cached_value(session, 'bits', lambda: (_bits(U), _bits(H)))
+    if (np.diag(H)[1:] == 1).all():
+        key = html.Div(["H = I com a primeira coluna ", format_array(H[:, 0], 'H_column', session)])
+    else:
+        key = html.Div(["H = ", format_array(H, 'H', session)])
+    return html.Div([
+        html.H5("Chave Pública de Micciancio: H = HNF(B')"),
+        html.P("A forma normal de Hermite é a mesma para qualquer base do reticulado: "
+               "não revela nada de B' e cabe em uma coluna", style={'fontWeight': 'bold'}),
+        html.Div([key,
+                  f"tamanho: U = {bits[0]} bits, H = {bits[1]} bits"],
+               style={'fontFamily': 'monospace', 'text-align': 'left'})
+    ], className='step-box')
+
+
 # Function to convert a matrix to a Dash DataTable
 def matrix_to_table(matrix, name):
     columns = [{"name": f"Dimensão {i+1}", "id": str(i)} for i in range(matrix.shape[1])]
@@ -488,20 +776,18 @@ def matrix_to_table(matrix, name):
 
 # Function to generate the content for the encryption steps
 def encrypt_step(ggh_data, step):
-    plaintext = np.array(ggh_data['plaintext'])
-    error = np.array(ggh_data['error'])
-    U = np.array(ggh_data['U'])
-    ciphertext = np.array(ggh_data['ciphertext'])
+    session = ggh_data.get('seed')
+    plaintext = ggh_data['plaintext']
+    error = ggh_data['error']
+    U = ggh_data['U']
+    ciphertext = ggh_data['ciphertext']
 
     content = []
 
     if step >= 4:
         content.insert(0,html.Div([
             html.H5("Passo 1: Geração da Mensagem Secreta (Plaintext)"),
-            html.P(
-                f"""
-                plaintext = {np.array2string(plaintext, precision=2, suppress_small=True)}
-                """,
+            html.Div(["plaintext = ", format_array(plaintext, 'plaintext', session)],
                 style={'fontFamily': 'monospace','text-align': 'left'}
             )
         ], className='step-box'))
@@ -509,10 +795,7 @@ def encrypt_step(ggh_data, step):
     if step >= 5:
         content.insert(0,html.Div([
             html.H5("Passo 2: Geração do Erro Pequeno (Error)"),
-            html.P(
-                f"""
-                error = {np.array2string(error, precision=2, suppress_small=True)}
-                """,
+            html.Div(["error = ", format_array(error, 'error', session)],
                 style={'fontFamily': 'monospace','text-align': 'left'}
             )
         ], className='step-box'))
@@ -521,11 +804,11 @@ def encrypt_step(ggh_data, step):
         content.insert(0,html.Div([
             html.H5("Passo 3: Cálculo do Ciphertext"),
             html.P("ciphertext = plaintext × U + error = ",style={'fontWeight': 'bold'}),
-            html.P([
-                             f"{np.array2string(plaintext, precision=2)} × " 
-                             f"{np.array2string(U, precision=2)} + " 
-                             f"{np.array2string(error, precision=2)}",html.Br(),   
-                             f"= {np.array2string(ciphertext, precision=2)}"
+            html.Div([
+                             format_array(plaintext, 'plaintext', session), " × ",
+                             format_array(U, 'U', session), " + ",
+                             format_array(error, 'error', session), html.Br(),
+                             "= ", format_array(ciphertext, 'ciphertext', session)
             ],
                 style={'fontFamily': 'monospace','text-align': 'center'}
             )
@@ -536,91 +819,80 @@ def encrypt_step(ggh_data, step):
         *content], style={'marginTop': '5px', 'color': 'white', 'fontWeight': 'bold'})
 
 # Function to generate the content for the decryption steps
-def decrypt_step(ggh_data, step):
-    ciphertext = np.array(ggh_data['ciphertext'])
-    error = np.array(ggh_data['error'])
-    U = np.array(ggh_data['U'])
-    public_key_inverse = inv(U)
+def decrypt_step(ggh_data, step, coefficients=None):
+    session = ggh_data.get('seed')
+    exact = ggh_data.get('exact', False)
+    ciphertext = np.asarray(ggh_data['ciphertext'])
+    B = ggh_data['B']
+    B_prime = np.asarray(ggh_data['B_prime'])
+    solver = babai_solver(B_prime)
     
     content = []
     
     if step >= 7:
         content.insert(0,html.Div([
-            html.H5("Passo 1: Inversa da Chave Pública (U⁻¹)"),
-                html.P("Public Key Inverse",style={'fontWeight': 'bold'}),
+            html.H5("Passo 1: Base Privada (B')"),
+                html.P("Somente o dono da chave privada conhece uma base quase ortogonal do reticulado",style={'fontWeight': 'bold'}),
 
-                html.P(f"U⁻¹ = {np.array2string(public_key_inverse, precision=2, suppress_small=True)}"
+                html.Div(["B' = ", format_array(B_prime, 'B_prime', session)]
                 ,style={'fontFamily': 'monospace','textAlign': 'left'})
     ], className='step-box'))
 
     if step >= 8:
-        decrypted_plaintext = np.dot(ciphertext, public_key_inverse)
         content.insert(0,
     html.Div([
-        html.H5("Passo 2: Multiplicação do ciphertext pela inversa da chave pública"),
+        html.H5("Passo 2: Coordenadas do ciphertext na base privada"),
 
-        html.P([
-            f"ciphertext = {np.array2string(ciphertext, precision=2)}", html.Br(),
-            f"U⁻¹ = {np.array2string(public_key_inverse, precision=2)}"
+        html.Div([
+            "ciphertext = ", format_array(ciphertext, 'ciphertext', session), html.Br(),
+            "B'⁻¹ = ", format_array(lambda: solver.inverse, 'B_prime_inverse', session)
         ], style={'fontFamily': 'monospace', 'textAlign': 'left'}),
 
-        html.P("Decrypted Plaintext", style={'fontWeight': 'bold'}),
+        html.P("Coordenadas reais (plaintext × B + erro × B'⁻¹)", style={'fontWeight': 'bold'}),
 
-        html.P(
-            f"ciphertext × U⁻¹ = {np.array2string(decrypted_plaintext, precision=2)}",
+        html.Div(
+            ["ciphertext × B'⁻¹ = ", format_array(lambda: solver.coordinates(ciphertext), 'coordinates', session)],
             style={'fontFamily': 'monospace', 'textAlign': 'left'}
         )
     ], className="step-box")
 )
 
-
-        if step >= 9:
-            error_component = np.dot(error, public_key_inverse)
-            rounded_decrypted_plaintext = decrypted_plaintext - error_component
-            content.insert(0,html.Div([
-                html.H5("Passo 3: Arredondamento de Babai (Remoção do Erro)"),
-                html.P("Multiplicação do erro pela inversa da chave pública",style={'fontWeight': 'bold'}),
-                html.P([
-                    f"error × U⁻¹ =", html.Br(),
-                    f"{np.array2string(error, precision=2)} × {np.array2string(public_key_inverse, precision=2)} =", html.Br(),
-                    f"{np.array2string(error_component, precision=2)}"
-                ], style={'fontFamily': 'monospace', 'textAlign': 'left'}),
-
-                html.P("Subtração do erro decodificado do plaintext aproximado",style={'fontWeight': 'bold'}),
-                html.P([
-                    f"decrypted_plaintext - (error × U⁻¹) =", html.Br(),
-                    f"{np.array2string(decrypted_plaintext, precision=2)} - {np.array2string(error_component, precision=2)} =", html.Br(),
-                    f"{np.array2string(rounded_decrypted_plaintext, precision=2)}"
-                ], style={'fontFamily': 'monospace', 'textAlign': 'left'})
-            ], className='step-box'))
-
+    if step >= 9:
+        # Babai's coefficients, unless the caller already computed them
+        if coefficients is None and exact:
+            coefficients = GGH(len(B), exact=True).babai_rounding(B_prime, ggh_data['ciphertext'])
+        elif coefficients is None:
+            coefficients = solver.nearest_plane(ciphertext)
+        closest_vector = np.dot(coefficients, B_prime)
+        content.insert(0,html.Div([
+            html.H5("Passo 3: Algoritmo de Babai (Plano Mais Próximo)"),
+            html.P("Os coeficientes são fixados do último ao primeiro com a decomposição QR de B'",style={'fontWeight': 'bold'}),
+            html.Div([
+                "coeficientes = ", format_array(coefficients, 'coefficients', session), html.Br(),
+                "vetor mais próximo = coeficientes × B' =", html.Br(),
+                format_array(closest_vector, 'closest_vector', session), html.Br(),
+                "erro removido = ", format_array(ciphertext - closest_vector, 'removed_error', session)
+            ], style={'fontFamily': 'monospace', 'textAlign': 'left'})
+        ], className='step-box'))
 
     if step >= 10:
-        temp = np.dot(rounded_decrypted_plaintext, public_key_inverse)
-        recovered_plaintext = np.dot(temp, U)
-        recovered_plaintext = np.round(recovered_plaintext).astype(int)
+        recovered_plaintext = GGH(len(B), exact=exact).recover_plaintext(coefficients, B)
+        if exact:
+            B_inverse = lambda: inverse_exact(integer_array(B))[0]
+        else:
+            B_inverse = lambda: np.round(inv(B)).astype(int)
 
         content.insert(0,html.Div([
             html.H5("Passo 4: Recuperação da Mensagem Original"),
-
-                
-                html.P("4.1 Multiplicar pela inversa da chave pública",style={'fontWeight': 'bold'}),
-                html.P([
-                    f"temp = rounded_decrypted_plaintext × U⁻¹",html.Br(),
-                    f"     = {np.array2string(rounded_decrypted_plaintext, precision=2)} ×"
-                    f"       {np.array2string(public_key_inverse, precision=2)}",html.Br(),
-                    f"     = {np.array2string(temp, precision=2)}"]
-                    ,style={'fontFamily': 'monospace','textAlign': 'left'}
-                ),
-                html.P("4.2 Multiplicar por U e arredondar",style={'fontWeight': 'bold'}),
-                html.P([
-                    f"plaintext = round(temp × U)",html.Br(),
-                    f"         = round({np.array2string(temp, precision=2)} ×"
-                    f"                 {np.array2string(U, precision=2)})",html.Br(),
-                    f"         = {np.array2string(recovered_plaintext, precision=2)}"]
+                html.P("Os coeficientes na base B' são plaintext × B; B é unimodular, então B⁻¹ é inteira",style={'fontWeight': 'bold'}),
+                html.Div([
+                    "plaintext = coeficientes × B⁻¹",html.Br(),
+                    "          = ", format_array(coefficients, 'coefficients', session), " × ",
+                    format_array(B_inverse, 'B_inverse', session), html.Br(),
+                    "          = ", format_array(recovered_plaintext, 'recovered_plaintext', session)]
                     ,style={'fontFamily': 'monospace','textAlign': 'left'}
                 )], className='step-box'))
 
     return html.Div([html.H3("Passo a Passo", className="algorithm-title"),
         html.H4("Decriptografia GGH"),
-        *content], style={'marginTop': '5px', 'color': 'white', 'fontWeight': 'bold'})
\ No newline at end of file
+        *content], style={'marginTop': '5px', 'color': 'white', 'fontWeight': 'bold'})
@@ -0,0 +1,92 @@
+"""
+GGH signatures: throughput against encryption, and the leak of the transcripts.
+
+A signature of m is the lattice vector s closest (by Babai rounding with
+the private basis B') to the hash h of m, so h - s = x·B' with x uniform in
+[-1/2, 1/2]^n. Every signature therefore reveals a uniform point of the
+parallelepiped of B', and with enough of them its covariance
+E[vᵀv] = B'ᵀB' / 12 gives away the Gram matrix of the private basis: the
+first step of the parallelepiped-learning attack of Nguyen and Regev (2006).
+"""
+import time
+import numpy as np
+from lattice_based.ggh.ggh import GGH, generate_random_plaintext
+
+
+def benchmark(n, batch=100, repeats=3, exact=None):
+    """
+    Operations per second of signing and verifying, against encryption and decryption.
+
+    All four operations run on stacks of ``batch`` vectors with one key, so
+    the factorization of each basis is paid once per key, as in a real
+    signer. The best of ``repeats`` runs is kept.
+
+    Args:
+        n (int): The dimension.
+        batch (int): Messages per call.
+        repeats (int): Runs of each operation.
+        exact (bool): Exact arithmetic (defaults to the choice of ``GGH``).
+
+    Returns:
+        dict: Operations per second of 'sign', 'verify', 'encrypt' and
+        'decrypt', and the fraction of signatures accepted.
+    """
+    ggh = GGH(n, exact=exact)
+    B, B_prime, U, _ = ggh.generate_keys()
+    radius = ggh.signature_radius(B_prime)
+    messages = [f"mensagem {i}" for i in range(batch)]
+    plaintexts = np.array([generate_random_plaintext(n, 11, ggh.sampler) for _ in range(batch)])
+    errors = np.array([ggh.generate_error(3) for _ in range(batch)])
+
+    def best(operation):
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = operation()
+            times.append(time.perf_counter() - start)
+        return batch / min(times), result
+
+    rates = {}
+    rates['sign'], signatures = best(lambda: ggh.sign(B_prime, messages))
+    rates['verify'], accepted = best(lambda: ggh.verify(U, messages, signatures, radius))
+    rates['encrypt'], ciphertexts = best(lambda: ggh.encrypt(U, plaintexts, errors))
+    rates['decrypt'], _ = best(lambda: ggh.decrypt(B_prime, B, ciphertexts, 'rounding'))
+    rates['accepted'] = float(np.mean(accepted))
+    return rates
+
+
+def collect_transcript(ggh, private_basis, count, batch=256):
+    """
+    Signs ``count`` random messages and keeps the differences h - s.
+
+    Args:
+        ggh (GGH): The instance that signs.
+        private_basis (np.array): The private basis B'.
+        count (int): Number of signatures.
+        batch (int): Messages signed per call.
+
+    Returns:
+        numpy.ndarray: The (count x n) transcript, points of the parallelepiped of B'.
+    """
+    transcript = []
+    for start in range(0, count, batch):
+        messages = [ggh.sampler.random_bytes(16).tobytes() for _ in range(min(batch, count - start))]
+        ggh.sign(private_basis, messages, transcript)
+    return np.array(transcript, dtype=float)
+
+
+def estimate_gram(transcript):
+    """
+    Estimate of the Gram matrix B'ᵀB' from a transcript (12 times its covariance).
+
+    The error of each entry falls as 1 / sqrt(number of signatures).
+    """
+    V = np.asarray(transcript, dtype=float)
+    return 12 * (V.T @ V) / len(V)
+
+
+def gram_error(estimate, private_basis):
+    """Relative error (Frobenius norm) of an estimate of B'ᵀB'."""
+    B_prime = np.asarray(private_basis, dtype=float)
+    gram = B_prime.T @ B_prime
+    return float(np.linalg.norm(estimate - gram) / np.linalg.norm(gram))
@@ -0,0 +1,71 @@
+import numpy as np
+from lattice_based import modq
+from lattice_based.sampling import Sampler
+
+
+class LWE:
+    """
+    Batched version of the 1-bit LWE of ``lattice-based/1_Bit_LWE/1BitLWE.py``.
+
+    The same key generation, encryption and decryption are applied to whole
+    arrays of keys and messages at once, so many runs can be simulated
+    without Python loops.
+    """
+
+    def __init__(self, nvals=20, q=97, s=20, error_range=(1, 4), sampler=None):
+        """
+        Args:
+            nvals (int): Number of pairs (a, b) in the public key.
+            q (int): The prime modulus.
+            s (int): The secret key.
+            error_range (tuple): Inclusive range of the errors of ``stepKeyGen``.
+            sampler (Sampler): Source of randomness (defaults to the system CSPRNG).
+        """
+        self.nvals = nvals
+        self.q = q
+        self.s = s
+        self.error_range = error_range
+        self.sampler = sampler or Sampler()
+
+    def _distinct(self, population, count, shape):
+        """Draws ``count`` distinct values of range(population) for each entry of shape."""
+        keys = self.sampler.uniform_below(1 << 32, tuple(shape) + (population,))
+        return np.argsort(keys, axis=-1)[..., :count]
+
+    def keygen(self, batch):
+        """
+        Generates ``batch`` public keys with distinct values a, like ``KeyGen``.
+
+        Returns:
+            tuple: Arrays A, B and E of shape (batch, nvals).
+        """
+        A = self._distinct(self.q, self.nvals, (batch,))
+        E = self.sampler.uniform(*self.error_range, (batch, self.nvals))
+        B = modq.add(modq.mul(A, self.s % self.q, self.q), modq.reduce(E, self.q), self.q)
+        return A, B, E
+
+    def encrypt(self, A, B, messages):
+        """
+        Encrypts bits summing a quarter of the public key, like ``Encrypt``.
+
+        Args:
+            A (numpy.ndarray): Values a of shape (batch, nvals).
+            B (numpy.ndarray): Values b of shape (batch, nvals).
+            messages (numpy.ndarray): Bits of shape (batch, per_key).
+
+        Returns:
+            tuple: Arrays u and v of shape (batch, per_key).
+        """
+        indices = self._distinct(self.nvals, self.nvals // 4, messages.shape)
+        rows = np.arange(len(A))[:, None, None]
+        u = modq.reduce(A[rows, indices].sum(axis=-1), self.q)
+        v = modq.add(modq.reduce(B[rows, indices].sum(axis=-1), self.q), (self.q // 2) * messages, self.q)
+        return u, v
+
+    def residual(self, u, v):
+        """Value seen by the decoder: res = (v - s*u) mod q."""
+        return modq.sub(v, modq.mul(u, self.s % self.q, self.q), self.q)
+
+    def decrypt(self, u, v):
+        """Decrypts the bits: 1 if res > q/2, like ``Decrypt``."""
+        return (self.residual(u, v) > self.q / 2).astype(int)
@@ -0,0 +1,196 @@
+"""
+Vectorized arithmetic modulo q for the lattice-based algorithms.
+
+All functions work on whole NumPy arrays. For q below ``MAX_INT64_MODULUS``
+(2**31) reduced operands fit in int64 and a product of two of them stays
+below 2**62, so elementwise operations never overflow. Dot products and
+matrix products use lazy reduction: terms are accumulated without reducing
+for as long as the bound on the sum is known to fit, either exactly in
+float64 (so BLAS can be used) or in int64, and reduced once per chunk. For
+larger q everything falls back to Python integers (object dtype).
+"""
+import numpy as np
+
+MAX_INT64_MODULUS = 1 << 31
+
+# Largest integer exactly representable as float64 (BLAS path)
+_FLOAT_EXACT = 1 << 53
+
+_INT64_LIMIT = (1 << 63) - 1
+
+# The float64 FFT is exact (error below 1/2) while n·max|a|·max|b| stays below this
+_FFT_EXACT_BITS = 40
+
+# Width of the limbs used when a full int64 product sum would overflow too soon
+_LIMB_BITS = 16
+
+
+def _is_large(q):
+    return q >= MAX_INT64_MODULUS
+
+
+def reduce(x, q):
+    """
+    Reduces integers modulo q into [0, q).
+
+    Args:
+        x (array_like): Integers (int64 or, for large q, any Python integer).
+        q (int): The modulus.
+
+    Returns:
+        numpy.ndarray: int64 array (object array if q >= 2**31).
+    """
+    if _is_large(q):
+        return np.asarray(x, dtype=object) % q
+    return np.remainder(np.asarray(x, dtype=np.int64), q)
+
+
+def add(a, b, q):
+    """(a + b) mod q for operands already reduced modulo q."""
+    if _is_large(q):
+        return reduce(np.asarray(a, dtype=object) + b, q)
+    s = np.asarray(a, dtype=np.int64) + b
+    return s - q * (s >= q)
+
+
+def sub(a, b, q):
+    """(a - b) mod q for operands already reduced modulo q."""
+    if _is_large(q):
+        return reduce(np.asarray(a, dtype=object) - b, q)
+    d = np.asarray(a, dtype=np.int64) - b
+    return d + q * (d < 0)
+
+
+def neg(a, q):
+    """-a mod q for an operand already reduced modulo q."""
+    return sub(0, a, q)
+
+
+def mul(a, b, q):
+    """(a * b) mod q for operands already reduced modulo q (product below 2**62)."""
+    if _is_large(q):
+        return reduce(np.asarray(a, dtype=object) * b, q)
+    return np.remainder(np.asarray(a, dtype=np.int64) * b, q)
+
+
+def _matmul_bounded(a, b, q, b_max):
+    """
+    Matrix product modulo q of int64 operands with a < q and 0 <= b <= b_max.
+
+    The inner dimension is split in chunks whose sum is guaranteed to fit,
+    and every chunk is reduced only once (lazy reduction).
+    """
+    inner = a.shape[-1]
+    term = (q - 1) * b_max
+    if term == 0:
+        return np.matmul(a[..., :0], b[..., :0, :])
+    if inner * term < _FLOAT_EXACT:
+        product = np.matmul(a.astype(np.float64), b.astype(np.float64))
+        return np.remainder(product, q).astype(np.int64)
+    chunk = _INT64_LIMIT // term
+    result = None
+    for start in range(0, inner, chunk):
+        partial = np.remainder(np.matmul(a[..., start:start + chunk], b[..., start:start + chunk, :]), q)
+        result = partial if result is None else add(result, partial, q)
+    return result
+
+
+def matmul(a, b, q):
+    """
+    Matrix product modulo q with the broadcasting rules of ``np.matmul``.
+
+    Operands are reduced first. When the int64 chunks would hold fewer than
+    2**_LIMB_BITS terms, b is split into a low and a high limb, so both
+    partial products accumulate many more terms before a reduction.
+
+    Args:
+        a (array_like): Left operand of shape (..., m, k).
+        b (array_like): Right operand of shape (..., k, n).
+        q (int): The modulus.
+
+    Returns:
+        numpy.ndarray: The product reduced modulo q.
+    """
+    a = reduce(a, q)
+    b = reduce(b, q)
+    if _is_large(q):
+        return np.matmul(a, b) % q
+    if _INT64_LIMIT // ((q - 1) ** 2 or 1) >= 1 << _LIMB_BITS:
+        return _matmul_bounded(a, b, q, q - 1)
+    mask = (1 << _LIMB_BITS) - 1
+    low = _matmul_bounded(a, b & mask, q, mask)
+    high = _matmul_bounded(a, b >> _LIMB_BITS, q, (q - 1) >> _LIMB_BITS)
+    return add(mul(high, (1 << _LIMB_BITS) % q, q), low, q)
+
+
+def dot(a, b, q):
+    """Dot product modulo q over the last axis (with broadcasting)."""
+    a = np.asarray(a)
+    b = np.asarray(b)
+    return matmul(a[..., None, :], b[..., :, None], q)[..., 0, 0]
+
+
+def negacyclic_matrix(b):
+    """
+    Matrix of the multiplication by b in Z[x]/(x^n + 1).
+
+    Row j holds the coefficients of x^j · b, so ``a @ negacyclic_matrix(b)``
+    is the product a·b.
+
+    Args:
+        b (numpy.ndarray): Polynomials of shape (..., n).
+
+    Returns:
+        numpy.ndarray: Matrices of shape (..., n, n).
+    """
+    n = b.shape[-1]
+    i = np.arange(n)
+    index = (i[None, :] - i[:, None]) % n
+    wrapped = i[None, :] < i[:, None]
+    rotations = b[..., index]
+    return np.where(wrapped, -rotations, rotations)
+
+
+def poly_mul(a, b, q):
+    """
+    Multiplies polynomials in Z_q[x]/(x^n + 1) over the last axis.
+
+    Args:
+        a (array_like): Polynomials of shape (..., n).
+        b (array_like): Polynomials of shape (..., n) (broadcastable with a).
+        q (int): The modulus.
+
+    While the float64 FFT is exact, the product is a cyclic convolution of
+    length 2n whose upper half is subtracted from the lower one (x^n = -1).
+    Otherwise it is a schoolbook product: coefficient j of a times b, shifted
+    by j with the wrapped part negated, is accumulated for each j, and the
+    sums are reduced lazily as in ``matmul``. Either way the memory stays at
+    a few arrays of the size of the result (``negacyclic_matrix`` would be
+    n times larger).
+
+    Returns:
+        numpy.ndarray: The products with coefficients in [0, q).
+    """
+    a = reduce(a, q)
+    b = reduce(b, q)
+    n = b.shape[-1]
+    if not _is_large(q) and (n * (q - 1) ** 2).bit_length() <= _FFT_EXACT_BITS:
+        product = np.fft.irfft(np.fft.rfft(a, 2 * n) * np.fft.rfft(b, 2 * n), 2 * n)
+        product = np.rint(product).astype(np.int64)
+        return reduce(product[..., :n] - product[..., n:], q)
+    total = np.zeros(np.broadcast_shapes(a.shape, b.shape), dtype=a.dtype)
+    # Terms added between two reductions, keeping |total| below the int64 limit
+    chunk = n if _is_large(q) else max(1, _INT64_LIMIT // ((q - 1) ** 2 or 1) - 1)
+    for j in range(n):
+        coefficient = a[..., j:j + 1]
+        total[..., j:] += coefficient * b[..., :n - j]
+        total[..., :j] -= coefficient * b[..., n - j:]
+        if (j + 1) % chunk == 0:
+            total = reduce(total, q)
+    return reduce(total, q)
+
+
+def poly_vec_dot(a, b, q):
+    """Inner product modulo q of polynomial vectors of shape (..., k, n)."""
+    products = poly_mul(a, b, q)
+    return reduce(products.sum(axis=-2), q)
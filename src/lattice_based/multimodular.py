@@ -0,0 +1,375 @@
+"""
+Exact solution of integer linear systems by multi-modular arithmetic.
+
+A system A·X = Y with integer entries is solved modulo several primes below
+2**23 at once, by Gauss-Jordan elimination on a (primes, n, n + m) array.
+The residues are kept in float64, where sums of up to 2**7 products of two
+of them are exact, so the bulk of the work runs as BLAS matrix products.
+Cramer's rule says
+that det(A) and det(A)·X are integer matrices, and Hadamard's inequality
+bounds their entries, so the number of primes is known in advance: with
+the primes' product above twice the bound, the Chinese remainder theorem
+gives them exactly. No fraction and no rounded value is ever formed.
+"""
+import math
+import numpy as np
+
+# The primes are the largest ones below this bound
+PRIME_BOUND = 1 << 23
+
+# Columns per panel of the elimination, and terms per exact float64 sum
+# of products (BLOCK * PRIME_BOUND**2 <= 2**53)
+BLOCK = 16
+
+_INT64_BOUND = 1 << 63
+
+_primes = []
+
+
+def _is_prime(p):
+    """Deterministic Miller-Rabin for p < 2**32 (bases 2, 7 and 61)."""
+    if p < 2 or p % 2 == 0:
+        return p == 2
+    d, s = p - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in (2, 7, 61):
+        if a % p == 0:
+            continue
+        x = pow(a, d, p)
+        if x in (1, p - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % p
+            if x == p - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def primes(count):
+    """The ``count`` largest primes below ``PRIME_BOUND`` (cached)."""
+    candidate = _primes[-1] - 2 if _primes else PRIME_BOUND - 1
+    while len(_primes) < count:
+        if _is_prime(candidate):
+            _primes.append(candidate)
+        candidate -= 2
+    return _primes[:count]
+
+
+def integer_array(array):
+    """Object array of Python integers from integers or integral floats."""
+    return np.frompyfunc(int, 1, 1)(np.asarray(array, dtype=object)).astype(object)
+
+
+def _integer_matrix(array):
+    """
+    An integer matrix as int64 when its entries fit, otherwise as Python integers.
+
+    Lists are never converted by NumPy directly: integers between 2**63 and
+    2**64 mixed with negative ones would silently become float64.
+    """
+    if isinstance(array, np.ndarray) and array.dtype.kind == 'i':
+        return array
+    array = integer_array(array)
+    if all(-_INT64_BOUND <= x < _INT64_BOUND for x in array.flat):
+        return array.astype(np.int64)
+    return array
+
+
+def _log2_norms(matrix):
+    """log2 of the Euclidean norm of each row, exact for Python integers."""
+    return [0.5 * math.log2(max(sum(int(x) * int(x) for x in row), 1)) for row in matrix]
+
+
+def hadamard_bits(A, Y):
+    """
+    Bits of the Hadamard bounds of det(A) and of the entries of det(A)·X.
+
+    |det A| is at most the product of the column norms of A, and by Cramer's
+    rule an entry of det(A)·X is a determinant with one column of A
+    replaced by a column of Y.
+
+    Returns:
+        float: log2 of the larger bound.
+    """
+    columns = _log2_norms(np.asarray(A, dtype=object).T)
+    y_max = max(_log2_norms(np.asarray(Y, dtype=object).T), default=0)
+    return sum(columns) + max(y_max - min(columns), 0)
+
+
+def residues(matrix, moduli):
+    """
+    An integer matrix modulo each prime.
+
+    Returns:
+        numpy.ndarray: float64 array of shape (len(moduli), *matrix.shape).
+    """
+    matrix = np.asarray(matrix)
+    if matrix.dtype != object:
+        matrix = matrix.astype(np.int64)
+        return np.stack([np.remainder(matrix, p) for p in moduli]).astype(float)
+    return np.stack([(matrix % p).astype(float) for p in moduli])
+
+
+def _swap_rows(array, index, row, pivot):
+    """Swaps, for each prime i, the rows ``row`` and ``pivot[i]`` of array[i]."""
+    rows = array[index, pivot].copy()
+    array[index, pivot] = array[:, row]
+    array[:, row] = rows
+
+
+def _reduce(x, p, inverse):
+    """x mod p in place for float64 integers below 2**53 in absolute value."""
+    x -= np.floor(x * inverse) * p
+    x += p * (x < 0)
+    x -= p * (x >= p)
+    return x
+
+
+def _eliminate(work, p, first, columns):
+    """
+    Unblocked Gauss-Jordan elimination of the first ``columns`` columns.
+
+    The pivot of column j goes to row ``first + j`` (partial pivoting among
+    the rows below it) and every other row is cleared, in place.
+
+    Returns:
+        tuple: The pivot row chosen at each column (one per prime), the
+        product of the pivots with the sign of the swaps and the mask of
+        the primes where no column was zero.
+    """
+    k = len(p)
+    index = np.arange(k)
+    P = p[:, None, None]
+    inverse_p = 1 / P
+    determinant = np.ones(k)
+    valid = np.ones(k, dtype=bool)
+    pivots = []
+    for j in range(columns):
+        row = first + j
+        nonzero = work[:, row:, j] != 0
+        valid &= nonzero.any(axis=1)
+        pivot = row + nonzero.argmax(axis=1)
+        pivots.append(pivot)
+        _swap_rows(work, index, row, pivot)
+        head = work[:, row, j]
+        determinant = np.where(pivot != row, p - determinant, determinant) * np.where(head != 0, head, 1) % p
+        inverses = np.array([pow(int(x), -1, int(q)) if x else 0 for x, q in zip(head, p)], dtype=float)
+        work[:, row] = work[:, row] * inverses[:, None] % p[:, None]
+        # Columns before j are already unit vectors: only the rest is updated
+        factors = work[:, :, j].copy()
+        factors[:, row] = 0
+        active = work[:, :, j + 1:]
+        active -= factors[:, :, None] * work[:, row, j + 1:][:, None, :]
+        _reduce(active, P, inverse_p)
+        work[:, :, j] = 0
+        work[:, row, j] = 1
+    return pivots, determinant, valid
+
+
+def _matmul_mod(a, b, p):
+    """(a @ b) mod p for float64 residues, in chunks of ``BLOCK`` terms."""
+    P = p[:, None, None]
+    inverse_p = 1 / P
+    result = np.zeros(a.shape[:-1] + b.shape[-1:])
+    for start in range(0, a.shape[-1], BLOCK):
+        result += a[..., start:start + BLOCK] @ b[..., start:start + BLOCK, :]
+        _reduce(result, P, inverse_p)
+    return result
+
+
+def solve_mod_primes(A, Y, moduli):
+    """
+    Solves A·X = Y modulo each prime, all primes in the same array operations.
+
+    Blocked Gauss-Jordan elimination: each panel of ``BLOCK`` columns is
+    eliminated column by column, and the rest of the matrix is updated with
+    two matrix products per panel, exact in float64 BLAS because
+    BLOCK·p² < 2**53.
+
+    Args:
+        A (array_like): Square integer matrix (n x n).
+        Y (array_like): Integer right-hand sides (n x m).
+        moduli (list): Primes below ``PRIME_BOUND``.
+
+    Returns:
+        tuple: X modulo each prime (primes x n x m), det(A) modulo each prime
+        and a boolean mask of the primes where A is invertible (the results
+        of the other ones are meaningless).
+    """
+    p = np.array(moduli, dtype=float)
+    P = p[:, None, None]
+    inverse_p = 1 / P
+    k = len(moduli)
+    n = len(A)
+    index = np.arange(k)
+    augmented = np.concatenate([residues(A, moduli), residues(Y, moduli)], axis=2)
+    determinant = np.ones(k)
+    valid = np.ones(k, dtype=bool)
+    for start in range(0, n, BLOCK):
+        end = min(start + BLOCK, n)
+        b = end - start
+        # The panel decides the pivots; its rows are swapped in the whole matrix
+        pivots, panel_determinant, panel_valid = _eliminate(augmented[:, :, start:end].copy(), p, start, b)
+        for j, pivot in enumerate(pivots):
+            _swap_rows(augmented, index, start + j, pivot)
+        determinant = determinant * panel_determinant % p
+        valid &= panel_valid
+        # With the pivot block A11 of the panel: pivot rows become
+        # A11⁻¹·rows, and every other row r loses panel_r·A11⁻¹·rows
+        panel = augmented[:, :, start:end]
+        square = np.concatenate([panel[:, start:end], np.broadcast_to(np.eye(b), (k, b, b))], axis=2)
+        _eliminate(square, p, 0, b)
+        rest = augmented[:, :, end:]
+        top = _reduce(square[:, :, b:] @ rest[:, start:end], P, inverse_p)
+        rest -= panel @ top
+        _reduce(rest, P, inverse_p)
+        rest[:, start:end] = top
+    return augmented[:, :, n:].astype(np.int64), determinant.astype(np.int64), valid
+
+
+def crt(values, moduli):
+    """
+    Symmetric Chinese remainder reconstruction (Garner's algorithm).
+
+    The mixed-radix digits are found one prime at a time, each from a
+    matrix product of the previous digits; only the final Horner pass
+    works on Python integers.
+
+    Args:
+        values (numpy.ndarray): Residues of shape (len(moduli), ...).
+        moduli (list): Distinct primes below ``PRIME_BOUND``.
+
+    Returns:
+        numpy.ndarray: Object array of Python integers in (-M/2, M/2], M the
+        product of the moduli.
+    """
+    k = len(moduli)
+    values = np.asarray(values, dtype=float)
+    shape = values.shape[1:]
+    values = values.reshape(k, -1)
+    digits = np.zeros_like(values)
+    for i, p in enumerate(moduli):
+        # Radix prod(moduli[:j]) of each previous digit j, modulo p
+        radix = np.array([math.prod(moduli[:j]) % p for j in range(i)], dtype=float)
+        partial = _matmul_mod(radix[None, None, :], digits[None, :i], np.array([p], dtype=float))[0, 0]
+        inverse = pow(math.prod(moduli[:i]) % p, -1, p)
+        digits[i] = (values[i] - partial) % p * inverse % p
+    # Pairs of digits fit in int64 (d_i + p_i·d_(i+1) < 2**46), halving
+    # the operations on Python integers
+    digits = digits.astype(np.int64)
+    if k % 2:
+        digits = np.concatenate([digits, np.zeros_like(digits[:1])])
+    pairs = (digits[0::2] + np.array(moduli[0::2], dtype=np.int64)[:, None] * digits[1::2]).astype(object)
+    radices = [moduli[i] * (moduli[i + 1] if i + 1 < k else 1) for i in range(0, k, 2)]
+    result = pairs[-1]
+    for i in range(len(pairs) - 2, -1, -1):
+        result = result * radices[i] + pairs[i]
+    modulus = math.prod(moduli)
+    result = np.where(result > modulus // 2, result - modulus, result)
+    return result.reshape(shape)
+
+
+def _reconstruct(solutions, determinants, moduli):
+    """det(A)·X and det(A) from their residues (symmetric CRT)."""
+    p = np.array(moduli, dtype=np.int64)[:, None, None]
+    numerators = crt(solutions * determinants[:, None, None] % p, moduli)
+    return numerators, int(crt(determinants, moduli))
+
+
+def solve_exact(A, Y):
+    """
+    Exact solution of A·X = Y in the form X = N / d.
+
+    The primes are used in batches of doubling size. When the result did
+    not change with the last batch and A·N = d·Y holds over the integers,
+    it is returned early, so a small answer (an integer solution of a
+    unimodular system, as in GGH) costs a few primes instead of the
+    Hadamard bound; at the bound the result is exact without checking.
+
+    Args:
+        A (array_like): Nonsingular square integer matrix (n x n).
+        Y (array_like): Integer right-hand sides, a vector (n,) or a matrix (n x m).
+
+    Returns:
+        tuple: The integer numerators N (object array with the shape of Y)
+        and the positive integer denominator d, with gcd(N, d) = 1.
+
+    Raises:
+        ValueError: If A is singular.
+    """
+    A = _integer_matrix(A)
+    Y = _integer_matrix(Y)
+    vector = Y.ndim == 1
+    if vector:
+        Y = Y[:, None]
+    needed = math.floor(hadamard_bits(A, Y) + 1) // (PRIME_BOUND.bit_length() - 2) + 1
+    A_exact = A.astype(object)
+    Y_exact = Y.astype(object)
+    solutions = np.zeros((0,) + Y.shape, dtype=np.int64)
+    determinants = np.zeros(0, dtype=np.int64)
+    moduli = []
+    tried = rejected = 0
+    previous = None
+    while True:
+        size = min(max(len(moduli), 2), needed - len(moduli))
+        batch = primes(tried + size)[tried:]
+        tried += size
+        x, d, valid = solve_mod_primes(A, Y, batch)
+        # A nonzero det(A) is below the product of ``needed`` primes, so
+        # it cannot be a multiple of all of them
+        rejected += int((~valid).sum())
+        if rejected >= needed:
+            raise ValueError("The matrix is singular")
+        moduli += [q for q, ok in zip(batch, valid) if ok]
+        solutions = np.concatenate([solutions, x[valid]])
+        determinants = np.concatenate([determinants, d[valid]])
+        if not moduli:
+            continue
+        if len(moduli) >= needed:
+            numerators, determinant = _reconstruct(solutions, determinants, moduli)
+            break
+        # Cheap probe first (the determinant and the first column), the full
+        # reconstruction and the check over the integers only when it is stable
+        probe = _reconstruct(solutions[:, :, :1], determinants, moduli)
+        if previous is not None and probe[1] == previous[1] and (probe[0] == previous[0]).all() and probe[1]:
+            numerators, determinant = _reconstruct(solutions, determinants, moduli)
+            if (A_exact @ numerators == determinant * Y_exact).all():
+                break
+        previous = probe
+    divisor = math.gcd(determinant, *(int(x) for x in numerators.flat))
+    if determinant < 0:
+        divisor = -divisor
+    numerators = numerators // divisor
+    return (numerators[:, 0] if vector else numerators), determinant // divisor
+
+
+def inverse_exact(A):
+    """
+    Exact inverse of a nonsingular integer matrix, as A⁻¹ = N / d.
+
+    For a unimodular matrix d = 1 and N is the integer inverse.
+    """
+    return solve_exact(A, np.eye(len(A), dtype=np.int64))
+
+
+def determinant(A):
+    """
+    Exact determinant of a square integer matrix.
+
+    A prime where the elimination finds a zero column divides det(A), so
+    its residue is 0; with primes past twice the Hadamard bound the CRT is
+    exact.
+    """
+    A = _integer_matrix(A)
+    empty = np.zeros((len(A), 0), dtype=np.int64)
+    moduli = primes(math.floor(hadamard_bits(A, empty) + 1) // (PRIME_BOUND.bit_length() - 2) + 1)
+    _, determinants, valid = solve_mod_primes(A, empty, moduli)
+    return int(crt(np.where(valid, determinants, 0), moduli))
+
+
+def round_division(numerators, denominator):
+    """Nearest integers to numerators / denominator (halves rounded up), exactly."""
+    return (2 * numerators + denominator) // (2 * denominator)
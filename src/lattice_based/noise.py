@@ -0,0 +1,122 @@
+"""
+Visualization of the decryption noise of the LWE and Alkaline demos.
+
+The residual seen by the decoder (``v - s*u mod q``) is sampled with the
+batched engines, histogrammed with ``np.bincount`` and shown as a single bar
+trace together with the decision thresholds of the decoder. Histograms are
+cached per parameter set, so showing the same parameters again is free.
+
+The module is a library for now: LWE and Alkaline have no step-by-step demo
+in the interface yet (``BaseAlgorithm.get_algorithm_by_name``), so no page
+shows ``noise_figure``.
+"""
+from functools import lru_cache
+import numpy as np
+import plotly.graph_objects as go
+from lattice_based.alkaline.alkaline import Alkaline
+from lattice_based.failure import DECODERS
+from lattice_based.lwe.lwe import LWE
+from lattice_based.sampling import Sampler
+
+DEFAULT_SAMPLES = 10 ** 6
+
+# Each key is reused for this many encryptions (the noise of the key is part of the residual)
+ENCRYPTIONS_PER_KEY = 100
+
+
+def lwe_residuals(nvals, q, s, samples, sampler):
+    """
+    Samples the decoder input of the 1-bit LWE demo.
+
+    Returns:
+        tuple: Arrays with the residuals and the encrypted bits.
+    """
+    lwe = LWE(nvals, q, s, sampler=sampler)
+    keys = -(-samples // ENCRYPTIONS_PER_KEY)
+    A, B, _ = lwe.keygen(keys)
+    messages = sampler.uniform_below(2, (keys, ENCRYPTIONS_PER_KEY))
+    u, v = lwe.encrypt(A, B, messages)
+    return lwe.residual(u, v).ravel()[:samples], messages.ravel()[:samples]
+
+
+def alkaline_residuals(n, k, q, eta, samples, sampler):
+    """
+    Samples the decoder input of the Alkaline demo, one value per coefficient.
+
+    Returns:
+        tuple: Arrays with the residuals and the encrypted bits.
+    """
+    alkaline = Alkaline(n, k, q, eta, sampler=sampler)
+    batch = -(-samples // n)
+    pubkey, privkey = alkaline.keygen(batch)
+    messages = sampler.uniform_below(2, (batch, n))
+    u, v = alkaline.encrypt(pubkey, messages)
+    residual = alkaline.residual(privkey, u, v)
+    return residual.ravel()[:samples], messages.ravel()[:samples]
+
+
+@lru_cache(maxsize=64)
+def residual_histogram(scheme, params, samples=DEFAULT_SAMPLES, seed=0):
+    """
+    Histogram of the decoder input for a parameter set (cached).
+
+    Args:
+        scheme (str): ``'LWE'`` with params (nvals, q, s) or ``'Alkaline'``
+            with params (n, k, q, eta).
+        params (tuple): The parameters of the scheme.
+        samples (int): Number of sampled residuals.
+        seed: Seed of the sampler, so cached histograms are reproducible.
+
+    Returns:
+        numpy.ndarray: Counts of shape (2, q): one histogram per message bit.
+    """
+    sampler = Sampler(seed)
+    if scheme == 'LWE':
+        q = params[1]
+        residuals, messages = lwe_residuals(*params, samples, sampler)
+    else:
+        q = params[2]
+        residuals, messages = alkaline_residuals(*params, samples, sampler)
+    counts = np.bincount(messages * q + residuals, minlength=2 * q)
+    return counts.reshape(2, q)
+
+
+def decision_thresholds(q, decoder):
+    """Residues where the decoded bit changes (the bar edges between them)."""
+    table = DECODERS[decoder](q)
+    return [float(x) - 0.5 for x in np.flatnonzero(np.diff(table)) + 1]
+
+
+def noise_figure(scheme, params, samples=DEFAULT_SAMPLES, seed=0):
+    """
+    Plots the distribution of the decoder input with the decision thresholds.
+
+    The bars are colored by the bit that the decoder outputs, so the mass on
+    the wrong side of a threshold is visible at once.
+
+    Returns:
+        plotly.graph_objects.Figure: A figure with a single bar trace.
+    """
+    counts = residual_histogram(scheme, tuple(params), samples, seed)
+    q = counts.shape[1]
+    decoder = 'lwe' if scheme == 'LWE' else 'alkaline'
+    table = DECODERS[decoder](q)
+    frequency = counts.sum(axis=0) / counts.sum()
+    fig = go.Figure(go.Bar(
+        x=np.arange(q),
+        y=frequency,
+        marker=dict(color=np.where(table == 1, 'orange', 'deepskyblue')),
+        name='Resíduo',
+    ))
+    for threshold in decision_thresholds(q, decoder):
+        fig.add_vline(x=threshold, line=dict(color='white', dash='dash'))
+    fig.add_vline(x=q / 2, line=dict(color='red', dash='dot'),
+                  annotation_text='q/2', annotation_position='top')
+    fig.update_layout(
+        title=f'Distribuição do Ruído ({scheme}, {samples} amostras)',
+        xaxis_title='v - s·u mod q',
+        yaxis_title='Frequência',
+        bargap=0,
+        template='plotly_dark'
+    )
+    return fig
@@ -0,0 +1,406 @@
+"""
+NTRUEncrypt (Hoffstein, Pipher and Silverman, 1998) in R = Z[x]/(x^N - 1).
+
+Polynomials are int64 arrays of N coefficients (degree 0 first), and every
+function accepts stacks of shape (..., N), so many messages are encrypted
+and decrypted in one call. Products use the FFT: a cyclic convolution of
+length N is exactly the product in R, and with the coefficients centered
+modulo q the exact result is far below the precision of float64. The
+inverses modulo p and q are computed by the extended Euclidean algorithm in
+F_p[x] followed by Newton (Hensel) lifting to q = 2^k, instead of solving an
+N x N linear system.
+"""
+import numpy as np
+import plotly.graph_objects as go
+from dash import html, dcc
+from lattice_based.algorithms import BaseAlgorithm
+from lattice_based.sampling import Sampler, session_sampler
+
+# The float64 FFT is exact (error below 1/2) while N·max|a|·max|b| stays below this
+_FFT_EXACT_BITS = 40
+
+
+def next_prime(n):
+    """Smallest prime >= n (NTRU needs a prime N so that x^N - 1 has few factors)."""
+    n = max(n, 2)
+    while any(n % k == 0 for k in range(2, int(n ** 0.5) + 1)):
+        n += 1
+    return n
+
+
+def center(a, q):
+    """Representatives of a modulo q in (-q/2, q/2]."""
+    return (np.asarray(a, dtype=np.int64) + (q - 1) // 2) % q - (q - 1) // 2
+
+
+def cyclic_convolution(a, b, modulus=None):
+    """
+    Product in Z[x]/(x^N - 1) of polynomials or stacks of polynomials.
+
+    The FFT of length N turns the cyclic convolution into a pointwise
+    product, O(N log N) instead of O(N²). When the product could exceed the
+    exact range of float64 the larger operand is split in two limbs of half
+    its bits and the limbs are multiplied separately.
+
+    Args:
+        a (array_like): Integer polynomials of shape (..., N).
+        b (array_like): Integer polynomials of shape (..., N), broadcastable with a.
+        modulus (int): Reduce the result modulo this number.
+
+    Returns:
+        numpy.ndarray: The int64 products.
+    """
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    n = a.shape[-1]
+    a_max, b_max = int(np.abs(a).max(initial=1)), int(np.abs(b).max(initial=1))
+    if a_max > b_max:
+        a, b, a_max, b_max = b, a, b_max, a_max
+    if (n * a_max * b_max).bit_length() > _FFT_EXACT_BITS and b_max > 1:
+        shift = (b_max.bit_length() + 1) // 2
+        high = cyclic_convolution(a, b >> shift, modulus)
+        low = cyclic_convolution(a, b & ((1 << shift) - 1), modulus)
+        result = (high << shift) + low
+        return result % modulus if modulus else result
+    product = np.fft.irfft(np.fft.rfft(a) * np.fft.rfft(b), n)
+    result = np.rint(product).astype(np.int64)
+    return result % modulus if modulus else result
+
+
+def _trim(a):
+    """Drops the zero coefficients of highest degree (the zero polynomial is empty)."""
+    nonzero = np.flatnonzero(a)
+    return a[:nonzero[-1] + 1] if len(nonzero) else a[:0]
+
+
+def _poly_divmod(numerator, denominator, p):
+    """Quotient and remainder of polynomials over F_p (denominator trimmed, nonzero)."""
+    remainder = numerator.copy()
+    degree = len(denominator) - 1
+    lead_inverse = pow(int(denominator[-1]), -1, p)
+    quotient = np.zeros(max(len(numerator) - degree, 1), dtype=np.int64)
+    for k in range(len(numerator) - 1 - degree, -1, -1):
+        c = remainder[k + degree] * lead_inverse % p
+        if c:
+            quotient[k] = c
+            remainder[k:k + degree + 1] = (remainder[k:k + degree + 1] - c * denominator) % p
+    return quotient, _trim(remainder[:degree])
+
+
+def _inverse_mod_prime(a, p):
+    """
+    Inverse of a in F_p[x]/(x^N - 1) by the extended Euclidean algorithm.
+
+    Only the Bézout coefficient of a is kept: s·a = r (mod x^N - 1) for
+    every remainder r, so when r becomes a nonzero constant s / r is the
+    inverse.
+
+    Returns:
+        numpy.ndarray: The inverse, or None if a is not invertible.
+    """
+    n = len(a)
+    r0 = np.zeros(n + 1, dtype=np.int64)
+    r0[0], r0[n] = p - 1, 1
+    r1 = _trim(np.asarray(a, dtype=np.int64) % p)
+    s0, s1 = np.zeros(1, dtype=np.int64), np.ones(1, dtype=np.int64)
+    while len(r1) > 1:
+        quotient, remainder = _poly_divmod(r0, r1, p)
+        product = np.convolve(quotient, s1)
+        size = max(len(s0), len(product))
+        s0, s1 = s1, _trim((np.pad(s0, (0, size - len(s0))) - np.pad(product, (0, size - len(product)))) % p)
+        r0, r1 = r1, remainder
+    if len(r1) == 0:
+        return None
+    inverse = np.zeros(n, dtype=np.int64)
+    # deg s < N, but fold it in case
+    np.add.at(inverse, np.arange(len(s1)) % n, s1)
+    return inverse * pow(int(r1[0]), -1, p) % p
+
+
+def _prime_power(modulus):
+    """(p, k) with modulus = p^k."""
+    p = next(k for k in range(2, modulus + 1) if modulus % k == 0)
+    k, rest = 0, modulus
+    while rest % p == 0:
+        rest //= p
+        k += 1
+    if rest != 1:
+        raise ValueError(f"{modulus} is not a prime power")
+    return p, k
+
+
+def poly_inverse(a, modulus, steps=None):
+    """
+    Inverse of a in (Z/modulus)[x]/(x^N - 1), for a prime power modulus.
+
+    The inverse modulo the prime p comes from the Euclidean algorithm. Newton's
+    iteration b ← b·(2 - a·b) then doubles the precision at each step: if
+    a·b = 1 (mod m), the new b satisfies a·b = 1 (mod m²). For q = 2^11
+    the moduli are 2, 4, 16, 256 and 2048, four convolutions each.
+
+    Args:
+        a (array_like): The polynomial (N coefficients).
+        modulus (int): A prime power p^k.
+        steps (list): If given, receives the moduli of the lifting.
+
+    Returns:
+        numpy.ndarray: The inverse with coefficients in [0, modulus), or None
+        if a is not invertible.
+    """
+    p, _ = _prime_power(modulus)
+    inverse = _inverse_mod_prime(a, p)
+    if inverse is None:
+        return None
+    m = p
+    if steps is not None:
+        steps.append(m)
+    while m < modulus:
+        m = min(m * m, modulus)
+        correction = -cyclic_convolution(center(a, m), center(inverse, m), m)
+        correction[0] += 2
+        inverse = cyclic_convolution(center(inverse, m), center(correction, m), m)
+        if steps is not None:
+            steps.append(m)
+    return inverse
+
+
+class NTRU(BaseAlgorithm):
+    """
+    NTRUEncrypt with ternary keys and messages.
+
+    The private key is f (d + 1 ones, d minus ones) with its inverse F_p
+    modulo p; the public key is h = p·F_q·g (mod q), with g ternary and
+    F_q = f⁻¹ (mod q). A message m with coefficients in {-1, 0, 1} is
+    encrypted as e = r·h + m (mod q) with a random ternary r, and
+    f·e = p·r·g + f·m (mod q) has small coefficients, so after centering
+    modulo q it is exact and F_p·(f·e) = m (mod p).
+    """
+
+    def __init__(self, N=7, p=3, q=2048, d=None, sampler=None):
+        """
+        Args:
+            N (int): The degree, rounded up to a prime.
+            p (int): The small modulus.
+            q (int): The large modulus, a power of two.
+            d (int): Ones and minus ones of g and r (defaults to N // 3).
+            sampler (Sampler): Source of randomness (defaults to the system CSPRNG).
+        """
+        self.N = next_prime(max(N, 5))
+        self.p = p
+        self.q = q
+        self.d = d or self.N // 3
+        self.sampler = sampler or Sampler()
+
+    def ternary(self, ones, minus_ones, shape=()):
+        """Polynomials with exactly ``ones`` ones and ``minus_ones`` minus ones, in random positions."""
+        order = np.argsort(self.sampler.uniform_below(1 << 62, tuple(shape) + (self.N,)), axis=-1)
+        return np.where(order < ones, 1, np.where(order < ones + minus_ones, -1, 0)).astype(np.int64)
+
+    def generate_keys(self, attempts=100, lifting=None):
+        """
+        Draws f until it is invertible modulo p and q, and computes h.
+
+        Args:
+            attempts (int): Private polynomials tried.
+            lifting (list): If given, receives the moduli of the Newton lifting of F_q.
+
+        Returns:
+            tuple: f, g, F_p, F_q and the public key h.
+
+        Raises:
+            ValueError: If no invertible f was found.
+        """
+        for _ in range(attempts):
+            f = self.ternary(self.d + 1, self.d)
+            F_p = poly_inverse(f, self.p)
+            if F_p is None:
+                continue
+            steps = []
+            F_q = poly_inverse(f, self.q, steps)
+            if F_q is None:
+                continue
+            if lifting is not None:
+                lifting.extend(steps)
+            g = self.ternary(self.d, self.d)
+            h = cyclic_convolution(self.p * F_q, g, self.q)
+            return f, g, F_p, F_q, h
+        raise ValueError("No invertible private polynomial found")
+
+    def random_messages(self, count=None):
+        """Ternary messages, one polynomial or a stack of ``count``."""
+        shape = (self.N,) if count is None else (count, self.N)
+        return self.sampler.uniform(-1, 1, shape)
+
+    def encrypt(self, public_key, messages, blinding=None):
+        """
+        Encrypts a ternary message or a stack of them: e = r·h + m (mod q).
+
+        Args:
+            public_key (np.array): The public key h.
+            messages (np.array): Messages of shape (N,) or (count, N).
+            blinding (np.array): The random r (drawn when omitted).
+
+        Returns:
+            np.array: The ciphertexts, with the shape of the messages.
+        """
+        messages = np.asarray(messages, dtype=np.int64)
+        if blinding is None:
+            blinding = self.ternary(self.d, self.d, messages.shape[:-1])
+        return (cyclic_convolution(blinding, public_key, self.q) + messages) % self.q
+
+    def decrypt(self, f, F_p, ciphertexts):
+        """
+        Decrypts one ciphertext or a stack: m = F_p·center(f·e mod q) (mod p), centered.
+        """
+        a = center(cyclic_convolution(f, ciphertexts, self.q), self.q)
+        return center(cyclic_convolution(F_p, a, self.p), self.p)
+
+    @property
+    def step_phases(self):
+        """Define as fases e limites de steps para o NTRU."""
+        return {
+            'keygen': (0, 3),   # Steps 0-3: Key Generation
+            'encrypt': (4, 6),  # Steps 4-6: Encryption
+            'decrypt': (7, 10)  # Steps 7-10: Decryption
+        }
+
+    def initialize(self, dimension=2, seed=None):
+        seed, self.sampler = session_sampler(seed)
+        self.N = next_prime(max(dimension, 5))
+        self.d = self.N // 3
+        lifting = []
+        self.report_progress(0, "Gerando as chaves")
+        f, g, F_p, F_q, h = self.generate_keys(lifting=lifting)
+        self.report_progress(0.8, "Cifrando as mensagens")
+        message = self.random_messages()
+        blinding = self.ternary(self.d, self.d)
+        ciphertext = self.encrypt(h, message, blinding)
+        return {
+            'dimension': dimension,
+            'N': self.N, 'p': self.p, 'q': self.q, 'd': self.d,
+            'f': f.tolist(), 'g': g.tolist(), 'F_p': F_p.tolist(), 'F_q': F_q.tolist(),
+            'h': h.tolist(), 'lifting': lifting,
+            'message': message.tolist(), 'blinding': blinding.tolist(),
+            'ciphertext': ciphertext.tolist(),
+            'seed': seed,
+            'algorithm': 'NTRU'
+        }
+
+    def process_step(self, step, data):
+        """Processa um step específico a partir dos dados armazenados."""
+        self.N, self.p, self.q, self.d = data['N'], data['p'], data['q'], data['d']
+        phase, phase_step = self.get_phase_for_step(step)
+        polys = {key: np.array(data[key]) for key in
+                 ('f', 'g', 'F_p', 'F_q', 'h', 'message', 'blinding', 'ciphertext')}
+        if phase == 'keygen':
+            return self._process_keygen(data, polys, phase_step)
+        elif phase == 'encrypt':
+            return self._process_encrypt(data, polys, phase_step)
+        elif phase == 'decrypt':
+            return self._process_decrypt(data, polys, phase_step)
+
+    def _process_keygen(self, data, polys, step):
+        series = {1: [('f', polys['f'], 'red'), ('g', polys['g'], 'orange')],
+                  2: [('F_p', polys['F_p'], 'red'), ('F_q', center(polys['F_q'], self.q), 'gray')],
+                  3: [('h', center(polys['h'], self.q), 'blue')]}
+        figure = plot_coefficients(series.get(step, []), 'Chaves NTRU')
+        content = []
+        if step >= 1:
+            content.insert(0, _poly_box(
+                "Passo 1: Polinômios Privados f e g",
+                f"Ternários: f tem {self.d + 1} uns e {self.d} menos uns, g tem {self.d} de cada",
+                [f"f = {poly_string(polys['f'])}", f"g = {poly_string(polys['g'])}"]))
+        if step >= 2:
+            check = cyclic_convolution(polys['f'], polys['F_q'], self.q)
+            content.insert(0, _poly_box(
+                "Passo 2: Inversas de f módulo p e módulo q",
+                f"F_p pelo algoritmo de Euclides em F_{self.p}[x]; F_q pelo levantamento de Newton "
+                f"F ← F·(2 − f·F), módulos {' → '.join(str(m) for m in data['lifting'])}",
+                [f"F_p = {poly_string(polys['F_p'])}", f"F_q = {poly_string(polys['F_q'])}",
+                 f"f × F_q mod q = {poly_string(check)}"]))
+        if step >= 3:
+            content.insert(0, _poly_box(
+                "Passo 3: Chave Pública h = p·F_q·g mod q",
+                "Multiplicação em Z[x]/(x^N − 1) pela FFT (convolução cíclica)",
+                [f"h = {poly_string(polys['h'])}"]))
+        return dcc.Graph(figure=figure), _steps_div("Geração de Chaves", content)
+
+    def _process_encrypt(self, data, polys, step):
+        series = {4: [('m', polys['message'], 'green')],
+                  5: [('m', polys['message'], 'green'), ('r', polys['blinding'], 'orange')],
+                  6: [('e', center(polys['ciphertext'], self.q), 'yellow')]}
+        figure = plot_coefficients(series.get(step, []), 'Encriptação NTRU')
+        content = []
+        if step >= 4:
+            content.insert(0, _poly_box("Passo 1: Mensagem m (coeficientes em {−1, 0, 1})", None,
+                                        [f"m = {poly_string(polys['message'])}"]))
+        if step >= 5:
+            content.insert(0, _poly_box("Passo 2: Polinômio Aleatório r", f"{self.d} uns e {self.d} menos uns",
+                                        [f"r = {poly_string(polys['blinding'])}"]))
+        if step >= 6:
+            content.insert(0, _poly_box("Passo 3: Cálculo do Ciphertext", "e = r·h + m mod q",
+                                        [f"e = {poly_string(polys['ciphertext'])}"]))
+        return dcc.Graph(figure=figure), _steps_div("Criptografia NTRU", content)
+
+    def _process_decrypt(self, data, polys, step):
+        a = cyclic_convolution(polys['f'], polys['ciphertext'], self.q)
+        centered = center(a, self.q)
+        recovered = center(cyclic_convolution(polys['F_p'], centered, self.p), self.p)
+        series = {7: [('f·e mod q', a, 'yellow')],
+                  8: [('a centrado', centered, 'blue')],
+                  9: [('m recuperada', recovered, 'green')],
+                  10: [('m', polys['message'], 'white'), ('m recuperada', recovered, 'green')]}
+        figure = plot_coefficients(series.get(step, []), 'Decriptação NTRU')
+        content = []
+        if step >= 7:
+            content.insert(0, _poly_box("Passo 1: a = f·e mod q", "f·e = p·r·g + f·m (mod q)",
+                                        [f"a = {poly_string(a)}"]))
+        if step >= 8:
+            bound = int(np.abs(centered).max())
+            content.insert(0, _poly_box(
+                "Passo 2: Centralização em (−q/2, q/2]",
+                f"Os coeficientes de p·r·g + f·m são pequenos (máximo {bound} < q/2 = {self.q // 2}), "
+                "então a centralização recupera o valor exato",
+                [f"a = {poly_string(centered)}"]))
+        if step >= 9:
+            content.insert(0, _poly_box("Passo 3: m = F_p·a mod p", "F_p·f·m = m (mod p) e p·r·g desaparece",
+                                        [f"m = {poly_string(recovered)}"]))
+        if step >= 10:
+            correct = np.array_equal(recovered, polys['message'])
+            content.insert(0, _poly_box("Passo 4: Comparação com a Mensagem Original",
+                                        "Decriptação correta" if correct else "Falha de decriptação",
+                                        [f"m original   = {poly_string(polys['message'])}",
+                                         f"m recuperada = {poly_string(recovered)}"]))
+        return dcc.Graph(figure=figure), _steps_div("Decriptografia NTRU", content)
+
+
+def poly_string(a):
+    """Coefficients of a polynomial, abbreviated for large N."""
+    return np.array2string(np.asarray(a), threshold=40, edgeitems=8, max_line_width=80)
+
+
+def plot_coefficients(series, title=""):
+    """Coefficients of polynomials by degree, one trace per (name, coefficients, color)."""
+    fig = go.Figure()
+    for name, coefficients, color in series:
+        fig.add_trace(go.Scatter(x=np.arange(len(coefficients)), y=coefficients, mode='lines+markers',
+                                 line=dict(color=color), name=name))
+    fig.update_layout(title=title, xaxis_title='Grau', yaxis_title='Coeficiente', template='plotly_dark')
+    return fig
+
+
+def _poly_box(title, note, lines):
+    text = []
+    for line in lines:
+        text += [line, html.Br()]
+    children = [html.H5(title)]
+    if note:
+        children.append(html.P(note, style={'fontWeight': 'bold'}))
+    children.append(html.P(text[:-1], style={'fontFamily': 'monospace', 'textAlign': 'left'}))
+    return html.Div(children, className='step-box')
+
+
+def _steps_div(phase, content):
+    return html.Div([html.H3("Passo a Passo", className="algorithm-title"),
+                     html.H4(phase),
+                     *content], style={'marginTop': '5px', 'color': 'white', 'fontWeight': 'bold'})
@@ -0,0 +1,313 @@
+"""
+Primal (uSVP) attack on the LWE and Alkaline demos, and its cost estimate.
+
+An instance b = A·s + e (mod q) becomes a lattice with an unusually short
+vector built from e (and s, when the secret is small). ``primal_attack``
+finds it with LLL/BKZ on small instances; ``estimate_primal`` predicts the
+BKZ block size needed for any (n, q, σ) with the 2016 estimate of Alkim,
+Ducas, Pöppelmann and Schwabe, from a precomputed table of root Hermite
+factors.
+"""
+from functools import lru_cache
+import math
+import time
+import numpy as np
+from lattice_based import modq
+from lattice_based.alkaline.alkaline import Alkaline
+from lattice_based.lwe.lwe import LWE
+from lattice_reduction.bkz import bkz_reduce
+from lattice_reduction.lll import lll_reduce
+
+# Real attacks are refused above this lattice dimension (the estimate covers the rest)
+MAX_ATTACK_DIMENSION = 80
+
+# Block sizes of the precomputed table
+_BETAS = np.arange(2, 1025)
+
+
+def root_hermite_factor(beta):
+    """
+    Root Hermite factor δ reached by BKZ-β (asymptotic formula of Chen).
+
+    δ = ((πβ)^(1/β) · β / (2πe))^(1 / (2(β - 1))); below β = 40 the formula
+    is not meaningful and the values interpolate linearly to the LLL factor
+    1.0219 at β = 2.
+    """
+    beta = np.asarray(beta, dtype=float)
+    chen = ((np.pi * beta) ** (1 / beta) * beta / (2 * np.pi * np.e)) ** (1 / (2 * (beta - 1)))
+    at_40 = ((np.pi * 40) ** (1 / 40) * 40 / (2 * np.pi * np.e)) ** (1 / 78)
+    small = 1.0219 + (beta - 2) * (at_40 - 1.0219) / 38
+    return np.where(beta < 40, small, chen)
+
+
+# log δ_β for every β of the table, computed once
+_LOG_DELTA = np.log(root_hermite_factor(_BETAS))
+
+
+@lru_cache(maxsize=1024)
+def estimate_primal(n, q, sigma, m=None):
+    """
+    Smallest BKZ block size that solves the primal uSVP embedding.
+
+    The embedding of dimension d = m + n + 1 (secret and error of deviation
+    σ) and volume q^m is broken by BKZ-β when
+    σ·sqrt(β) ≤ δ_β^(2β - d) · q^(m/d). Every number of samples up to
+    ``m`` and every β of the table are tested at once.
+
+    Args:
+        n (int): Dimension of the secret.
+        q (int): The modulus.
+        sigma (float): Standard deviation of the error (and of the secret).
+        m (int): Maximum number of samples (defaults to 2n).
+
+    Returns:
+        dict: The block size β, the samples m and dimension d used, the root
+        Hermite factor and the log2 of the core-SVP cost (classical 0.292β,
+        quantum 0.265β). β is None when no block size of the table works.
+    """
+    m_max = m or 2 * n
+    samples = np.arange(1, m_max + 1)[:, None]
+    d = samples + n + 1
+    log_q = math.log(q)
+    lhs = math.log(sigma) + 0.5 * np.log(_BETAS)[None, :]
+    rhs = (2 * _BETAS[None, :] - d) * _LOG_DELTA[None, :] + samples * log_q / d
+    success = (lhs <= rhs) & (_BETAS[None, :] <= d)
+    if not success.any():
+        return {'beta': None, 'm': m_max, 'd': m_max + n + 1, 'delta': None,
+                'classical': None, 'quantum': None}
+    first = np.where(success.any(axis=1), success.argmax(axis=1), len(_BETAS))
+    best = int(first.argmin())
+    beta = int(_BETAS[first[best]])
+    return {
+        'beta': beta,
+        'm': best + 1,
+        'd': best + 1 + n + 1,
+        'delta': float(np.exp(_LOG_DELTA[first[best]])),
+        'classical': 0.292 * beta,
+        'quantum': 0.265 * beta,
+    }
+
+
+def lwe_parameters(lwe):
+    """(n, q, σ, m) of the 1-bit LWE demo (secret of dimension 1, errors uniform in the range)."""
+    low, high = lwe.error_range
+    sigma = math.sqrt(((high - low + 1) ** 2 - 1) / 12)
+    return 1, lwe.q, sigma, lwe.nvals
+
+
+def alkaline_parameters(alkaline):
+    """(n, q, σ, m) of the Alkaline demo (module of rank k, centered binomial η)."""
+    return alkaline.n * alkaline.k, alkaline.q, math.sqrt(alkaline.eta / 2), alkaline.n * alkaline.k
+
+
+def solve_mod(A, y, q):
+    """
+    Solves A·x = y (mod q) by Gaussian elimination, q prime.
+
+    Returns:
+        numpy.ndarray: One solution x, or None if the system has none.
+    """
+    A = modq.reduce(np.array(A, dtype=np.int64), q)
+    y = modq.reduce(np.array(y, dtype=np.int64), q)
+    rows, cols = A.shape
+    augmented = np.concatenate([A, y[:, None]], axis=1)
+    pivots = []
+    r = 0
+    for c in range(cols):
+        nonzero = np.flatnonzero(augmented[r:, c])
+        if len(nonzero) == 0:
+            continue
+        p = r + nonzero[0]
+        augmented[[r, p]] = augmented[[p, r]]
+        augmented[r] = modq.mul(augmented[r], pow(int(augmented[r, c]), -1, q), q)
+        factors = augmented[:, c].copy()
+        factors[r] = 0
+        augmented = modq.sub(augmented, np.outer(factors, augmented[r]) % q, q)
+        pivots.append(c)
+        r += 1
+        if r == rows:
+            break
+    if augmented[r:, -1].any():
+        return None
+    x = np.zeros(cols, dtype=np.int64)
+    for i, c in enumerate(pivots):
+        x[c] = augmented[i, -1]
+    return x
+
+
+def qary_basis(A, q):
+    """
+    Basis of the q-ary lattice {A·x mod q} ⊂ Z^m, for A of shape (m, n), q prime.
+
+    The rows of Aᵗ are put in reduced echelon form [I | X] modulo q; with
+    the vectors q·e_j of the other coordinates they form a basis.
+
+    Returns:
+        list: m rows of Python integers.
+    """
+    A = modq.reduce(np.array(A, dtype=np.int64), q)
+    m = A.shape[0]
+    echelon = A.T.copy()
+    pivots = []
+    r = 0
+    for c in range(m):
+        nonzero = np.flatnonzero(echelon[r:, c])
+        if len(nonzero) == 0:
+            continue
+        p = r + nonzero[0]
+        echelon[[r, p]] = echelon[[p, r]]
+        echelon[r] = modq.mul(echelon[r], pow(int(echelon[r, c]), -1, q), q)
+        factors = echelon[:, c].copy()
+        factors[r] = 0
+        echelon = modq.sub(echelon, np.outer(factors, echelon[r]) % q, q)
+        pivots.append(c)
+        r += 1
+        if r == len(echelon):
+            break
+    rows = [[int(x) for x in echelon[i]] for i in range(len(pivots))]
+    for j in range(m):
+        if j not in pivots:
+            rows.append([q if i == j else 0 for i in range(m)])
+    return rows
+
+
+def embedding(A, b, q, small_secret=False, factor=1):
+    """
+    uSVP embedding of b = A·s + e (mod q).
+
+    Without ``small_secret`` it is Kannan's embedding of the q-ary lattice of
+    A, with the short vector (e, M). With it, it is the embedding of Bai and
+    Galbraith, with the short vector (s, e, M).
+
+    Returns:
+        list: The basis as rows of Python integers.
+    """
+    A = modq.reduce(np.array(A, dtype=np.int64), q)
+    m, n = A.shape
+    b = [int(x) for x in modq.reduce(np.asarray(b, dtype=np.int64), q)]
+    if not small_secret:
+        return [row + [0] for row in qary_basis(A, q)] + [b + [int(factor)]]
+    rows = []
+    for i in range(n):
+        rows.append([int(i == j) for j in range(n)] + [int(x) for x in (-A[:, i]) % q] + [0])
+    for j in range(m):
+        rows.append([0] * n + [q if i == j else 0 for i in range(m)] + [0])
+    rows.append([0] * n + b + [int(factor)])
+    return rows
+
+
+def lwe_instance(lwe=None):
+    """
+    One key of the 1-bit LWE demo as (A, b, q, s, e, small_secret, error_bound).
+    """
+    lwe = lwe or LWE()
+    A, B, E = lwe.keygen(1)
+    error_bound = max(abs(x) for x in lwe.error_range)
+    return A[0][:, None], B[0], lwe.q, np.array([lwe.s % lwe.q]), E[0], False, error_bound
+
+
+def alkaline_instance(alkaline=None):
+    """
+    One public key of the Alkaline demo as (A, b, q, s, e, small_secret, error_bound).
+
+    The module A of k x k polynomials becomes a kn x kn matrix of negacyclic
+    blocks, and s and e are the concatenated coefficients. Both come from
+    the centered binomial distribution, so η bounds them.
+    """
+    alkaline = alkaline or Alkaline()
+    (A, t), s = alkaline.keygen(1)
+    A, t, s = A[0], t[0], s[0]
+    k, n = alkaline.k, alkaline.n
+    blocks = np.swapaxes(modq.negacyclic_matrix(A), -1, -2)
+    matrix = blocks.transpose(0, 2, 1, 3).reshape(k * n, k * n)
+    secret = s.reshape(-1)
+    error = (t.reshape(-1) - matrix @ secret)
+    error = (error + alkaline.q // 2) % alkaline.q - alkaline.q // 2
+    return matrix, t.reshape(-1), alkaline.q, secret, error, True, alkaline.eta
+
+
+def primal_attack(A, b, q, error_bound, small_secret=False, block_sizes=(10, 20), factor=1,
+                  secret_bound=None):
+    """
+    Solves an LWE instance with the uSVP embedding and lattice reduction.
+
+    LLL runs first, then BKZ with the given block sizes until a row
+    (…, ±M) of the reduced basis gives an error (and, with a small secret,
+    a secret) within the bounds of the instance. Every row (…, ±M) gives
+    some (s, e) with A·s + e = b (mod q), so only the bounds tell the
+    planted solution apart.
+
+    Args:
+        A (array_like): The m x n matrix of the instance.
+        b (array_like): The m values A·s + e (mod q).
+        q (int): The modulus (prime).
+        error_bound (int): Largest |e_i| of the instance (e.g. the error
+            range of LWE or η of Alkaline).
+        small_secret (bool): Use the embedding of Bai and Galbraith.
+        block_sizes (tuple): BKZ block sizes tried after LLL.
+        factor (int): The embedding factor M.
+        secret_bound (int): Largest |s_i| with a small secret (defaults to ``error_bound``).
+
+    Returns:
+        dict: The secret and error found (None on failure), the reduction
+        that found them, the lattice dimension and the time of each stage.
+
+    Raises:
+        ValueError: If the embedding is larger than ``MAX_ATTACK_DIMENSION``.
+    """
+    A = np.array(A, dtype=np.int64)
+    m, n = A.shape
+    timings = {}
+    start = time.perf_counter()
+    basis = embedding(A, b, q, small_secret, factor)
+    timings['embedding'] = time.perf_counter() - start
+    if len(basis) > MAX_ATTACK_DIMENSION:
+        raise ValueError(f"Embedding of dimension {len(basis)} is too large for a real attack")
+
+    if secret_bound is None:
+        secret_bound = error_bound
+
+    def recover(reduced):
+        for row in sorted(reduced, key=lambda row: sum(x * x for x in row)):
+            if abs(row[-1]) != factor:
+                continue
+            sign = 1 if row[-1] == factor else -1
+            if small_secret:
+                if max(abs(x) for x in row[:n]) > secret_bound or max(abs(x) for x in row[n:-1]) > error_bound:
+                    continue
+                secret = np.array([sign * x for x in row[:n]], dtype=np.int64)
+                error = np.array([sign * x for x in row[n:-1]], dtype=np.int64)
+            else:
+                if max(abs(x) for x in row[:-1]) > error_bound:
+                    continue
+                error = np.array([sign * x for x in row[:-1]], dtype=np.int64)
+                secret = solve_mod(A, modq.sub(modq.reduce(np.asarray(b), q), modq.reduce(error, q), q), q)
+                if secret is None:
+                    continue
+            if np.array_equal(modq.add(modq.matmul(A, modq.reduce(secret, q), q), modq.reduce(error, q), q),
+                              modq.reduce(np.asarray(b), q)):
+                return secret, error
+        return None
+
+    start = time.perf_counter()
+    reduced = lll_reduce(basis)
+    timings['LLL'] = time.perf_counter() - start
+    method = 'LLL'
+    found = recover(reduced)
+    for block_size in block_sizes:
+        if found is not None or block_size > len(basis):
+            break
+        method = f'BKZ-{block_size}'
+        start = time.perf_counter()
+        reduced = bkz_reduce(reduced, block_size)
+        timings[method] = time.perf_counter() - start
+        found = recover(reduced)
+
+    secret, error = found if found is not None else (None, None)
+    return {
+        'secret': None if secret is None else secret.tolist(),
+        'error': None if error is None else error.tolist(),
+        'method': method if found is not None else None,
+        'dimension': len(basis),
+        'timings': timings,
+    }
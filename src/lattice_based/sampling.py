@@ -0,0 +1,151 @@
+"""
+Bulk samplers for the noise and the uniform values used by the algorithms.
+
+Randomness is drawn in large blocks of bytes and turned into NumPy arrays at
+once, instead of calling ``random``/``secrets`` for every coefficient.
+Without a seed the bytes come from the operating system CSPRNG
+(``os.urandom``). With a seed they come from SHAKE-256 in counter mode, so
+the same seed always produces the same values.
+"""
+import hashlib
+import os
+import numpy as np
+
+
+class Sampler:
+    """
+    Source of random arrays backed by a CSPRNG or by a seeded SHAKE-256 stream.
+    """
+
+    def __init__(self, seed=None):
+        """
+        Args:
+            seed (int | str | bytes | None): Seed of the deterministic mode.
+                ``None`` uses the operating system CSPRNG.
+        """
+        if isinstance(seed, int):
+            seed = seed.to_bytes((seed.bit_length() + 8) // 8, 'little', signed=True)
+        elif isinstance(seed, str):
+            seed = seed.encode()
+        self.seed = seed
+        self._counter = 0
+
+    def random_bytes(self, nbytes):
+        """
+        Returns a block of random bytes as a uint8 array.
+        """
+        if self.seed is None:
+            data = os.urandom(nbytes)
+        else:
+            block = self.seed + self._counter.to_bytes(8, 'little')
+            data = hashlib.shake_256(block).digest(nbytes)
+            self._counter += 1
+        return np.frombuffer(data, dtype=np.uint8)
+
+    def random_bits(self, count):
+        """
+        Returns ``count`` random bits as a uint8 array of zeros and ones.
+        """
+        return np.unpackbits(self.random_bytes((count + 7) // 8))[:count]
+
+    def centered_binomial(self, eta, shape):
+        """
+        Samples the centered binomial distribution with parameter eta.
+
+        Every value is the popcount of eta bits minus the popcount of another
+        eta bits, exactly like ``centered_binomial`` in Alkaline.py. For
+        eta <= 4 both popcounts fit in one byte and are read from a table.
+
+        Args:
+            eta (int): The noise parameter.
+            shape (int | tuple): Shape of the output array.
+
+        Returns:
+            numpy.ndarray: int64 array with values in [-eta, eta].
+        """
+        count = int(np.prod(shape))
+        if eta <= 4:
+            values = _centered_binomial_table(eta)[self.random_bytes(count)]
+            return values.astype(np.int64).reshape(shape)
+        bits = self.random_bits(count * 2 * eta).reshape(count, 2, eta)
+        ones = bits.sum(axis=2, dtype=np.int64)
+        return (ones[:, 0] - ones[:, 1]).reshape(shape)
+
+    def uniform_below(self, bound, shape):
+        """
+        Samples integers uniformly from [0, bound) by rejection sampling.
+
+        Candidates use ``bit_length(bound - 1)`` bits, so at least half of them
+        are accepted, and the rejection is done on whole arrays at a time.
+
+        Args:
+            bound (int): Exclusive upper bound (at most 2**63).
+            shape (int | tuple): Shape of the output array.
+
+        Returns:
+            numpy.ndarray: int64 array with values in [0, bound).
+        """
+        count = int(np.prod(shape))
+        if bound == 1:
+            return np.zeros(shape, dtype=np.int64)
+        bits = (bound - 1).bit_length()
+        # Candidates are read as little-endian words of 1, 2, 4 or 8 bytes
+        width = 1 << max(0, (bits - 1).bit_length() - 3)
+        mask = (1 << bits) - 1
+        accepted = []
+        missing = count
+        while missing > 0:
+            # Draw a few extra candidates to make a second round unlikely
+            draw = int(missing * (mask + 1) / bound * 1.1) + 16
+            words = self.random_bytes(draw * width).view(f'<u{width}')
+            candidates = words & np.array(mask, dtype=words.dtype)
+            candidates = candidates[candidates < bound][:missing]
+            accepted.append(candidates.astype(np.int64))
+            missing -= len(candidates)
+        return np.concatenate(accepted).reshape(shape)
+
+    def uniform(self, low, high, shape):
+        """
+        Samples integers uniformly from [low, high] (inclusive).
+        """
+        return self.uniform_below(high - low + 1, shape) + low
+
+    def uniform_mod(self, q, shape):
+        """
+        Samples integers uniformly modulo q, i.e. from [0, q).
+        """
+        return self.uniform_below(q, shape)
+
+
+def new_seed():
+    """A fresh random seed: 16 bytes from the OS CSPRNG as a hex string (fits in JSON)."""
+    return os.urandom(16).hex()
+
+
+def session_sampler(seed=None):
+    """
+    Seed and sampler of a session.
+
+    Every session draws all its randomness from one seeded stream, so the
+    session is a function of (algorithm, parameters, seed) and can be
+    regenerated bit for bit by initializing again with the same seed.
+
+    Args:
+        seed (int | str | bytes | None): The seed (a new one when None).
+
+    Returns:
+        tuple: The seed and a ``Sampler`` seeded with it.
+    """
+    seed = new_seed() if seed is None else seed
+    return seed, Sampler(seed)
+
+
+def _centered_binomial_table(eta):
+    """
+    Table mapping a byte to popcount(low eta bits) - popcount(next eta bits).
+    """
+    byte = np.arange(256)
+    mask = (1 << eta) - 1
+    ones = np.unpackbits(byte.astype(np.uint8)[:, None], axis=1)
+    popcount = ones.sum(axis=1)
+    return (popcount[byte & mask] - popcount[(byte >> eta) & mask]).astype(np.int8)
@@ -0,0 +1,292 @@
+"""
+Compact binary format for the keys and ciphertexts of LWE and Alkaline.
+
+Coefficients modulo q are bit-packed at ceil(log2 q) bits each. Alkaline
+ciphertexts can also be compressed Kyber-style to d_u/d_v bits per
+coefficient, and the public matrix ``A`` can be stored as a seed and expanded
+again with ``expand_matrix``.
+
+Every encoding starts with a fixed header::
+
+    version (1) | kind (1) | n (2) | k (2) | q (8) | d_u (1) | d_v (1)
+
+followed by the packed payload. For seeded public keys the payload starts
+with one byte with the seed length and the seed itself.
+"""
+import json
+import struct
+import numpy as np
+from lattice_based.sampling import Sampler
+
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<BBHHQBB')
+
+LWE_PUBLIC_KEY = 1
+LWE_CIPHERTEXT = 2
+ALKALINE_PUBLIC_KEY = 3
+ALKALINE_SEEDED_PUBLIC_KEY = 4
+ALKALINE_SECRET_KEY = 5
+ALKALINE_CIPHERTEXT = 6
+
+
+def coefficient_bits(q):
+    """Number of bits needed for a coefficient modulo q, i.e. ceil(log2 q)."""
+    return (q - 1).bit_length()
+
+
+def packed_size(count, bits):
+    """Number of bytes used by ``count`` values packed at ``bits`` bits."""
+    return (count * bits + 7) // 8
+
+
+def pack_bits(values, bits):
+    """
+    Packs non-negative integers at ``bits`` bits each (little-endian order).
+
+    Args:
+        values (array_like): Integers in [0, 2**bits).
+        bits (int): Number of bits per value (at most 64).
+
+    Returns:
+        bytes: The packed values.
+    """
+    values = np.asarray(values, dtype=np.uint64).ravel()
+    shifts = np.arange(bits, dtype=np.uint64)
+    matrix = ((values[:, None] >> shifts) & np.uint64(1)).astype(np.uint8)
+    return np.packbits(matrix.ravel(), bitorder='little').tobytes()
+
+
+def unpack_bits(data, bits, count):
+    """
+    Inverse of ``pack_bits``.
+
+    Returns:
+        numpy.ndarray: uint64 array with ``count`` values.
+    """
+    raw = np.frombuffer(data, dtype=np.uint8, count=packed_size(count, bits))
+    matrix = np.unpackbits(raw, bitorder='little')[:count * bits].reshape(count, bits)
+    weights = np.uint64(1) << np.arange(bits, dtype=np.uint64)
+    return (matrix.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+
+
+def compress(x, q, d):
+    """
+    Kyber-style lossy compression: round(2**d / q * x) mod 2**d.
+
+    Integer arithmetic only, so there is no floating point rounding.
+    """
+    x = np.asarray(x, dtype=object) % q
+    return np.asarray(((x * (1 << d) + q // 2) // q) % (1 << d), dtype=np.uint64)
+
+
+def decompress(y, q, d):
+    """
+    Inverse of ``compress`` up to an error of about q / 2**(d + 1).
+    """
+    y = np.asarray(y, dtype=object)
+    return np.asarray((y * q + (1 << (d - 1))) >> d, dtype=np.int64)
+
+
+def expand_matrix(seed, k, n, q):
+    """
+    Expands the public matrix A of Alkaline from a seed.
+
+    Args:
+        seed (bytes): The seed stored in the public key.
+        k (int): Dimension of the module.
+        n (int): Degree of the polynomials.
+        q (int): The modulus.
+
+    Returns:
+        numpy.ndarray: Array of shape (k, k, n) with coefficients in [0, q).
+    """
+    return Sampler(seed).uniform_mod(q, (k, k, n))
+
+
+def _header(kind, n, k, q, d_u=0, d_v=0):
+    return _HEADER.pack(FORMAT_VERSION, kind, n, k, q, d_u, d_v)
+
+
+def _read_header(data, kind):
+    version, found, n, k, q, d_u, d_v = _HEADER.unpack_from(data)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported format version {version}")
+    if found != kind:
+        raise ValueError(f"Expected object of kind {kind}, found {found}")
+    return n, k, q, d_u, d_v, memoryview(data)[_HEADER.size:]
+
+
+def _pack_mod(values, q):
+    return pack_bits(np.asarray(values, dtype=object) % q, coefficient_bits(q))
+
+
+def _unpack_mod(payload, q, count):
+    return unpack_bits(payload, coefficient_bits(q), count).astype(np.int64)
+
+
+def encode_lwe_public_key(A, B, q):
+    """
+    Encodes the public key (A, B, Q) of the 1-bit LWE.
+
+    Args:
+        A (list): The values a of the public key.
+        B (list): The values b = a*s + e mod q.
+        q (int): The modulus.
+
+    Returns:
+        bytes: The encoded public key.
+    """
+    return _header(LWE_PUBLIC_KEY, len(A), 1, q) + _pack_mod(list(A) + list(B), q)
+
+
+def decode_lwe_public_key(data):
+    """
+    Returns:
+        tuple: The arrays A and B and the modulus q.
+    """
+    nvals, _, q, _, _, payload = _read_header(data, LWE_PUBLIC_KEY)
+    values = _unpack_mod(payload, q, 2 * nvals)
+    return values[:nvals], values[nvals:], q
+
+
+def encode_lwe_ciphertext(u, v, q):
+    """Encodes the ciphertext (U, V) of the 1-bit LWE."""
+    return _header(LWE_CIPHERTEXT, 1, 1, q) + _pack_mod([u, v], q)
+
+
+def decode_lwe_ciphertext(data):
+    """
+    Returns:
+        tuple: The values u and v and the modulus q.
+    """
+    _, _, q, _, _, payload = _read_header(data, LWE_CIPHERTEXT)
+    u, v = _unpack_mod(payload, q, 2)
+    return int(u), int(v), q
+
+
+def encode_alkaline_public_key(t, q, A=None, seed=None):
+    """
+    Encodes the public key (A, t) of Alkaline.
+
+    When ``seed`` is given, A must have been generated with
+    ``expand_matrix(seed, k, n, q)`` and only the seed is stored.
+
+    Args:
+        t (array_like): Polynomial vector of shape (k, n).
+        q (int): The modulus.
+        A (array_like): Polynomial matrix of shape (k, k, n).
+        seed (bytes): Seed of the matrix A (at most 255 bytes).
+
+    Returns:
+        bytes: The encoded public key.
+    """
+    t = np.asarray(t)
+    k, n = t.shape
+    if seed is not None:
+        header = _header(ALKALINE_SEEDED_PUBLIC_KEY, n, k, q)
+        return header + bytes([len(seed)]) + seed + _pack_mod(t, q)
+    values = np.concatenate([np.asarray(A).ravel(), t.ravel()])
+    return _header(ALKALINE_PUBLIC_KEY, n, k, q) + _pack_mod(values, q)
+
+
+def decode_alkaline_public_key(data):
+    """
+    Returns:
+        tuple: The matrix A of shape (k, k, n), the vector t of shape (k, n)
+        and the modulus q. Seeded keys have A expanded from the seed.
+    """
+    kind = data[1]
+    if kind == ALKALINE_SEEDED_PUBLIC_KEY:
+        n, k, q, _, _, payload = _read_header(data, kind)
+        length = payload[0]
+        seed = bytes(payload[1:1 + length])
+        t = _unpack_mod(payload[1 + length:], q, k * n).reshape(k, n)
+        return expand_matrix(seed, k, n, q), t, q
+    n, k, q, _, _, payload = _read_header(data, ALKALINE_PUBLIC_KEY)
+    values = _unpack_mod(payload, q, k * k * n + k * n)
+    return values[:k * k * n].reshape(k, k, n), values[k * k * n:].reshape(k, n), q
+
+
+def encode_alkaline_secret_key(s, q):
+    """Encodes the secret key s of Alkaline (shape (k, n)) modulo q."""
+    s = np.asarray(s)
+    k, n = s.shape
+    return _header(ALKALINE_SECRET_KEY, n, k, q) + _pack_mod(s, q)
+
+
+def decode_alkaline_secret_key(data):
+    """
+    Returns:
+        tuple: The secret key with centered coefficients and the modulus q.
+    """
+    n, k, q, _, _, payload = _read_header(data, ALKALINE_SECRET_KEY)
+    s = _unpack_mod(payload, q, k * n).reshape(k, n)
+    return np.where(s > q // 2, s - q, s), q
+
+
+def encode_alkaline_ciphertext(u, v, q, d_u=None, d_v=None):
+    """
+    Encodes the ciphertext (u, v) of Alkaline.
+
+    Args:
+        u (array_like): Polynomial vector of shape (k, n).
+        v (array_like): Polynomial of shape (n,).
+        q (int): The modulus.
+        d_u (int): Bits per compressed coefficient of u (None keeps u exact).
+        d_v (int): Bits per compressed coefficient of v (None keeps v exact).
+
+    Returns:
+        bytes: The encoded ciphertext.
+    """
+    u = np.asarray(u)
+    k, n = u.shape
+    u_bytes = pack_bits(compress(u, q, d_u), d_u) if d_u else _pack_mod(u, q)
+    v_bytes = pack_bits(compress(v, q, d_v), d_v) if d_v else _pack_mod(v, q)
+    header = _header(ALKALINE_CIPHERTEXT, n, k, q, d_u or 0, d_v or 0)
+    return header + u_bytes + v_bytes
+
+
+def decode_alkaline_ciphertext(data):
+    """
+    Returns:
+        tuple: u of shape (k, n), v of shape (n,) and the modulus q.
+        Compressed parts are decompressed, so they are only approximate.
+    """
+    n, k, q, d_u, d_v, payload = _read_header(data, ALKALINE_CIPHERTEXT)
+    u_bits = d_u or coefficient_bits(q)
+    u_size = packed_size(k * n, u_bits)
+    u = unpack_bits(payload[:u_size], u_bits, k * n).reshape(k, n)
+    v = unpack_bits(payload[u_size:], d_v or coefficient_bits(q), n)
+    u = decompress(u, q, d_u) % q if d_u else u.astype(np.int64)
+    v = decompress(v, q, d_v) % q if d_v else v.astype(np.int64)
+    return u, v, q
+
+
+def alkaline_sizes(n, k, q, d_u=None, d_v=None, seed_bytes=32):
+    """
+    Exact byte sizes of the Alkaline encodings and of their JSON equivalents.
+
+    The JSON sizes are estimated with the largest coefficient, i.e. the worst
+    case of the ``json.dumps`` of the list-of-lists returned by Alkaline.py.
+
+    Returns:
+        dict: Sizes in bytes of each object in both formats.
+    """
+    bits = coefficient_bits(q)
+    header = _HEADER.size
+    sizes = {
+        'public_key': header + packed_size(k * k * n + k * n, bits),
+        'seeded_public_key': header + 1 + seed_bytes + packed_size(k * n, bits),
+        'secret_key': header + packed_size(k * n, bits),
+        'ciphertext': header + packed_size(k * n, d_u or bits) + packed_size(n, d_v or bits),
+    }
+    largest = [q - 1] * n
+    sizes['json_public_key'] = json_size([[[largest] * k] * k, [largest] * k])
+    sizes['json_ciphertext'] = json_size([[largest] * k, largest])
+    return sizes
+
+
+def json_size(obj):
+    """Size in bytes of the JSON representation of ``obj``."""
+    return len(json.dumps(obj).encode())
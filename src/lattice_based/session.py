@@ -0,0 +1,226 @@
+"""
+Binary bundles of sessions, to save a large session and reopen it later.
+
+A bundle is a directory with ``manifest.json`` and one ``.npy`` file per
+array of the session data (bases, inverses, vectors, traces), or the same
+members in a single ``.npz`` file. The manifest holds the format version,
+the fields that are not arrays (names, flags, histories of dicts) and, for
+each array, its files and encoding:
+
+- ``raw``: a numeric array saved as is;
+- ``limbs``: integers beyond int64 (exact GGH, q-ary bases) as 32-bit limbs
+  of their absolute values plus an int8 array with the signs;
+- ``records``: traces of tagged operations such as ``['size', k, j, r]``,
+  as an int64 table [tag, length, values...] with the tags in the manifest.
+
+``load_session`` memory-maps the ``.npy`` members, so reopening a session
+of dimension 2000 only reads from disk the slices the viewer touches.
+"""
+import json
+import os
+import re
+import unicodedata
+from collections.abc import Mapping
+import numpy as np
+
+FORMAT_VERSION = 1
+
+MANIFEST = 'manifest.json'
+
+# Directory of the bundles saved and opened by the interface
+SESSION_DIR = os.environ.get('AVACPQ_SESSIONS', 'sessions')
+
+_LIMB_BITS = 32
+
+_INT64_BOUND = 1 << 63
+
+
+def _is_integer(x):
+    return isinstance(x, (int, np.integer)) and not isinstance(x, (bool, np.bool_))
+
+
+def _records(value):
+    """Int64 table and tags of a trace of tagged operations, or None."""
+    if not all(isinstance(row, (list, tuple)) and row and isinstance(row[0], str) for row in value):
+        return None
+    if not all(_is_integer(x) and -_INT64_BOUND <= x < _INT64_BOUND for row in value for x in row[1:]):
+        return None
+    tags = sorted({row[0] for row in value})
+    width = max(len(row) for row in value) + 1
+    table = np.zeros((len(value), width), dtype=np.int64)
+    for i, row in enumerate(value):
+        table[i, :2] = tags.index(row[0]), len(row) - 1
+        table[i, 2:len(row) + 1] = row[1:]
+    return table, tags
+
+
+def _limbs(array):
+    """32-bit limbs (last axis, least significant first) and signs of an integer object array."""
+    signs = np.sign(array).astype(np.int8)
+    magnitudes = np.abs(array)
+    count = max(1, (max(int(x).bit_length() for x in magnitudes.flat) + _LIMB_BITS - 1) // _LIMB_BITS)
+    mask = (1 << _LIMB_BITS) - 1
+    limbs = np.stack([((magnitudes >> (_LIMB_BITS * i)) & mask).astype(np.uint32)
+                      for i in range(count)], axis=-1)
+    return limbs, signs
+
+
+def _from_limbs(limbs, signs):
+    values = np.zeros(limbs.shape[:-1], dtype=object)
+    for i in range(limbs.shape[-1] - 1, -1, -1):
+        values = (values << _LIMB_BITS) + np.asarray(limbs[..., i]).astype(object)
+    return values * np.asarray(signs).astype(object)
+
+
+def _encode(value):
+    """
+    (encoding, members, extra manifest entries) of a field, or None if it stays in the manifest.
+    """
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if not isinstance(value, list) or not value:
+        return None
+    records = _records(value)
+    if records is not None:
+        return 'records', {'': records[0]}, {'tags': records[1]}
+    try:
+        array = np.array(value)
+    except (ValueError, OverflowError):
+        return None
+    # Rows such as (m, swap) mix integers and booleans, which an array would not keep apart
+    row = value[0] if array.ndim > 1 else value
+    if array.dtype.kind != 'b' and any(isinstance(x, bool) for x in np.ravel(np.array(row, dtype=object))):
+        return None
+    if array.dtype.kind in 'iufb':
+        return 'raw', {'': array}, {}
+    if array.dtype == object and all(_is_integer(x) for x in array.flat):
+        limbs, signs = _limbs(array)
+        return 'limbs', {'': limbs, '.sign': signs}, {}
+    return None
+
+
+def bundle_name(data):
+    """Default name of the bundle of a session: algorithm, dimension and seed."""
+    label = unicodedata.normalize('NFKD', data.get('algorithm') or data.get('method') or 'sessao')
+    label = re.sub(r'[^A-Za-z0-9]+', '_', label.encode('ascii', 'ignore').decode()).strip('_')
+    return f"{label}-n{data.get('dimension')}-{str(data.get('seed', 'sem_semente'))[:8]}"
+
+
+def session_path(name, directory=None):
+    """
+    Path of a bundle inside the sessions directory.
+
+    Raises:
+        ValueError: If the name points outside the directory.
+    """
+    root = os.path.realpath(directory or SESSION_DIR)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root or path == root:
+        raise ValueError(f"Invalid session name: {name}")
+    return path
+
+
+def export_session(data, path):
+    """
+    Saves the data of a session as a bundle.
+
+    Args:
+        data (dict): The data returned by ``initialize``.
+        path (str): A directory (``.npy`` bundle) or a file ending in ``.npz``.
+
+    Returns:
+        dict: The manifest written.
+    """
+    compressed = str(path).endswith('.npz')
+    fields, arrays, members = {}, {}, {}
+    for key, value in data.items():
+        encoded = _encode(value)
+        if encoded is None:
+            fields[key] = value
+            continue
+        encoding, parts, extra = encoded
+        files = {}
+        for suffix, array in parts.items():
+            member = f"{key}{suffix}"
+            files[suffix or 'data'] = member
+            members[member] = array
+        arrays[key] = {'encoding': encoding, 'files': files, **extra}
+    manifest = {'version': FORMAT_VERSION, 'fields': fields, 'arrays': arrays}
+    text = json.dumps(manifest)
+    if compressed:
+        np.savez(path, **{MANIFEST: np.frombuffer(text.encode(), dtype=np.uint8)},
+                 **members)
+    else:
+        os.makedirs(path, exist_ok=True)
+        for member, array in members.items():
+            np.save(os.path.join(path, f"{member}.npy"), array, allow_pickle=False)
+        with open(os.path.join(path, MANIFEST), 'w') as manifest_file:
+            manifest_file.write(text)
+    return manifest
+
+
+class SessionBundle(Mapping):
+    """
+    Read-only view of a saved session, with the arrays loaded on first access.
+
+    Raw arrays of ``.npy`` bundles are memory-mapped; integers beyond int64
+    and traces are decoded when their field is read.
+    """
+
+    def __init__(self, path, mmap=True):
+        """
+        Args:
+            path (str): The bundle directory or ``.npz`` file.
+            mmap (bool): Memory-map the ``.npy`` members.
+
+        Raises:
+            ValueError: If the bundle has another format version.
+        """
+        self.path = path
+        self.mmap = mmap
+        self._npz = None
+        if str(path).endswith('.npz'):
+            self._npz = np.load(path, allow_pickle=False)
+            manifest = json.loads(self._npz[MANIFEST].tobytes().decode())
+        else:
+            with open(os.path.join(path, MANIFEST)) as manifest_file:
+                manifest = json.load(manifest_file)
+        if manifest.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported session format version {manifest.get('version')}")
+        self.fields = manifest['fields']
+        self.arrays = manifest['arrays']
+        self._cache = {}
+
+    def _member(self, member):
+        if self._npz is not None:
+            return self._npz[member]
+        return np.load(os.path.join(self.path, f"{member}.npy"),
+                       mmap_mode='r' if self.mmap else None, allow_pickle=False)
+
+    def __getitem__(self, key):
+        if key in self.fields:
+            return self.fields[key]
+        if key not in self._cache:
+            entry = self.arrays[key]
+            files = entry['files']
+            if entry['encoding'] == 'raw':
+                value = self._member(files['data'])
+            elif entry['encoding'] == 'limbs':
+                value = _from_limbs(self._member(files['data']), self._member(files['.sign']))
+            else:
+                tags = entry['tags']
+                value = [[tags[row[0]], *map(int, row[2:2 + row[1]])] for row in self._member(files['data'])]
+            self._cache[key] = value
+        return self._cache[key]
+
+    def __iter__(self):
+        yield from self.fields
+        yield from self.arrays
+
+    def __len__(self):
+        return len(self.fields) + len(self.arrays)
+
+
+def load_session(path, mmap=True):
+    """Opens a bundle saved by ``export_session`` (see ``SessionBundle``)."""
+    return SessionBundle(path, mmap)
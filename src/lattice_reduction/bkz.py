@@ -0,0 +1,313 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import plotly.graph_objects as go
+from dash import html, dcc
+from lattice_based.sampling import Sampler, session_sampler
+from lattice_reduction.enumeration import gram_schmidt, gaussian_heuristic, pruning_coefficients, enumerate_svp
+from lattice_reduction.lll import lll_reduce
+from lattice_reduction.methods import LatticeBasedMethod, random_qary_basis
+from lattice_reduction.quality import basis_quality
+
+
+def insert_vector(basis, start, end, coefficients):
+    """
+    Inserts the vector sum(c_i * b_(start+i)) at position ``start``.
+
+    The coefficients of a shortest vector are coprime, so the Euclidean
+    algorithm on them gives a unimodular transformation of the block rows
+    whose first row is the new vector. The basis keeps its size (no
+    dependent vector to remove by a later LLL).
+
+    Returns:
+        list: The new basis as rows of Python integers.
+    """
+    rows = [list(basis[i]) for i in range(start, end)]
+    x = [int(c) for c in coefficients]
+    while sum(1 for c in x if c) > 1:
+        i = min((i for i, c in enumerate(x) if c), key=lambda i: abs(x[i]))
+        for j, c in enumerate(x):
+            if j != i and c:
+                q = c // x[i]
+                x[j] -= q * x[i]
+                rows[i] = [a + q * b for a, b in zip(rows[i], rows[j])]
+    i = next(i for i, c in enumerate(x) if c)
+    if x[i] < 0:
+        rows[i] = [-a for a in rows[i]]
+    rows.insert(0, rows.pop(i))
+    return [list(row) for row in basis[:start]] + rows + [list(row) for row in basis[end:]]
+
+
+def rerandomize(basis, sampler, rounds=None):
+    """Random unimodular combination of the rows (row_i += ±row_j, j > i)."""
+    n = len(basis)
+    basis = [list(row) for row in basis]
+    rounds = rounds or 2 * n
+    pairs = sampler.uniform_below(n, (rounds, 2))
+    signs = 2 * sampler.uniform_below(2, rounds) - 1
+    for (i, j), s in zip(pairs, signs):
+        if i != j:
+            basis[i] = [a + int(s) * b for a, b in zip(basis[i], basis[j])]
+    return basis
+
+
+# With pruning, the enumeration radius is capped at this factor of the Gaussian heuristic
+GH_FACTOR = 1.1
+
+
+def _enumerate_block(args):
+    """Enumeration of one block (a top-level function, so it can run in a process pool)."""
+    mu, B, pruning, max_nodes = args
+    radius2 = B[0] * (1 + 1e-9)
+    if min(pruning) < 1:
+        # The pruned bounds are fractions of the radius: starting from ||b*_k||
+        # would make them too loose at the top levels and too tight below
+        radius2 = min(radius2, GH_FACTOR ** 2 * gaussian_heuristic(B))
+    return enumerate_svp(mu, B, radius2, pruning, max_nodes)
+
+
+def bkz_reduce(basis, block_size=10, delta=0.99, pruning='none', max_tours=16, stall_tours=2,
+               tolerance=1e-4, max_nodes=None, max_time=None, workers=None, trajectory=None,
+               snapshots=None, on_tour=None):
+    """
+    BKZ reduction with Schnorr-Euchner enumeration in each block.
+
+    The basis is LLL-reduced first. A tour goes through the blocks
+    [k, k + block_size) and, when the enumeration finds a vector shorter than
+    delta * ||b*_k||, inserts it at position k and LLL-reduces the prefix.
+    The reduction ends after a tour without insertions, or as soon as the
+    log potential improves by less than ``tolerance`` (relative) during
+    ``stall_tours`` tours in a row.
+
+    With ``workers`` the tour is split in rounds of disjoint blocks: the
+    blocks of a round do not change each other's Gram-Schmidt data, so they
+    are enumerated in parallel in a process pool and inserted together.
+
+    Args:
+        basis (array_like): Basis vectors as rows.
+        block_size (int): The block size β (2 is LLL, n is HKZ).
+        delta (float): Lovász parameter of the LLL and of the insertions.
+        pruning (str): ``'none'``, ``'linear'`` or ``'extreme'``.
+        max_tours (int): Maximum number of tours.
+        stall_tours (int): Tours without progress before aborting.
+        tolerance (float): Minimum relative progress of the log potential.
+        max_nodes (int): Limit of nodes of each enumeration.
+        max_time (float): Aborts after this many seconds (checked between tours).
+        workers (int): Number of processes for the disjoint blocks.
+        trajectory (list): Receives one dict per tour with the tour number,
+            the elapsed time, the insertions and the ``basis_quality`` values.
+        snapshots (list): Receives the basis after each tour.
+        on_tour (callable): Called with (tour, max_tours) after each tour.
+
+    Returns:
+        list: The reduced basis as rows of Python integers.
+    """
+    start_time = time.perf_counter()
+    b = lll_reduce(basis, delta)
+    n = len(b)
+    block_size = max(2, min(block_size, n))
+
+    def record(tour, insertions):
+        if trajectory is not None:
+            quality = basis_quality(b, condition=False)
+            trajectory.append({'tour': tour, 'time': time.perf_counter() - start_time,
+                               'insertions': insertions, **quality})
+        if snapshots is not None:
+            snapshots.append([list(map(int, row)) for row in b])
+
+    record(0, 0)
+    potential = basis_quality(b, condition=False)['log_potential']
+    stalled = 0
+    executor = ProcessPoolExecutor(workers) if workers and workers > 1 else None
+    try:
+        for tour in range(1, max_tours + 1):
+            insertions = 0
+            if executor is None:
+                rounds = [[k] for k in range(n - 1)]
+            else:
+                rounds = [list(range(offset, n - 1, block_size)) for offset in range(block_size)]
+            for starts in rounds:
+                if not starts:
+                    continue
+                mu, B = gram_schmidt(b)
+                jobs = []
+                for k in starts:
+                    end = min(k + block_size, n)
+                    jobs.append((mu[k:end, k:end], B[k:end],
+                                 pruning_coefficients(end - k, pruning), max_nodes))
+                results = executor.map(_enumerate_block, jobs) if executor else map(_enumerate_block, jobs)
+                # Later blocks first: an insertion never moves the rows before it
+                updates = [(k, result) for k, result in zip(starts, results)]
+                prefix = 0
+                for k, (coefficients, norm2, _) in reversed(updates):
+                    if coefficients is not None and norm2 < delta * B[k]:
+                        b = insert_vector(b, k, min(k + block_size, n), coefficients)
+                        prefix = max(prefix, min(k + block_size, n))
+                        insertions += 1
+                if prefix:
+                    b = lll_reduce(b[:prefix], delta, verify=False) + b[prefix:]
+            record(tour, insertions)
+            if on_tour is not None:
+                on_tour(tour, max_tours)
+            new_potential = basis_quality(b, condition=False)['log_potential']
+            progress = (potential - new_potential) / abs(potential) if potential else 0
+            potential = new_potential
+            stalled = stalled + 1 if progress < tolerance else 0
+            if insertions == 0 or stalled >= stall_tours:
+                break
+            if max_time is not None and time.perf_counter() - start_time > max_time:
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return lll_reduce(b, delta)
+
+
+def _bkz_trial(args):
+    """One randomized BKZ run (a top-level function, so it can run in a process pool)."""
+    basis, seed, kwargs = args
+    trajectory = []
+    reduced = bkz_reduce(rerandomize(basis, Sampler(seed)), trajectory=trajectory, **kwargs)
+    return reduced, trajectory
+
+
+def bkz_randomized(basis, trials=4, workers=None, seed=None, **kwargs):
+    """
+    Runs BKZ on several re-randomized copies of the basis and keeps the best.
+
+    This is how extreme pruning is meant to be used: each run may miss the
+    shortest vectors, but the runs are independent, so they are spread over
+    a process pool.
+
+    Args:
+        basis (array_like): Basis vectors as rows.
+        trials (int): Number of randomized runs.
+        workers (int): Number of processes (defaults to ``os.cpu_count()``).
+        seed (bytes): Seed of the re-randomizations (random when None).
+        **kwargs: Arguments of ``bkz_reduce`` (except the lists).
+
+    Returns:
+        tuple: The basis with the shortest first vector and the trajectories
+        of all the runs.
+    """
+    seed = seed if seed is not None else os.urandom(16)
+    seed = seed if isinstance(seed, bytes) else str(seed).encode()
+    basis = [[int(x) for x in row] for row in basis]
+    jobs = [(basis, seed + trial.to_bytes(4, 'little'), kwargs) for trial in range(trials)]
+    with ProcessPoolExecutor(workers or os.cpu_count()) as executor:
+        results = list(executor.map(_bkz_trial, jobs))
+    best = min(results, key=lambda result: sum(x * x for x in result[0][0]))
+    return best[0], [trajectory for _, trajectory in results]
+
+
+class BKZ(LatticeBasedMethod):
+    """
+    BKZ reduction shown tour by tour.
+
+    The reduction runs once in ``initialize``; the basis after each tour and
+    the quality trajectory are stored, so every step only plots them.
+    """
+
+    # Bits of p per dimension of the q-ary input basis: LLL stays visibly
+    # short of BKZ, and the first (exact) LLL takes about a second at n = 40
+    BITS_PER_DIMENSION = 4
+
+    def __init__(self, dimension=2, block_size=10, delta=0.99, pruning='none'):
+        self.dimension = dimension
+        self.block_size = block_size
+        self.delta = delta
+        self.pruning = pruning
+        self.tours = 0
+        self.sampler = Sampler()
+
+    @property
+    def step_phases(self):
+        """Phases of the BKZ (one step per tour, the LLL preprocessing included)."""
+        return {
+            'basis': (0, 1),                                   # Input basis
+            'tours': (2, 1 + self.tours),                      # LLL and the tours
+            'result': (2 + self.tours, 2 + self.tours)         # Reduced basis
+        }
+
+    def initialize(self, dimension=2, seed=None):
+        self.dimension = dimension
+        seed, self.sampler = session_sampler(seed)
+        basis = random_qary_basis(dimension, self.BITS_PER_DIMENSION * dimension, self.sampler)
+        trajectory, snapshots = [], []
+        self.report_progress(0.05, "Reduzindo a base com LLL")
+        reduced = bkz_reduce(basis, self.block_size, self.delta, self.pruning,
+                             trajectory=trajectory, snapshots=snapshots,
+                             on_tour=lambda tour, tours: self.report_progress(
+                                 0.1 + 0.9 * tour / tours, f"Tour {tour} (no máximo {tours})"))
+        self.tours = len(snapshots)
+        return {
+            'dimension': dimension,
+            'block_size': min(self.block_size, dimension),
+            'pruning': self.pruning,
+            'basis': basis,
+            'reduced': reduced,
+            'snapshots': snapshots,
+            'trajectory': trajectory,
+            'seed': seed,
+            'method': 'BKZ'
+        }
+
+    def process_step(self, step, data):
+        """Processes a step plotting the Gram-Schmidt profile of the tours done."""
+        self.tours = len(data['snapshots'])
+        phase, phase_step = self.get_phase_for_step(step)
+        if phase == 'basis':
+            done = 0
+        elif phase == 'tours':
+            done = phase_step + 1
+        else:
+            done = self.tours
+        return dcc.Graph(figure=profile_figure(data, done)), bkz_steps_content(data, done, phase == 'result')
+
+
+def profile_figure(data, done):
+    """Log2 of the Gram-Schmidt norms of the input basis and of the first ``done`` tours."""
+    fig = go.Figure()
+    curves = [('Base Original', basis_quality(data['basis'], condition=False)['profile'])]
+    for entry in data['trajectory'][:done]:
+        name = 'LLL' if entry['tour'] == 0 else f"Tour {entry['tour']}"
+        curves.append((name, entry['profile']))
+    for i, (name, profile) in enumerate(curves):
+        last = i == len(curves) - 1
+        fig.add_trace(go.Scatter(x=list(range(1, len(profile) + 1)), y=profile, mode='lines+markers',
+                                 name=name, opacity=1 if last else 0.35))
+    fig.update_layout(title='Perfil de Gram-Schmidt (BKZ)', xaxis_title='i',
+                      yaxis_title='log2 ||b*_i||', template='plotly_dark')
+    return fig
+
+
+def bkz_steps_content(data, done, finished):
+    """Generates the step by step text of the first ``done`` tours."""
+    content = [html.Div([
+        html.H5("Base de Entrada"),
+        html.P(f"Reticulado q-ário aleatório (Goldstein-Mayer), p de {int(data['basis'][0][0]).bit_length()} bits",
+               style={'text-align': 'left'}),
+        html.P(f"β = {data['block_size']}, poda = {data['pruning']}, dimensão = {data['dimension']}",
+               style={'fontFamily': 'monospace', 'text-align': 'left'})
+    ], className='step-box')]
+
+    for entry in data['trajectory'][:done]:
+        title = "Pré-processamento LLL" if entry['tour'] == 0 else f"Tour {entry['tour']}"
+        content.insert(0, html.Div([
+            html.H5(title),
+            html.P([f"inserções = {entry['insertions']}", html.Br(),
+                    f"||b1|| = {entry['b1_norm']:.2f}", html.Br(),
+                    f"fator de Hermite (raiz) = {entry['root_hermite']:.4f}", html.Br(),
+                    f"tempo = {entry['time']:.3f} s"],
+                   style={'fontFamily': 'monospace', 'text-align': 'left'})
+        ], className='step-box'))
+
+    if finished:
+        content.insert(0, html.Div([
+            html.H5("Base Reduzida"),
+            html.P(f"b1 = {[int(x) for x in data['reduced'][0]]}", style={'fontFamily': 'monospace', 'text-align': 'left'})
+        ], className='step-box'))
+
+    return html.Div([html.H3("Passo a Passo", className="algorithm-title"),
+        html.H4("Redução BKZ"),
+        *content], style={'marginTop': '5px', 'color': 'white', 'fontWeight': 'bold'})
@@ -0,0 +1,112 @@
+"""
+Approximate closest vector (CVP) solvers of Babai.
+
+Both algorithms need a factorization of the basis: the inverse for the
+rounding and the QR (Gram-Schmidt) decomposition for the nearest plane. It
+is computed once per basis and kept in a small cache, so decrypting many
+ciphertexts under the same private key only costs the triangular pass.
+"""
+from functools import lru_cache
+import numpy as np
+
+
+class BabaiSolver:
+    """
+    Babai rounding and nearest plane for a fixed basis (vectors as rows).
+
+    Targets are rows too: a single vector of shape (n,) or a stack of shape
+    (m, n), solved together.
+    """
+
+    def __init__(self, basis):
+        """
+        Args:
+            basis (array_like): A full-rank square basis, vectors as rows.
+        """
+        self.basis = np.array(basis, dtype=float)
+        # basis.T = Q R, so b_i = sum_j R[j, i] q_j and b*_i = R[i, i] q_i
+        self.Q, self.R = np.linalg.qr(self.basis.T)
+        self._inverse = None
+
+    @property
+    def inverse(self):
+        """Inverse of the basis (computed on the first rounding)."""
+        if self._inverse is None:
+            self._inverse = np.linalg.inv(self.basis)
+        return self._inverse
+
+    def coordinates(self, targets):
+        """Real coordinates of the targets in the basis (t = x·B)."""
+        return np.asarray(targets, dtype=float) @ self.inverse
+
+    def rounding(self, targets):
+        """
+        Babai rounding: rounds every coordinate of the target in the basis.
+
+        Returns:
+            numpy.ndarray: Integer coefficients, with the shape of the targets.
+        """
+        return np.rint(self.coordinates(targets)).astype(np.int64)
+
+    def nearest_plane(self, targets):
+        """
+        Babai nearest plane: fixes the coefficients from the last to the first.
+
+        The targets are written in the orthonormal basis Q (z = t·Q) and the
+        upper triangular system R·y = z is solved by back substitution,
+        rounding each coefficient before it is used in the next rows. Each
+        row of the pass is one vector operation over all the targets.
+
+        Returns:
+            numpy.ndarray: Integer coefficients, with the shape of the targets.
+        """
+        targets = np.asarray(targets, dtype=float)
+        z = np.atleast_2d(targets) @ self.Q
+        n = len(self.R)
+        y = np.zeros_like(z)
+        for i in range(n - 1, -1, -1):
+            residual = z[:, i] - y[:, i + 1:] @ self.R[i, i + 1:]
+            y[:, i] = np.rint(residual / self.R[i, i])
+        y = y.astype(np.int64)
+        return y if targets.ndim == 2 else y[0]
+
+    def closest_vectors(self, targets, method='nearest_plane'):
+        """
+        Lattice vectors close to the targets.
+
+        Args:
+            targets (array_like): Vector of shape (n,) or stack of shape (m, n).
+            method (str): ``'nearest_plane'`` or ``'rounding'``.
+
+        Returns:
+            tuple: The integer coefficients and the lattice vectors (coefficients · basis).
+        """
+        solve = self.rounding if method == 'rounding' else self.nearest_plane
+        coefficients = solve(targets)
+        return coefficients, coefficients @ self.basis
+
+
+@lru_cache(maxsize=32)
+def _cached_solver(key, shape):
+    return BabaiSolver(np.frombuffer(key).reshape(shape))
+
+
+def babai_solver(basis):
+    """Solver of the basis, reusing the factorization of a basis seen before."""
+    basis = np.ascontiguousarray(basis, dtype=float)
+    return _cached_solver(basis.tobytes(), basis.shape)
+
+
+def babai_rounding(basis, targets):
+    """Coefficients of Babai rounding for a target or a stack of targets."""
+    return babai_solver(basis).rounding(targets)
+
+
+def babai_nearest_plane(basis, targets):
+    """Coefficients of Babai nearest plane for a target or a stack of targets."""
+    return babai_solver(basis).nearest_plane(targets)
+
+
+def closest_vectors(basis, targets, method='nearest_plane'):
+    """Coefficients and lattice vectors close to the targets (see ``BabaiSolver.closest_vectors``)."""
+    return babai_solver(basis).closest_vectors(targets, method)
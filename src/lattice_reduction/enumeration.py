@@ -0,0 +1,320 @@
+"""
+Schnorr-Euchner enumeration of short lattice vectors.
+
+The enumeration works on the Gram-Schmidt data (mu, B) of a basis, or of a
+block of a basis, and walks the tree of coefficient vectors from the last
+level down to the first. At every level the coefficients are visited in
+zig-zag order around the projected center, and a subtree is cut as soon as
+its partial squared norm exceeds the (possibly pruned) bound.
+"""
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+
+def gram_schmidt(basis):
+    """
+    Gram-Schmidt data of a basis from a QR factorization (float64).
+
+    Args:
+        basis (array_like): Basis vectors as rows.
+
+    Returns:
+        tuple: The matrix mu (mu[i][j] for j < i, ones on the diagonal) and
+        the array B of squared norms of the Gram-Schmidt vectors.
+    """
+    matrix = np.array([[float(x) for x in row] for row in basis])
+    r = np.linalg.qr(matrix.T, mode='r')
+    diagonal = np.diag(r)
+    mu = (r / diagonal[:, None]).T
+    return mu, diagonal ** 2
+
+
+def gaussian_heuristic(B):
+    """
+    Squared length predicted for the shortest vector by the Gaussian heuristic.
+
+    It is the squared radius of the ball whose volume equals the volume
+    (determinant) of the lattice with Gram-Schmidt norms B.
+    """
+    n = len(B)
+    log_volume = 0.5 * float(np.sum(np.log(B)))
+    log_ball = n / 2 * math.log(math.pi) - math.lgamma(n / 2 + 1)
+    return math.exp(2 * (log_volume - log_ball) / n)
+
+
+def pruning_coefficients(n, kind='none'):
+    """
+    Fractions of the squared radius allowed at each level of the tree.
+
+    The coefficient of level i bounds the partial norm of the n - i
+    coordinates fixed so far. ``'linear'`` is the linear pruning of
+    Schnorr and Hörner, ``'extreme'`` a steeper quadratic profile meant to be
+    repeated over re-randomized bases, since each run may miss the solution.
+
+    Args:
+        n (int): Number of levels.
+        kind (str): ``'none'``, ``'linear'`` or ``'extreme'``.
+
+    Returns:
+        list: The coefficients, indexed by level (the last one is for the top).
+    """
+    depth = np.arange(n, 0, -1) / n
+    if kind == 'linear':
+        return list(depth)
+    if kind == 'extreme':
+        return list(depth ** 2)
+    return [1.0] * n
+
+
+# Number of nodes between two reads of the radius shared by the processes
+SHARED_POLL = 1024
+
+
+def enumerate_svp(mu, B, radius2=None, pruning=None, max_nodes=None, fixed=None, shared=None):
+    """
+    Finds the shortest nonzero vector of the lattice given by (mu, B).
+
+    Partial sums of the centers are cached per level, so moving to a sibling
+    only updates the entries that changed instead of recomputing the whole
+    center (as done in fplll).
+
+    Args:
+        mu (array_like): Gram-Schmidt coefficients (n x n).
+        B (array_like): Squared norms of the Gram-Schmidt vectors.
+        radius2 (float): Initial squared radius (defaults to B[0], so the
+            first basis vector is the solution unless a shorter one exists).
+        pruning (list): Coefficients from ``pruning_coefficients``.
+        max_nodes (int): Stops after visiting this many nodes.
+        fixed (list): Coefficients of the top levels fixed in advance; only
+            the subtree below them is enumerated (used to split the tree).
+        shared (multiprocessing.Value): Best squared norm shared between
+            processes. It is read every ``SHARED_POLL`` nodes to shrink the
+            radius, and lowered when a shorter vector is found here.
+
+    Returns:
+        tuple: The coefficients of the best vector (or None), its squared
+        norm and the number of visited nodes.
+    """
+    n = len(B)
+    mu = [[float(x) for x in row] for row in np.asarray(mu)]
+    B = [float(x) for x in B]
+    pruning = pruning or [1.0] * n
+    radius2 = B[0] * (1 + 1e-9) if radius2 is None else radius2
+    fixed = list(fixed or [])
+    top = n - len(fixed)
+
+    x = [0] * n
+    dx = [0] * n
+    ddx = [0] * n
+    center = [0.0] * n
+    partial = [0.0] * (n + 1)
+    sigma = [[0.0] * (n + 1) for _ in range(n)]
+    begin = [n - 1] * (n + 1)
+
+    # Partial norm of the fixed top coordinates
+    for i in range(n - 1, top - 1, -1):
+        x[i] = fixed[i - top]
+        c = -sum(x[j] * mu[j][i] for j in range(i + 1, n))
+        partial[i] = partial[i + 1] + (x[i] - c) ** 2 * B[i]
+    if top == n and partial[top] >= radius2:
+        return None, radius2, 0
+    if top < n and partial[top] >= radius2 * pruning[top]:
+        return None, radius2, 0
+
+    best = None
+    nodes = 0
+    level = top - 1
+    if level < 0:
+        return (list(x), partial[0], 1) if partial[0] > 0 else (None, radius2, 1)
+
+    def descend(i):
+        for j in range(begin[i + 1], i, -1):
+            sigma[i][j] = sigma[i][j + 1] - x[j] * mu[j][i]
+        if begin[i + 1] > begin[i]:
+            begin[i] = begin[i + 1]
+        begin[i + 1] = i + 1
+        center[i] = sigma[i][i + 1]
+        x[i] = round(center[i])
+        dx[i] = 0
+        ddx[i] = 1 if center[i] >= x[i] else -1
+
+    def next_sibling(i):
+        if partial[i + 1] == 0.0:
+            # Only positive leading coefficients: v and -v are the same solution
+            x[i] += 1
+        else:
+            dx[i] = ddx[i] - dx[i]
+            ddx[i] = -ddx[i]
+            x[i] += dx[i]
+
+    if top == n:
+        # Start at (1, 0, ..., 0): the zero vector is never visited and the
+        # levels above are raised one by one when the bound allows
+        level = 0
+        x[0] = 1
+    else:
+        descend(level)
+    while True:
+        nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            break
+        if shared is not None and nodes % SHARED_POLL == 0:
+            radius2 = min(radius2, shared.value)
+        norm = partial[level + 1] + (x[level] - center[level]) ** 2 * B[level]
+        if norm < radius2 * pruning[level]:
+            partial[level] = norm
+            if level == 0:
+                if norm > 0:
+                    best = list(x)
+                    radius2 = norm
+                    if shared is not None:
+                        with shared.get_lock():
+                            shared.value = min(shared.value, norm)
+                next_sibling(0)
+            else:
+                level -= 1
+                descend(level)
+        else:
+            level += 1
+            if level >= top:
+                break
+            next_sibling(level)
+    return best, radius2, nodes
+
+
+def coefficients_to_vector(basis, coefficients):
+    """Lattice vector with the given coefficients (Python integers)."""
+    vector = [0] * len(basis[0])
+    for c, row in zip(coefficients, basis):
+        if c:
+            vector = [v + int(c) * int(r) for v, r in zip(vector, row)]
+    return vector
+
+
+def subtree_prefixes(mu, B, radius2, depth, pruning=None):
+    """
+    Splits the enumeration tree at a depth.
+
+    Lists the coefficients of the ``depth`` top levels whose partial norm
+    fits under the bound. Each prefix is the root of an independent subtree,
+    to be given to ``enumerate_svp`` as ``fixed``. As in the enumeration,
+    the highest nonzero coefficient is positive, so v and -v are not both
+    visited; the zero prefix is included (vectors living in the lower levels).
+
+    Returns:
+        list: Pairs (partial squared norm, prefix) sorted by the norm, so the
+        most promising subtrees are searched first.
+    """
+    n = len(B)
+    mu = np.asarray(mu)
+    pruning = pruning or [1.0] * n
+    low = n - depth
+    prefixes = []
+    x = [0] * n
+
+    def visit(i, partial, positive):
+        center = -sum(x[j] * mu[j][i] for j in range(i + 1, n))
+        bound = radius2 * pruning[i]
+        width = math.sqrt(max(bound - partial, 0.0) / B[i])
+        first = max(math.ceil(center - width), 0) if positive else math.ceil(center - width)
+        for value in range(first, math.floor(center + width) + 1):
+            norm = partial + (value - center) ** 2 * B[i]
+            if norm >= bound:
+                continue
+            x[i] = value
+            if i == low:
+                prefixes.append((norm, x[low:]))
+            else:
+                visit(i - 1, norm, positive and value == 0)
+        x[i] = 0
+
+    visit(n - 1, 0.0, True)
+    prefixes.sort(key=lambda item: item[0])
+    return prefixes
+
+
+# Gram-Schmidt data and shared radius of the worker processes (set once per process)
+_worker_state = {}
+
+
+def _init_worker(mu, B, pruning, shared):
+    _worker_state.update(mu=mu, B=B, pruning=pruning, shared=shared)
+
+
+def _enumerate_subtree(prefix):
+    state = _worker_state
+    return enumerate_svp(state['mu'], state['B'], state['shared'].value, state['pruning'],
+                         fixed=prefix, shared=state['shared'])
+
+
+def iter_parallel_svp(basis, depth=None, workers=None, pruning=None):
+    """
+    Exact SVP by enumeration split over a process pool, reporting progress.
+
+    The tree is cut at ``depth`` levels from the top (by default, the first
+    depth that gives at least 8 subtrees per worker) and the subtrees are
+    enumerated in parallel. The best squared norm lives in a shared
+    ``multiprocessing.Value``: every worker prunes with the shortest vector
+    found by any of them.
+
+    Args:
+        basis (array_like): An LLL-reduced basis, vectors as rows.
+        depth (int): Number of top levels fixed by each subtree.
+        workers (int): Number of processes (defaults to ``os.cpu_count()``).
+        pruning (str): ``'none'``, ``'linear'`` or ``'extreme'`` (pruned runs
+            are no longer exact).
+
+    Yields:
+        dict: After each subtree, the subtrees done and total, the visited
+        nodes, the elapsed time, the best squared norm and the best vector
+        (rows of Python integers) so far.
+    """
+    start = time.perf_counter()
+    workers = workers or os.cpu_count()
+    mu, B = gram_schmidt(basis)
+    n = len(B)
+    coefficients = pruning_coefficients(n, pruning or 'none')
+    radius2 = float(B[0]) * (1 + 1e-9)
+    if depth is None:
+        depth = 1
+        while depth < n - 1 and len(subtree_prefixes(mu, B, radius2, depth, coefficients)) < 8 * workers:
+            depth += 1
+    prefixes = subtree_prefixes(mu, B, radius2, min(depth, n - 1), coefficients)
+
+    shared = multiprocessing.Value('d', radius2)
+    best_vector, best_norm2, nodes = list(map(int, basis[0])), float(B[0]), 0
+    mu_rows = [list(map(float, row)) for row in mu]
+    B_values = [float(b) for b in B]
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(mu_rows, B_values, coefficients, shared)) as executor:
+        futures = [executor.submit(_enumerate_subtree, prefix) for _, prefix in prefixes]
+        for done, future in enumerate(as_completed(futures), 1):
+            found, norm2, visited = future.result()
+            nodes += visited
+            if found is not None and norm2 < best_norm2:
+                best_vector, best_norm2 = coefficients_to_vector(basis, found), norm2
+            yield {'done': done, 'total': len(futures), 'nodes': nodes,
+                   'time': time.perf_counter() - start, 'norm2': best_norm2, 'vector': best_vector}
+
+
+def parallel_svp(basis, depth=None, workers=None, pruning=None, progress=None):
+    """
+    Shortest vector of an LLL-reduced basis (see ``iter_parallel_svp``).
+
+    Args:
+        progress (callable): Called with each progress dict.
+
+    Returns:
+        tuple: The shortest vector, its squared norm and the visited nodes.
+    """
+    report = None
+    for report in iter_parallel_svp(basis, depth, workers, pruning):
+        if progress is not None:
+            progress(report)
+    if report is None:
+        return list(map(int, basis[0])), sum(int(x) ** 2 for x in basis[0]), 0
+    return report['vector'], report['norm2'], report['nodes']
@@ -0,0 +1,243 @@
+import numpy as np
+from dash import html, dcc
+from lattice_based.ggh.ggh import plot_vectors
+from lattice_based.sampling import Sampler, session_sampler
+from lattice_reduction.methods import LatticeBasedMethod, random_bad_basis
+
+# Same example of the book "Hoffstein2015 Introduction to Mathematical Cryptography",
+# the input basis of the method 'Redução de Gauss (exemplo do livro)'
+BOOK_EXAMPLE = [[66586820, 65354729], [6513996, 6393464]]
+
+
+def _dot(u, v):
+    return u[0] * v[0] + u[1] * v[1]
+
+
+def nearest_integer(numerator, denominator):
+    """Rounds numerator / denominator to the nearest integer (denominator > 0)."""
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def gauss_reduce(v1, v2):
+    """
+    Gauss (Lagrange) reduction of a 2D basis with exact integer arithmetic.
+
+    Only squared norms and inner products of Python integers are used, so
+    there is no sqrt or float and any size of coordinates is exact. The
+    squared norm of v2 is updated from the previous one instead of being
+    recomputed after v2 = v2 - m * v1.
+
+    Args:
+        v1 (list): First basis vector.
+        v2 (list): Second basis vector.
+
+    Returns:
+        tuple: The reduced vectors (v1, v2) and the trace of the iterations,
+        a list of pairs (m, swap) with the multiplier and whether the vectors
+        were swapped at the start of the iteration. The last pair has m = 0.
+
+    Raises:
+        ValueError: If the vectors are linearly dependent (or one is zero).
+    """
+    v1 = [int(x) for x in v1]
+    v2 = [int(x) for x in v2]
+    if v1[0] * v2[1] - v1[1] * v2[0] == 0:
+        raise ValueError("The basis vectors are linearly dependent")
+    norm1 = _dot(v1, v1)
+    norm2 = _dot(v2, v2)
+    trace = []
+    while True:
+        # verifica: ||v1|| <= ||v2||
+        swap = norm2 < norm1
+        if swap:
+            v1, v2 = v2, v1
+            norm1, norm2 = norm2, norm1
+        product = _dot(v1, v2)
+        m = nearest_integer(product, norm1)
+        trace.append((m, swap))
+        # se m == 0, não podemos mais reduzir
+        if m == 0:
+            break
+        v2 = [y - m * x for x, y in zip(v1, v2)]
+        norm2 = norm2 - 2 * m * product + m * m * norm1
+    return v1, v2, trace
+
+
+def replay_gauss(v1, v2, trace, iterations):
+    """
+    Rebuilds the basis after a number of iterations from the trace.
+
+    Only the recorded (m, swap) deltas are applied, no inner product is
+    recomputed.
+
+    Returns:
+        tuple: The vectors (v1, v2) after ``iterations`` iterations.
+    """
+    v1 = [int(x) for x in v1]
+    v2 = [int(x) for x in v2]
+    for m, swap in trace[:iterations]:
+        if swap:
+            v1, v2 = v2, v1
+        v2 = [y - m * x for x, y in zip(v1, v2)]
+    return v1, v2
+
+
+class GaussReduction(LatticeBasedMethod):
+    """
+    Gauss reduction of 2D lattices shown step by step.
+
+    The whole reduction runs once in ``initialize`` and only its trace is
+    stored, so every step of the interface is replayed from the deltas.
+    The input basis is random, or ``BOOK_EXAMPLE`` with ``book_example``.
+    """
+
+    def __init__(self, dimension=2, book_example=False):
+        # Gauss reduction is defined for 2D lattices only
+        self.dimension = 2
+        self.book_example = book_example
+        self.iterations = 0
+        self.sampler = Sampler()
+
+    @property
+    def step_phases(self):
+        """Phases of the Gauss reduction (they depend on the number of iterations)."""
+        return {
+            'basis': (0, 1),                                           # Input basis
+            'reduction': (2, 1 + self.iterations),                     # One step per iteration
+            'result': (2 + self.iterations, 2 + self.iterations)       # Reduced basis
+        }
+
+    def initialize(self, dimension=2, seed=None):
+        seed, self.sampler = session_sampler(seed)
+        if self.book_example:
+            basis = [list(v) for v in BOOK_EXAMPLE]
+        else:
+            basis = random_bad_basis(2, self.sampler, rounds=6, multiplier=8)
+        reduced_v1, reduced_v2, trace = gauss_reduce(*basis)
+        self.iterations = len(trace)
+        return {
+            'dimension': 2,
+            'basis': basis,
+            'reduced': [reduced_v1, reduced_v2],
+            'trace': [[m, swap] for m, swap in trace],
+            'seed': seed,
+            'method': 'Redução de Gauss (exemplo do livro)' if self.book_example else 'Redução de Gauss'
+        }
+
+    def process_step(self, step, data):
+        """Processes a step replaying the stored trace."""
+        self.iterations = len(data['trace'])
+        phase, phase_step = self.get_phase_for_step(step)
+        if phase == 'basis':
+            iterations = 0
+        elif phase == 'reduction':
+            iterations = phase_step + 1
+        else:
+            iterations = self.iterations
+        v1, v2 = replay_gauss(*data['basis'], data['trace'], iterations)
+
+        step_vector_mapping = {step: [
+            {'matrix': np.array(data['basis']), 'color': 'gray', 'dash': 'dot', 'prefix': 'Base Original'},
+            {'matrix': np.array([v1, v2]), 'color': 'red', 'dash': None, 'prefix': 'Base Atual'},
+        ]}
+        fig = plot_vectors(step_vector_mapping, step, 2, True, title='Redução de Gauss')
+        return dcc.Graph(figure=fig), gauss_steps_content(data, iterations, phase == 'result')
+
+
+def gauss_steps_content(data, iterations, finished):
+    """Generates the step by step text for the first ``iterations`` iterations."""
+    # Python integers, whether the basis comes from the store or from a saved session
+    v1, v2 = ([int(x) for x in v] for v in data['basis'])
+    content = [html.Div([
+        html.H5("Base de Entrada"),
+        html.P([f"v1 = {v1}", html.Br(), f"v2 = {v2}"],
+               style={'fontFamily': 'monospace', 'text-align': 'left'})
+    ], className='step-box')]
+
+    for i, (m, swap) in enumerate(data['trace'][:iterations]):
+        lines = []
+        if swap:
+            v1, v2 = v2, v1
+            lines += ["||v2||² < ||v1||²: troca v1 e v2", html.Br()]
+        lines += [f"m = round(v1·v2 / ||v1||²) = {m}", html.Br()]
+        if m != 0:
+            v2 = [y - m * x for x, y in zip(v1, v2)]
+            lines += [f"v2 = v2 - {m}·v1 = {v2}"]
+        else:
+            lines += ["m = 0: a base não pode mais ser reduzida"]
+        content.insert(0, html.Div([
+            html.H5(f"Passo {i + 1}"),
+            html.P(lines, style={'fontFamily': 'monospace', 'text-align': 'left'})
+        ], className='step-box'))
+
+    if finished:
+        content.insert(0, html.Div([
+            html.H5("Base Reduzida"),
+            html.P([f"v1 = {v1}", html.Br(), f"v2 = {v2}", html.Br(),
+                    f"||v1||² = {_dot(v1, v1)}, ||v2||² = {_dot(v2, v2)}"],
+                   style={'fontFamily': 'monospace', 'text-align': 'left'})
+        ], className='step-box'))
+
+    return html.Div([html.H3("Passo a Passo", className="algorithm-title"),
+        html.H4("Redução de Gauss"),
+        *content], style={'marginTop': '5px', 'color': 'white', 'fontWeight': 'bold'})
+
+
+# Coordinates below this bound keep every squared norm and inner product in int64
+_BATCH_COORDINATE_LIMIT = 1 << 30
+
+
+def batch_gauss_reduce(bases, max_iterations=10000):
+    """
+    Gauss reduction of many 2D bases at once.
+
+    All bases iterate together: each iteration swaps, computes m and updates
+    v2 with masked array operations, and bases that reached m = 0 leave the
+    active set. With coordinates below 2**30 the int64 arithmetic is exact;
+    larger inputs are handled with Python integers (object dtype).
+
+    Args:
+        bases (array_like): Integer array of shape (N, 2, 2), basis vectors as rows.
+        max_iterations (int): Safety limit on the number of iterations.
+
+    Returns:
+        tuple: The reduced bases of shape (N, 2, 2) and the number of
+        iterations of each basis (counted like the trace of ``gauss_reduce``).
+
+    Raises:
+        ValueError: If some basis has linearly dependent vectors (or a zero
+            vector), which would reach a zero norm and divide by it.
+    """
+    bases = np.asarray(bases)
+    if bases.dtype == object or np.abs(bases).max(initial=0) >= _BATCH_COORDINATE_LIMIT:
+        bases = bases.astype(object)
+    else:
+        bases = bases.astype(np.int64)
+    v1 = bases[:, 0].copy()
+    v2 = bases[:, 1].copy()
+    singular = np.flatnonzero(v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0] == 0)
+    if len(singular):
+        raise ValueError(f"The vectors of the bases {singular[:10].tolist()} are linearly dependent")
+    norm1 = (v1 * v1).sum(axis=1)
+    norm2 = (v2 * v2).sum(axis=1)
+    iterations = np.zeros(len(bases), dtype=np.int64)
+    active = np.arange(len(bases))
+
+    for _ in range(max_iterations):
+        if len(active) == 0:
+            break
+        a1, a2 = v1[active], v2[active]
+        n1, n2 = norm1[active], norm2[active]
+        swap = n2 < n1
+        a1, a2 = np.where(swap[:, None], a2, a1), np.where(swap[:, None], a1, a2)
+        n1, n2 = np.where(swap, n2, n1), np.where(swap, n1, n2)
+        product = (a1 * a2).sum(axis=1)
+        m = (2 * product + n1) // (2 * n1)
+        a2 = a2 - m[:, None] * a1
+        n2 = n2 - 2 * m * product + m * m * n1
+        v1[active], v2[active] = a1, a2
+        norm1[active], norm2[active] = n1, n2
+        iterations[active] += 1
+        active = active[m != 0]
+
+    return np.stack([v1, v2], axis=1), iterations
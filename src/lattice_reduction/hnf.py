@@ -0,0 +1,190 @@
+"""
+Hermite normal form (HNF) of full-rank integer lattices, computed modulo the
+determinant (Domich, Kannan and Trotter; Cohen, Algorithm 2.4.8).
+
+The HNF used here is lower triangular with the basis vectors as rows:
+H[i][j] = 0 for j > i and 0 <= H[i][j] < H[j][j] for j < i. It is unique
+for each lattice, so it reveals nothing about the basis it was computed
+from, which makes it the public key of Micciancio's variant of GGH. For a
+random lattice it is almost always the identity except for the first
+column, which holds numbers below the determinant.
+
+A lattice L of determinant D contains D·Z^n, so every row operation can be
+done modulo D and the entries never grow past it. The usual form is tried
+first without any elimination: it means L = {v : v·y = 0 (mod D)} for one
+vector y, and y is a multiple of B⁻¹·r, computed exactly.
+"""
+import math
+import numpy as np
+from lattice_based.multimodular import determinant as exact_determinant, integer_array, solve_exact
+from lattice_based.sampling import Sampler
+
+# Right-hand sides r solved for in ``cyclic_hermite_form``: with k of them a
+# prime p of the determinant divides all the y_0 with probability p^-k
+TARGETS = 8
+
+
+def _xgcd(a, b):
+    """(g, u, v) with u·a + v·b = g = gcd(a, b), for a, b >= 0."""
+    u0, v0, u1, v1 = 1, 0, 0, 1
+    while b:
+        q, r = divmod(a, b)
+        a, b = b, r
+        u0, u1 = u1, u0 - q * u1
+        v0, v1 = v1, v0 - q * v1
+    return a, u0, v0
+
+
+def cyclic_hermite_form(basis, determinant=None, attempts=16):
+    """
+    The HNF with ones on the diagonal after H[0][0], if the lattice has it.
+
+    Every v of the lattice has v·B⁻¹ integer, so v·y = 0 (mod D) for every
+    y = D·B⁻¹·r. ``TARGETS`` such vectors are solved for exactly and
+    combined one at a time, each with the small multiple that leaves the
+    smallest gcd(y_0, D), until y_0 is invertible modulo D; then the
+    candidate rows are a_i·e_0 + e_i, with a_i = -y_i / y_0 (mod D). They
+    are the HNF if all rows of B satisfy the congruence (the lattices then
+    have the same determinant and one contains the other).
+
+    With only two right-hand sides, a small prime dividing D and both y_0
+    (probability 1/4 for p = 2) sent a lattice of this form to the general
+    elimination, which costs O(n³) operations on integers of the size of D.
+
+    Args:
+        basis (array_like): Full-rank n x n integer basis, vectors as rows.
+        determinant (int): Determinant of the basis (computed exactly when omitted).
+        attempts (int): Multiples of each solution tried.
+
+    Returns:
+        numpy.ndarray: The HNF, or None if the lattice is not of this form.
+    """
+    rows = integer_array(basis)
+    n = len(rows)
+    modulus = abs(int(determinant if determinant is not None else exact_determinant(rows)))
+    targets = np.concatenate([np.ones((n, 1), dtype=np.int64),
+                              Sampler(b'hnf-targets').uniform(-2, 2, (n, TARGETS - 1))], axis=1)
+    numerators, denominator = solve_exact(rows, targets)
+    solutions = numerators * (modulus // denominator) % modulus
+    y = solutions[:, 0]
+    for k in range(1, TARGETS):
+        if math.gcd(int(y[0]), modulus) == 1:
+            break
+        multiple = min(range(attempts), key=lambda a: math.gcd(int(y[0] + a * solutions[0, k]), modulus))
+        y = (y + multiple * solutions[:, k]) % modulus
+    if math.gcd(int(y[0]), modulus) != 1:
+        return None
+    y = y * pow(int(y[0]), -1, modulus) % modulus
+    if (rows @ y % modulus).any():
+        return None
+    H = np.eye(n, dtype=int).astype(object)
+    H[0, 0] = modulus
+    H[1:, 0] = (-y[1:]) % modulus
+    return H
+
+
+def hermite_normal_form(basis, determinant=None):
+    """
+    HNF of the lattice generated by the rows of a square integer basis.
+
+    When the lattice has the usual form it is read from one exact solve.
+    Otherwise columns are eliminated from the last to the first, modulo R (at first
+    the determinant). In column j, H[j][j] is the gcd g of R and of the
+    entries of the rows, and the row j of the HNF is a combination of the
+    rows and R·e_j with that entry, found by extended gcds that usually stop
+    at the first row. Then every row loses its multiple of it in one vector
+    operation, and R drops to R / g, a multiple of the determinant of the
+    lattice still to be processed.
+
+    The elimination costs O(n³) operations on integers of the size of the
+    determinant (seconds for n in the hundreds), so callers that show the
+    HNF repeatedly should keep it (the GGH step panel caches it per session).
+
+    Args:
+        basis (array_like): Full-rank n x n integer basis, vectors as rows.
+        determinant (int): Determinant of the basis, or a multiple of it
+            (computed exactly when omitted).
+
+    Returns:
+        numpy.ndarray: The HNF as an n x n object array of Python integers.
+
+    Raises:
+        ValueError: If the basis is singular.
+    """
+    rows = integer_array(basis)
+    n = len(rows)
+    modulus = abs(int(determinant if determinant is not None else exact_determinant(rows)))
+    if modulus == 0:
+        raise ValueError("The basis is not full rank")
+    H = cyclic_hermite_form(rows, modulus) if n > 1 else None
+    if H is not None:
+        return H
+    active = rows % modulus
+    H = np.zeros((n, n), dtype=object)
+    for j in range(n - 1, -1, -1):
+        column = active[:, j]
+        target = math.gcd(modulus, *(int(x) for x in column))
+        # g = s·g + t·a_i with the row combination kept alongside (R·e_j is implicit)
+        g, combination = modulus, np.zeros(j + 1, dtype=object)
+        for i in np.flatnonzero(column):
+            if g == target:
+                break
+            g, s, t = _xgcd(g, int(column[i]))
+            combination = (s * combination + t * active[i]) % modulus
+        combination[j] = g
+        H[j, :j + 1] = combination
+        active = (active - (column // g)[:, None] * combination) % (modulus // g)
+        modulus //= g
+        active = active[:, :j]
+    # Reduce the entries below each diagonal entry, from the last column to
+    # the first: all the rows under row c at once, with only the nonzero
+    # entries of row c (later columns are not touched again)
+    for c in range(n - 1, -1, -1):
+        quotients = H[c + 1:, c] // H[c, c]
+        rows = np.flatnonzero(quotients)
+        if len(rows):
+            support = np.flatnonzero(H[c, :c + 1])
+            H[np.ix_(c + 1 + rows, support)] -= quotients[rows, None] * H[c, support]
+    return H
+
+
+def is_hermite_normal_form(H):
+    """Whether a square integer matrix is a (lower triangular, row) HNF."""
+    H = integer_array(H)
+    n = len(H)
+    for i in range(n):
+        if H[i, i] <= 0 or any(H[i, j] != 0 for j in range(i + 1, n)):
+            return False
+        if any(not 0 <= H[i, j] < H[j, j] for j in range(i)):
+            return False
+    return True
+
+
+def reduce_modulo_hnf(vectors, H):
+    """
+    Reduces vectors modulo the lattice of an HNF basis.
+
+    Coordinates are fixed from the last to the first by subtracting
+    multiples of the rows of H, so the result is the unique representative
+    with 0 <= v_i < H[i][i]. Only the nonzero entries of each row are used:
+    for the usual HNF (ones on the diagonal except H[0][0]) this costs O(n)
+    per vector and leaves a single nonzero coordinate.
+
+    Args:
+        vectors (array_like): A vector of shape (n,) or a stack (m, n) of integers.
+        H (array_like): An HNF basis.
+
+    Returns:
+        numpy.ndarray: The reduced vectors (object array with the shape of the input).
+    """
+    H = integer_array(H)
+    vectors = integer_array(vectors)
+    single = vectors.ndim == 1
+    V = np.atleast_2d(vectors).copy()
+    for i in range(len(H) - 1, -1, -1):
+        quotients = V[:, i] // H[i, i]
+        if not quotients.any():
+            continue
+        support = np.flatnonzero(H[i, :i + 1])
+        V[:, support] -= quotients[:, None] * H[i, support]
+    return V[0] if single else V
@@ -0,0 +1,455 @@
+import math
+from fractions import Fraction
+import numpy as np
+from dash import html, dcc
+from lattice_based.ggh.ggh import plot_vectors, matrix_to_table
+from lattice_based.sampling import Sampler, session_sampler
+from lattice_reduction.methods import LatticeBasedMethod, random_bad_basis
+from lattice_reduction.quality import QualityTracker, quality_panel, quality_trace_figure
+
+# Above this size a size-reduction factor is considered imprecise in float64
+# and the Gram-Schmidt row is recomputed (Schnorr-Euchner heuristic)
+_LARGE_FACTOR = 1 << 26
+
+# Operations listed in the step text (the earlier ones are only counted)
+SHOWN_OPERATIONS = 20
+
+# Bits of the float64 mantissa: the Gram products of a basis are exact in
+# float64 while 2 * (bits of the largest entry) + log2(dimension) fits in it
+_MANTISSA_BITS = 53
+
+
+class PrecisionError(ArithmeticError):
+    """Raised when float64 is not precise enough for the Gram-Schmidt data."""
+
+    def __init__(self, basis):
+        super().__init__("float64 Gram-Schmidt data lost precision")
+        self.basis = basis
+
+
+def _as_integer_basis(basis):
+    """Copies a basis into an object array of Python integers (exact row operations)."""
+    return np.array([[int(x) for x in row] for row in basis], dtype=object)
+
+
+def _to_float(row):
+    return np.array([float(x) for x in row])
+
+
+def fits_float(basis):
+    """
+    Whether the float64 LLL applies to a basis.
+
+    The Gram-Schmidt data of bases with larger entries (e.g. the q-ary bases
+    of ``random_qary_basis``, of hundreds of bits) cancels catastrophically
+    in float64 and, from about 500 bits, overflows it.
+    """
+    bits = max((abs(int(x)).bit_length() for row in basis for x in row), default=0)
+    return 2 * bits + len(basis).bit_length() <= _MANTISSA_BITS
+
+
+def lll_reduce_float(basis, delta=0.99, trace=None, tracker=None, stop=None):
+    """
+    LLL reduction keeping the Gram-Schmidt data incrementally in float64.
+
+    The coefficients mu and the squared norms B of the Gram-Schmidt vectors
+    are computed once per row (when the row is first reached) and then
+    updated in place by the size reductions and the swaps, following the
+    incremental algorithm of Cohen (Algorithm 2.6.3). The basis itself is
+    kept in Python integers, so only the Gram-Schmidt data is approximate.
+
+    Args:
+        basis (array_like): Basis vectors as rows.
+        delta (float): The Lovász parameter, in (1/4, 1).
+        trace (list): When given, the operations are appended to it as
+            ``['size', k, j, r]`` (b_k -= r * b_j) and ``['swap', k]``
+            (b_k and b_{k-1} are exchanged).
+        tracker (QualityTracker): Notified of every operation, so the
+            quality measures follow the reduction.
+        stop (threading.Event): Checked between operations; once set, the
+            basis reached so far is returned (not reduced).
+
+    Returns:
+        list: The reduced basis as rows of Python integers.
+
+    Raises:
+        PrecisionError: Before any operation if the entries are too large
+            for float64 (see ``fits_float``), or when the Gram-Schmidt data
+            stops being meaningful. The exception holds the basis reached so far.
+    """
+    b = _as_integer_basis(basis)
+    n = len(b)
+    if not fits_float(b):
+        raise PrecisionError([list(row) for row in b])
+    bf = np.array([_to_float(row) for row in b])
+    mu = np.zeros((n, n))
+    B = np.zeros(n)
+
+    def compute_row(k):
+        # Forward substitution with the unit lower triangular matrix mu: y_j = mu[k, j] * B[j]
+        gram = bf[:k] @ bf[k]
+        y = np.linalg.solve(mu[:k, :k] + np.eye(k), gram) if k else gram
+        mu[k, :k] = y / B[:k]
+        B[k] = bf[k] @ bf[k] - y @ mu[k, :k]
+        if not (B[k] > 0 and np.isfinite(B[k]) and np.isfinite(mu[k, :k]).all()):
+            raise PrecisionError([list(row) for row in b])
+
+    def size_reduce(k):
+        imprecise = False
+        for j in range(k - 1, -1, -1):
+            if abs(mu[k, j]) > 0.5:
+                r = int(round(mu[k, j]))
+                b[k] = b[k] - r * b[j]
+                mu[k, j] -= r
+                mu[k, :j] -= r * mu[j, :j]
+                imprecise |= abs(r) > _LARGE_FACTOR
+                if trace is not None:
+                    trace.append(['size', k, j, r])
+                if tracker is not None:
+                    tracker.size_reduced(k, b[k])
+        bf[k] = _to_float(b[k])
+        return imprecise
+
+    compute_row(0)
+    k, kmax = 1, 0
+    while k < n and not (stop is not None and stop.is_set()):
+        if k > kmax:
+            kmax = k
+            compute_row(k)
+        while size_reduce(k):
+            compute_row(k)
+        if B[k] < (delta - mu[k, k - 1] ** 2) * B[k - 1]:
+            _swap_float(b, bf, mu, B, k, kmax)
+            if trace is not None:
+                trace.append(['swap', k])
+            if tracker is not None:
+                tracker.swapped(k, math.log(B[k - 1]))
+            k = max(1, k - 1)
+        else:
+            k += 1
+    return [list(row) for row in b]
+
+
+def _swap_float(b, bf, mu, B, k, kmax):
+    """Exchanges b_k and b_{k-1} and updates mu and B (Cohen, Algorithm 2.6.3)."""
+    m = mu[k, k - 1]
+    with np.errstate(over='ignore', invalid='ignore'):
+        new_B = B[k] + m * m * B[k - 1]
+        new_B_k = B[k - 1] * B[k] / new_B
+    if not (np.isfinite(new_B) and new_B_k > 0 and np.isfinite(new_B_k)):
+        # Raised before any change, so the basis matches the trace
+        raise PrecisionError([list(row) for row in b])
+    b[[k - 1, k]] = b[[k, k - 1]]
+    bf[[k - 1, k]] = bf[[k, k - 1]]
+    mu[[k - 1, k], :k - 1] = mu[[k, k - 1], :k - 1]
+    mu[k, k - 1] = m * B[k - 1] / new_B
+    B[k] = new_B_k
+    B[k - 1] = new_B
+    t = mu[k + 1:kmax + 1, k].copy()
+    mu[k + 1:kmax + 1, k] = mu[k + 1:kmax + 1, k - 1] - m * t
+    mu[k + 1:kmax + 1, k - 1] = t + mu[k, k - 1] * mu[k + 1:kmax + 1, k]
+
+
+def integral_gram_schmidt(basis):
+    """
+    Exact Gram-Schmidt data in integers (fraction-free).
+
+    Returns:
+        tuple: The list d, where d[i + 1] is the Gram determinant of the
+        first i + 1 vectors (d[0] = 1), and the matrix lam with
+        lam[k][j] = d[j + 1] * mu[k][j].
+    """
+    b = _as_integer_basis(basis)
+    n = len(b)
+    d = [1] + [0] * n
+    lam = [[0] * n for _ in range(n)]
+    for k in range(n):
+        _integral_row(b, d, lam, k)
+    return d, lam
+
+
+def _integral_row(b, d, lam, k):
+    """Computes lam[k][:k] and d[k + 1] (Cohen, Algorithm 2.6.7, step 2)."""
+    for j in range(k + 1):
+        u = int(np.dot(b[k], b[j]))
+        for i in range(j):
+            u = (d[i + 1] * u - lam[k][i] * lam[j][i]) // d[i]
+        if j < k:
+            lam[k][j] = u
+        else:
+            if u == 0:
+                raise ValueError("The basis vectors are linearly dependent")
+            d[k + 1] = u
+
+
+def lll_reduce_exact(basis, delta=0.99, trace=None, tracker=None, stop=None):
+    """
+    Integral LLL reduction (Cohen, Algorithm 2.6.7).
+
+    All the Gram-Schmidt data is kept as exact integers, so the result is
+    always LLL-reduced, at the cost of big-integer arithmetic.
+
+    Args:
+        basis (array_like): Basis vectors as rows.
+        delta (float): The Lovász parameter, in (1/4, 1).
+        trace (list): Receives the operations, as in ``lll_reduce_float``.
+        tracker (QualityTracker): Notified of every operation.
+        stop (threading.Event): Stops the reduction, as in ``lll_reduce_float``.
+
+    Returns:
+        list: The reduced basis as rows of Python integers.
+    """
+    b = _as_integer_basis(basis)
+    n = len(b)
+    ratio = Fraction(delta).limit_denominator(1 << 20)
+    p, q = ratio.numerator, ratio.denominator
+    d = [1] + [0] * n
+    lam = [[0] * n for _ in range(n)]
+
+    def reduce(k, j):
+        if 2 * abs(lam[k][j]) > d[j + 1]:
+            r = (2 * lam[k][j] + d[j + 1]) // (2 * d[j + 1])
+            b[k] = b[k] - r * b[j]
+            lam[k][j] -= r * d[j + 1]
+            for i in range(j):
+                lam[k][i] -= r * lam[j][i]
+            if trace is not None:
+                trace.append(['size', k, j, r])
+            if tracker is not None:
+                tracker.size_reduced(k, b[k])
+
+    _integral_row(b, d, lam, 0)
+    k, kmax = 1, 0
+    while k < n and not (stop is not None and stop.is_set()):
+        if k > kmax:
+            kmax = k
+            _integral_row(b, d, lam, k)
+        reduce(k, k - 1)
+        if q * d[k + 1] * d[k - 1] < p * d[k] ** 2 - q * lam[k][k - 1] ** 2:
+            b[[k - 1, k]] = b[[k, k - 1]]
+            for j in range(k - 1):
+                lam[k][j], lam[k - 1][j] = lam[k - 1][j], lam[k][j]
+            m = lam[k][k - 1]
+            new_d = (d[k - 1] * d[k + 1] + m * m) // d[k]
+            for i in range(k + 1, kmax + 1):
+                t = lam[i][k]
+                lam[i][k] = (d[k + 1] * lam[i][k - 1] - m * t) // d[k]
+                lam[i][k - 1] = (new_d * t + m * lam[i][k]) // d[k + 1]
+            d[k] = new_d
+            if trace is not None:
+                trace.append(['swap', k])
+            if tracker is not None:
+                tracker.swapped(k, math.log(d[k]) - math.log(d[k - 1]))
+            k = max(1, k - 1)
+        else:
+            for j in range(k - 2, -1, -1):
+                reduce(k, j)
+            k += 1
+    return [list(row) for row in b]
+
+
+def is_lll_reduced(basis, delta=0.99, eta=0.51):
+    """
+    Verifies with exact rational arithmetic that a basis is LLL-reduced.
+
+    Args:
+        basis (array_like): Basis vectors as rows.
+        delta (float): The Lovász parameter to check.
+        eta (float): Bound on |mu| (a little above 1/2 allows float rounding).
+
+    Returns:
+        bool: True if the basis is size-reduced and satisfies Lovász.
+    """
+    d, lam = integral_gram_schmidt(basis)
+    delta = Fraction(delta).limit_denominator(1 << 20)
+    eta = Fraction(eta).limit_denominator(1 << 20)
+    n = len(d) - 1
+    for k in range(1, n):
+        if any(abs(lam[k][j]) > eta * d[j + 1] for j in range(k)):
+            return False
+        # B_k >= (delta - mu^2) B_{k-1}, multiplied by d[k]^2 d[k - 1]
+        if d[k + 1] * d[k - 1] < delta * d[k] ** 2 - lam[k][k - 1] ** 2:
+            return False
+    return True
+
+
+def lll_reduce(basis, delta=0.99, exact=False, verify=True, trace=None, tracker=None, stop=None):
+    """
+    LLL reduction, fast in float64 and verified exactly.
+
+    In the default mode the float64 algorithm runs first and its result is
+    checked with exact integer arithmetic. If float64 loses precision or the
+    check fails, the exact algorithm continues from the basis reached. Bases
+    whose entries are too large for float64 (``fits_float``) go straight to
+    the exact algorithm.
+
+    Args:
+        basis (array_like): Basis vectors as rows.
+        delta (float): The Lovász parameter, in (1/4, 1).
+        exact (bool): Use only the exact integral algorithm.
+        verify (bool): Verify the float64 result exactly.
+        trace (list): Receives the operations, as in ``lll_reduce_float``.
+        tracker (QualityTracker): Notified of every operation.
+        stop (threading.Event): Checked between operations; once set, the
+            basis reached so far is returned without verification.
+
+    Returns:
+        list: The reduced basis as rows of Python integers.
+    """
+    if exact or not fits_float(basis):
+        return lll_reduce_exact(basis, delta, trace, tracker, stop)
+    try:
+        reduced = lll_reduce_float(basis, delta, trace, tracker, stop)
+    except PrecisionError as error:
+        if tracker is not None:
+            # The float Gram-Schmidt norms are not reliable any more
+            tracker.reset(error.basis)
+        return lll_reduce_exact(error.basis, delta, trace, tracker, stop)
+    if stop is not None and stop.is_set():
+        return reduced
+    if verify and not is_lll_reduced(reduced, delta):
+        reduced = lll_reduce_exact(reduced, delta, trace, tracker, stop)
+    return reduced
+
+
+def replay_lll(basis, trace, steps):
+    """
+    Rebuilds the basis after the first ``steps`` operations of a trace.
+
+    Returns:
+        numpy.ndarray: The basis as an object array of Python integers.
+    """
+    b = _as_integer_basis(basis)
+    for event in trace[:steps]:
+        if event[0] == 'size':
+            _, k, j, r = event
+            b[k] = b[k] - r * b[j]
+        else:
+            k = event[1]
+            b[[k - 1, k]] = b[[k, k - 1]]
+    return b
+
+
+def describe_event(event):
+    """Text of one operation of the trace."""
+    if event[0] == 'size':
+        _, k, j, r = event
+        return f"Redução de tamanho: b{k + 1} = b{k + 1} - ({r})·b{j + 1}"
+    k = event[1]
+    return f"Condição de Lovász falhou: troca b{k} e b{k + 1}"
+
+
+class LLL(LatticeBasedMethod):
+    """
+    LLL reduction shown step by step.
+
+    The reduction runs once in ``initialize`` and the interface replays the
+    stored trace, one operation (size reduction or swap) per step.
+    """
+
+    def __init__(self, dimension=2, delta=0.99):
+        self.dimension = dimension
+        self.delta = delta
+        self.operations = 0
+        self.sampler = Sampler()
+
+    @property
+    def step_phases(self):
+        """Phases of the LLL (they depend on the number of operations)."""
+        return {
+            'basis': (0, 1),                                           # Input basis
+            'reduction': (2, 1 + self.operations),                     # One step per operation
+            'result': (2 + self.operations, 2 + self.operations)       # Reduced basis
+        }
+
+    def initialize(self, dimension=2, seed=None):
+        self.dimension = dimension
+        seed, self.sampler = session_sampler(seed)
+        basis = random_bad_basis(dimension, self.sampler)
+        trace = []
+        tracker = QualityTracker(basis)
+        self.report_progress(0.1, "Reduzindo a base")
+        reduced = lll_reduce(basis, self.delta, trace=trace, tracker=tracker)
+        self.operations = len(trace)
+        return {
+            'dimension': dimension,
+            'delta': self.delta,
+            'basis': basis,
+            'reduced': reduced,
+            'trace': trace,
+            'quality': tracker.history,
+            'seed': seed,
+            'method': 'LLL'
+        }
+
+    def process_step(self, step, data):
+        """Processes a step replaying the stored trace."""
+        self.operations = len(data['trace'])
+        phase, phase_step = self.get_phase_for_step(step)
+        if phase == 'basis':
+            done = 0
+        elif phase == 'reduction':
+            done = phase_step + 1
+        else:
+            done = self.operations
+        current = replay_lll(data['basis'], data['trace'], done)
+
+        if data['dimension'] == 2:
+            step_vector_mapping = {step: [
+                {'matrix': np.array(data['basis']), 'color': 'gray', 'dash': 'dot', 'prefix': 'Base Original'},
+                {'matrix': current, 'color': 'red', 'dash': None, 'prefix': 'Base Atual'},
+            ]}
+            fig = plot_vectors(step_vector_mapping, step, 2, True, title='Redução LLL')
+            output_fig = dcc.Graph(figure=fig)
+        else:
+            output_fig = html.Div([matrix_to_table(current.astype(float), "Base Atual"),
+                                   matrix_to_table(np.array(data['basis'], dtype=float), "Base Original")])
+        output_fig = html.Div([output_fig, dcc.Graph(figure=quality_trace_figure(data['quality'], done))])
+        if phase == 'basis':
+            from lattice_reduction.stream import live_panel
+            output_fig.children.append(live_panel(data))
+        return output_fig, lll_steps_content(data, done, phase == 'result')
+
+
+def lll_steps_content(data, done, finished):
+    """
+    Generates the step by step text of the first ``done`` operations.
+
+    Only the last ``SHOWN_OPERATIONS`` operations get a box, so the text has
+    the same size at any step whatever the length of the trace.
+    """
+    content = [html.Div([
+        html.H5("Base de Entrada"),
+        html.P(f"δ = {data['delta']}, dimensão = {data['dimension']}",
+               style={'fontFamily': 'monospace', 'text-align': 'left'})
+    ], className='step-box')]
+
+    first = max(0, done - SHOWN_OPERATIONS)
+    if first:
+        content.insert(0, html.Div([
+            html.H5(f"Passos 1 a {first}"),
+            html.P(f"{first} operações anteriores (veja a curva de qualidade)",
+                   style={'fontFamily': 'monospace', 'text-align': 'left'})
+        ], className='step-box'))
+
+    for i, event in enumerate(data['trace'][first:done], first):
+        content.insert(0, html.Div([
+            html.H5(f"Passo {i + 1}"),
+            html.P(describe_event(event), style={'fontFamily': 'monospace', 'text-align': 'left'})
+        ], className='step-box'))
+
+    if finished:
+        content.insert(0, html.Div([
+            html.H5("Base Reduzida"),
+            html.P(f"{len(data['trace'])} operações, base LLL-reduzida com δ = {data['delta']}",
+                   style={'fontFamily': 'monospace', 'text-align': 'left'})
+        ], className='step-box'))
+
+    # Measures kept by the tracker during the reduction, no recomputation here
+    history = data.get('quality')
+    if history:
+        content.insert(0, quality_panel(history[min(done, len(history) - 1)]))
+
+    return html.Div([html.H3("Passo a Passo", className="algorithm-title"),
+        html.H4("Redução LLL"),
+        *content], style={'marginTop': '5px', 'color': 'white', 'fontWeight': 'bold'})
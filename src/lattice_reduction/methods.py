@@ -1,25 +1,126 @@
 from abc import ABC, abstractmethod
 import json
+import numpy as np
 from dash import html
+from lattice_based.sampling import Sampler
+
+
+def random_bad_basis(dimension, sampler=None, entry_range=10, rounds=None, multiplier=3):
+    """
+    Generates a lattice basis that is far from reduced.
+
+    A random full-rank basis with small entries is mixed by random elementary
+    row operations (row_i += c * row_j), which keep the lattice but make the
+    vectors long and almost parallel.
+
+    Args:
+        dimension (int): Dimension of the lattice.
+        sampler (Sampler): Source of randomness (defaults to the system CSPRNG).
+        entry_range (int): Entries of the initial basis are in [-entry_range, entry_range].
+        rounds (int): Number of row operations (defaults to 3 * dimension).
+        multiplier (int): The factors c are in [-multiplier, multiplier].
+
+    Returns:
+        list: The basis as a list of rows of Python integers.
+    """
+    sampler = sampler or Sampler()
+    rounds = rounds or 3 * dimension
+    basis = sampler.uniform(-entry_range, entry_range, (dimension, dimension))
+    while np.linalg.matrix_rank(basis) != dimension:
+        basis = sampler.uniform(-entry_range, entry_range, (dimension, dimension))
+    basis = [[int(x) for x in row] for row in basis]
+    pairs = sampler.uniform_below(dimension, (rounds, 2))
+    factors = sampler.uniform(1, multiplier, rounds) * (2 * sampler.uniform_below(2, rounds) - 1)
+    for (i, j), c in zip(pairs, factors):
+        if i == j:
+            j = (i + 1) % dimension
+        basis[i] = [x + int(c) * y for x, y in zip(basis[i], basis[j])]
+    return basis
+
+
+def random_qary_basis(dimension, bits=None, sampler=None):
+    """
+    Basis of a random (Goldstein-Mayer) lattice, the usual benchmark of BKZ.
+
+    The basis is [[p, 0, ..., 0], [x_1, 1, 0, ...], ..., [x_(n-1), 0, ..., 1]]
+    with p a ``bits``-bit number and x_i uniform modulo p. Unlike the bases of
+    ``random_bad_basis``, LLL is far from the shortest vectors of these
+    lattices, so block reduction makes a visible difference.
+
+    Args:
+        dimension (int): Dimension of the lattice.
+        bits (int): Size of p (defaults to 10 * dimension).
+        sampler (Sampler): Source of randomness (defaults to the system CSPRNG).
+
+    Returns:
+        list: The basis as a list of rows of Python integers.
+    """
+    sampler = sampler or Sampler()
+    bits = bits or 10 * dimension
+    words = (bits + 31) // 32
+    limbs = sampler.uniform_below(1 << 32, (dimension, words))
+    values = [sum(int(w) << (32 * i) for i, w in enumerate(row)) % (1 << bits) for row in limbs]
+    p = values[0] | (1 << (bits - 1)) | 1
+    basis = [[p] + [0] * (dimension - 1)]
+    for i in range(1, dimension):
+        basis.append([values[i] % p] + [int(i == j) for j in range(1, dimension)])
+    return basis
+
 
 class LatticeBasedMethod(ABC):
 
+    # Called with (fraction, label) during ``initialize`` when it runs as a background job
+    progress = None
+
     @abstractmethod
-    def initialize(self, dimension=2):
-        """Initializes the method with the necessary parameters."""
+    def initialize(self, dimension=2, seed=None):
+        """
+        Initializes the method with the necessary parameters.
+
+        The input basis comes from ``session_sampler(seed)`` and the seed is
+        returned in the data, so ``replay`` regenerates the same data.
+        """
         pass
 
-    @staticmethod
+    @abstractmethod
+    def process_step(self, step, data):
+        """Processes a specific step of the method and returns visualization."""
+        pass
+
+    @classmethod
     def get_method_by_name(cls, name, dimension=2):
         """Factory method to obtain the algorithm instance by name."""
         if name == 'Redução de Gauss':
-            return None # Implement Gauss Reduction when needed
+            from lattice_reduction.gauss import GaussReduction
+            return GaussReduction(dimension)
+        elif name == 'Redução de Gauss (exemplo do livro)':
+            from lattice_reduction.gauss import GaussReduction
+            return GaussReduction(dimension, book_example=True)
         elif name == 'LLL':
-            return None  # Implement LLL when needed
+            from lattice_reduction.lll import LLL
+            return LLL(dimension)
         elif name == 'BKZ':
-            return None  # Implement BKZ when needed
+            from lattice_reduction.bkz import BKZ
+            return BKZ(dimension)
         else:
             return None
+
+    @staticmethod
+    def session_key(data):
+        """The few fields that determine a session: method, dimension and seed."""
+        return {'method': data['method'], 'dimension': data['dimension'], 'seed': data['seed']}
+
+    @classmethod
+    def replay(cls, key):
+        """Regenerates the data of a session from its ``session_key``."""
+        method = cls.get_method_by_name(key['method'], key['dimension'])
+        return method.initialize(key['dimension'], seed=key['seed'])
+
+    def report_progress(self, fraction, label):
+        """Reports how far ``initialize`` is (0 to 1) to the ``progress`` callback, if any."""
+        if self.progress is not None:
+            self.progress(fraction, label)
+
     def get_max_steps(self):
         """Returns the maximum number of steps for the algorithm."""
         # Finds the highest 'end' value across all phases
@@ -0,0 +1,202 @@
+"""
+Quality measures of lattice bases.
+
+All measures come from the logarithms of the row norms and of the
+Gram-Schmidt norms, so the determinant is never formed (it overflows float64
+long before the bases of the attacks get large). ``QualityTracker`` keeps
+these logarithms up to date through the operations of a reduction, at O(n)
+per size reduction and O(1) per swap.
+"""
+import math
+import numpy as np
+import plotly.graph_objects as go
+from dash import html
+
+
+def _log_row_norms(basis):
+    """Natural log of the norm of each row, exact for rows of Python integers."""
+    return np.array([0.5 * math.log(sum(int(x) * int(x) for x in row)) for row in basis])
+
+
+# Above this many bits per entry the float64 factorization loses the small
+# Gram-Schmidt norms, and the exact integral Gram-Schmidt is used instead
+_FLOAT_GSO_BITS = 48
+
+# Points per curve of ``quality_trace_figure``
+MAX_TRACE_POINTS = 300
+
+
+def log_gram_schmidt_norms(basis):
+    """
+    Natural log of the Gram-Schmidt norms ||b*_i||.
+
+    Small entries use a float64 QR factorization. Large ones (e.g. the
+    q-ary bases, whose rows mix 400-bit numbers and ones) use the exact
+    Gram determinants d_i, with ||b*_i||² = d_(i+1) / d_i.
+    """
+    rows = [[int(x) for x in row] for row in basis]
+    if max(abs(x) for row in rows for x in row).bit_length() > _FLOAT_GSO_BITS:
+        from lattice_reduction.lll import integral_gram_schmidt
+        d, _ = integral_gram_schmidt(rows)
+        logs = np.array([math.log(x) for x in d])
+        return 0.5 * (logs[1:] - logs[:-1])
+    r = np.linalg.qr(np.array(rows, dtype=float).T, mode='r')
+    return np.log(np.abs(np.diag(r)))
+
+
+def condition_number(basis):
+    """Condition number (2-norm) of the basis, or inf if it does not fit in float64."""
+    matrix = np.array([[float(x) for x in row] for row in basis])
+    if not np.isfinite(matrix).all():
+        return math.inf
+    return float(np.linalg.cond(matrix))
+
+
+def _exp(x):
+    """exp that saturates to inf instead of raising (huge orthogonality defects)."""
+    return math.exp(x) if x < 709 else math.inf
+
+
+def _measures(log_rows, log_gso, n):
+    log_det = float(log_gso.sum())
+    sum_rows = float(log_rows.sum())
+    return {
+        'b1_norm': math.exp(log_rows[0]),
+        'hadamard_ratio': math.exp((log_det - sum_rows) / n),
+        'orthogonality_defect': _exp(sum_rows - log_det),
+        'root_hermite': math.exp((log_rows[0] - log_det / n) / n),
+        'log_potential': float(((n - np.arange(n)) * 2 * log_gso).sum()),
+    }
+
+
+def basis_quality(basis, condition=True):
+    """
+    All the quality measures of a basis in one pass.
+
+    Args:
+        basis (array_like): Basis vectors as rows.
+        condition (bool): Also compute the condition number (an SVD).
+
+    Returns:
+        dict: The norm of b1, the Hadamard ratio (det / prod ||b_i||)^(1/n),
+        the orthogonality defect prod ||b_i|| / det, the root Hermite factor
+        (||b1|| / det^(1/n))^(1/n), the log potential sum((n - i) log ||b*_i||²),
+        the profile log2 ||b*_i|| and the condition number.
+    """
+    n = len(basis)
+    log_gso = log_gram_schmidt_norms(basis)
+    quality = _measures(_log_row_norms(basis), log_gso, n)
+    quality['profile'] = list(log_gso / math.log(2))
+    if condition:
+        quality['condition_number'] = condition_number(basis)
+    return quality
+
+
+class QualityTracker:
+    """
+    Quality measures updated through the operations of a reduction.
+
+    The determinant does not change under unimodular operations, so after
+    one factorization at the start only the changed norms are updated: a
+    size reduction b_k -= r·b_j changes ||b_k|| only, and a swap of b_(k-1)
+    and b_k changes ||b*_(k-1)|| and ||b*_k|| keeping their product.
+    """
+
+    def __init__(self, basis, record=True):
+        """
+        Args:
+            basis (array_like): The basis at the start of the reduction.
+            record (bool): Append the measures to ``history`` after each operation.
+        """
+        self.record = record
+        self.history = []
+        self.reset(basis)
+
+    def reset(self, basis):
+        """
+        Recomputes everything from a basis (O(n³), e.g. after a fallback).
+
+        The basis is the one of the last recorded step, so its entry of the
+        history is replaced instead of adding a step.
+        """
+        self.n = len(basis)
+        self.log_rows = _log_row_norms(basis)
+        self.log_gso = log_gram_schmidt_norms(basis)
+        if self.record and self.history:
+            self.history[-1] = self.measures()
+        else:
+            self._snapshot()
+
+    def size_reduced(self, k, row):
+        """b_k became ``row`` by a size reduction: only its norm changes."""
+        self.log_rows[k] = 0.5 * math.log(sum(int(x) * int(x) for x in row))
+        self._snapshot()
+
+    def swapped(self, k, log_norm2):
+        """
+        b_(k-1) and b_k were exchanged.
+
+        Args:
+            k (int): Index of the second row.
+            log_norm2 (float): Natural log of the new ||b*_(k-1)||².
+        """
+        self.log_rows[[k - 1, k]] = self.log_rows[[k, k - 1]]
+        total = self.log_gso[k - 1] + self.log_gso[k]
+        self.log_gso[k - 1] = 0.5 * log_norm2
+        self.log_gso[k] = total - self.log_gso[k - 1]
+        self._snapshot()
+
+    def measures(self):
+        """Current measures (without the condition number, which needs an SVD)."""
+        return _measures(self.log_rows, self.log_gso, self.n)
+
+    def profile(self):
+        """Current profile log2 ||b*_i||."""
+        return list(self.log_gso / math.log(2))
+
+    def _snapshot(self):
+        if self.record:
+            self.history.append(self.measures())
+
+
+# Labels of the measures in the interface
+QUALITY_LABELS = {
+    'hadamard_ratio': 'Razão de Hadamard',
+    'orthogonality_defect': 'Defeito de ortogonalidade',
+    'root_hermite': 'Fator de Hermite (raiz)',
+    'b1_norm': '||b1||',
+    'condition_number': 'Número de condição',
+}
+
+
+def quality_panel(quality, title="Qualidade da Base"):
+    """Step box with the measures of a basis."""
+    lines = []
+    for key, label in QUALITY_LABELS.items():
+        if key in quality:
+            lines += [f"{label} = {quality[key]:.4g}", html.Br()]
+    return html.Div([
+        html.H5(title),
+        html.P(lines[:-1], style={'fontFamily': 'monospace', 'text-align': 'left'})
+    ], className='step-box')
+
+
+def quality_trace_figure(history, done, title='Qualidade por Passo'):
+    """
+    Curves of the Hadamard ratio and of the root Hermite factor over the first ``done`` steps.
+
+    At most ``MAX_TRACE_POINTS`` steps are plotted (evenly spaced, always
+    ending at the current one), so the figure does not grow with the trace.
+    """
+    end = min(done + 1, len(history))
+    stride = max(1, -(-end // MAX_TRACE_POINTS))
+    steps = list(range(end - 1, -1, -stride))[::-1]
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=steps, y=[history[i]['hadamard_ratio'] for i in steps],
+                             mode='lines', name='Razão de Hadamard'))
+    fig.add_trace(go.Scatter(x=steps, y=[history[i]['root_hermite'] for i in steps],
+                             mode='lines', name='Fator de Hermite (raiz)', yaxis='y2'))
+    fig.update_layout(title=title, xaxis_title='Passo', template='plotly_dark',
+                      yaxis=dict(title='Razão de Hadamard'),
+                      yaxis2=dict(title='Fator de Hermite', overlaying='y', side='right'))
+    return fig
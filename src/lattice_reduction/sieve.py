@@ -0,0 +1,222 @@
+"""
+Gauss sieve (Micciancio-Voulgaris) for the shortest vector problem.
+
+The list of vectors lives in a preallocated float64 array, together with the
+array of their squared norms. A new vector is reduced against the whole list
+with one matrix-vector product per pass, and the list vectors it can reduce
+go back to the stack. The search stops after a number of collisions
+(vectors reduced to zero) or when the list reaches the memory cap.
+"""
+import time
+import numpy as np
+from lattice_based.sampling import Sampler
+from lattice_reduction.enumeration import coefficients_to_vector, enumerate_svp, gram_schmidt
+from lattice_reduction.lll import lll_reduce
+
+# float64 inner products stay exact while every sum is below 2**53
+_EXACT_LIMIT = float(1 << 53)
+
+
+class GaussSieve:
+    """
+    Gauss sieve on a basis, with the list in a preallocated NumPy array.
+    """
+
+    def __init__(self, basis, max_collisions=None, memory_limit=64 << 20, sampler=None, spread=0.8):
+        """
+        Args:
+            basis (array_like): Basis vectors as rows (it is LLL-reduced first).
+            max_collisions (int): Collisions before stopping (defaults to
+                0.1 * list size + 200, re-evaluated as the list grows).
+            memory_limit (int): Bytes of the list (vectors and norms); the
+                sieve stops when it is full.
+            sampler (Sampler): Source of randomness (defaults to the system CSPRNG).
+            spread (float): Standard deviation of the sampler, relative to
+                the largest Gram-Schmidt norm.
+        """
+        self.basis = np.array(lll_reduce(basis), dtype=float)
+        self.n = len(self.basis)
+        if float(np.abs(self.basis).max()) ** 2 * self.n * 4 >= _EXACT_LIMIT:
+            raise ValueError("Basis entries are too large for exact float64 inner products")
+        self.max_collisions = max_collisions
+        self.sampler = sampler or Sampler()
+        mu, B = gram_schmidt(self.basis)
+        self.mu = mu
+        self.B = B
+        # Centered binomial parameter per level: variance eta / 2 = (spread * max ||b*||)² / B_i
+        variance = (spread ** 2) * B.max() / B
+        self.eta = np.maximum(np.rint(2 * variance), 0).astype(int)
+
+        self.capacity = max(1, memory_limit // (8 * (self.n + 1)))
+        self.vectors = np.zeros((self.capacity, self.n))
+        self.norms = np.zeros(self.capacity)
+        self.size = 0
+        self.stack = []
+        self._samples = []
+
+    def sample(self, batch=64):
+        """
+        Klein-style samples: each coefficient is the rounded center plus a
+        centered binomial offset, level by level from the last one, for a
+        batch of vectors at once.
+        """
+        if not self._samples:
+            x = np.zeros((batch, self.n))
+            for i in range(self.n - 1, -1, -1):
+                center = -(x[:, i + 1:] @ self.mu[i + 1:, i])
+                x[:, i] = np.rint(center)
+                if self.eta[i]:
+                    x[:, i] += self.sampler.centered_binomial(int(self.eta[i]), batch)
+            self._samples = list(x @ self.basis)
+        return self._samples.pop()
+
+    def reduce(self, v):
+        """
+        Reduces v with the list vectors not longer than it, until no vector
+        of the list makes it shorter. Each pass is one product list · v.
+
+        Returns:
+            tuple: The reduced vector and its squared norm.
+        """
+        norm = float(v @ v)
+        while self.size:
+            vectors = self.vectors[:self.size]
+            norms = self.norms[:self.size]
+            products = vectors @ v
+            m = np.rint(products / norms)
+            gain = 2 * m * products - m * m * norms
+            gain[norms > norm] = 0
+            best = int(np.argmax(gain))
+            if gain[best] <= 0:
+                break
+            v = v - m[best] * vectors[best]
+            norm = float(v @ v)
+        return v, norm
+
+    def insert(self, v, norm):
+        """
+        Inserts v, moving to the stack the longer list vectors it reduces.
+        """
+        if self.size:
+            vectors = self.vectors[:self.size]
+            norms = self.norms[:self.size]
+            products = vectors @ v
+            reducible = (norms > norm) & (2 * np.abs(products) > norm)
+            moved = np.flatnonzero(reducible)
+            if len(moved):
+                self.stack.extend(vectors[moved] - np.rint(products[moved] / norm)[:, None] * v)
+                keep = np.flatnonzero(~reducible)
+                self.vectors[:len(keep)] = vectors[keep]
+                self.norms[:len(keep)] = norms[keep]
+                self.size = len(keep)
+        self.vectors[self.size] = v
+        self.norms[self.size] = norm
+        self.size += 1
+
+    def run(self, max_iterations=None, progress=None):
+        """
+        Runs the sieve.
+
+        Args:
+            max_iterations (int): Limit of vectors processed.
+            progress (callable): Called every 100 iterations with the statistics.
+
+        Returns:
+            tuple: The shortest vector found (Python integers), its squared
+            norm and the statistics (iterations, collisions, list size, peak
+            list size, memory of the list in bytes, time and stop reason).
+        """
+        start = time.perf_counter()
+        for row in self.basis:
+            self.stack.append(row.copy())
+        collisions = iterations = peak = 0
+        reason = 'iterations'
+        while max_iterations is None or iterations < max_iterations:
+            limit = self.max_collisions or int(0.1 * self.size) + 200
+            if collisions >= limit:
+                reason = 'collisions'
+                break
+            if self.size == self.capacity:
+                reason = 'memory'
+                break
+            iterations += 1
+            v = self.stack.pop() if self.stack else self.sample()
+            v, norm = self.reduce(v)
+            if norm == 0:
+                collisions += 1
+                continue
+            self.insert(v, norm)
+            peak = max(peak, self.size)
+            if progress is not None and iterations % 100 == 0:
+                progress(self.statistics(iterations, collisions, peak, start, 'running'))
+        stats = self.statistics(iterations, collisions, peak, start, reason)
+        if not self.size:
+            # Nothing sieved (e.g. max_iterations=0): the shortest row of the reduced basis
+            norms = (self.basis * self.basis).sum(axis=1)
+            best = int(np.argmin(norms))
+            return [int(x) for x in self.basis[best]], float(norms[best]), stats
+        best = int(np.argmin(self.norms[:self.size]))
+        vector = [int(x) for x in np.rint(self.vectors[best])]
+        return vector, float(self.norms[best]), stats
+
+    def statistics(self, iterations, collisions, peak, start, reason):
+        """Statistics of the run, comparable with those of the enumeration."""
+        return {
+            'iterations': iterations,
+            'collisions': collisions,
+            'list_size': self.size,
+            'peak_list_size': peak,
+            'memory': peak * 8 * (self.n + 1),
+            'time': time.perf_counter() - start,
+            'stopped': reason,
+        }
+
+
+def gauss_sieve(basis, max_collisions=None, memory_limit=64 << 20, max_iterations=None,
+                progress=None, sampler=None):
+    """
+    Shortest vector by the Gauss sieve (see ``GaussSieve``).
+
+    Returns:
+        tuple: The vector, its squared norm and the statistics of the run.
+    """
+    sieve = GaussSieve(basis, max_collisions, memory_limit, sampler)
+    return sieve.run(max_iterations, progress)
+
+
+def compare_with_enumeration(basis, sampler=None, **options):
+    """
+    Runs the Gauss sieve and the exact enumeration on the same basis.
+
+    The enumeration works on the LLL-reduced basis of the sieve, so both
+    searches start from the same vectors. Its memory is the Gram-Schmidt data
+    and the coefficient vector, which do not grow with the search.
+
+    Args:
+        basis (array_like): Basis vectors as rows.
+        sampler (Sampler): Source of randomness of the sieve.
+        **options: Other arguments of ``GaussSieve`` and ``GaussSieve.run``
+            (``max_collisions``, ``memory_limit``, ``max_iterations``).
+
+    Returns:
+        dict: For ``'sieve'`` and ``'enumeration'``, the vector found, its
+        squared norm, the time and the memory in bytes, plus the statistics
+        of the sieve and the visited nodes of the enumeration.
+    """
+    max_iterations = options.pop('max_iterations', None)
+    sieve = GaussSieve(basis, sampler=sampler, **options)
+    vector, norm2, stats = sieve.run(max_iterations)
+
+    start = time.perf_counter()
+    reduced = [[int(x) for x in row] for row in sieve.basis]
+    mu, B = gram_schmidt(sieve.basis)
+    coefficients, enum_norm2, nodes = enumerate_svp(mu, B)
+    enum_vector = reduced[0] if coefficients is None else coefficients_to_vector(reduced, coefficients)
+    enumeration = {
+        'vector': enum_vector,
+        'norm2': float(sum(x * x for x in enum_vector)),
+        'nodes': nodes,
+        'time': time.perf_counter() - start,
+        'memory': 8 * (sieve.n * sieve.n + 2 * sieve.n),
+    }
+    return {'sieve': dict(stats, vector=vector, norm2=norm2), 'enumeration': enumeration}
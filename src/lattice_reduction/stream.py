@@ -0,0 +1,145 @@
+"""
+Live LLL reduction streamed to the browser as server-sent events.
+
+The reduction of a session runs again from its seed in a worker thread,
+appending to its trace and quality history. The HTTP response reads both
+lists at most ``FRAME_RATE`` times per second and sends what was appended
+since the last frame as one event: the operations (swaps and size
+reductions) and the measures per operation (log potential, Hadamard ratio,
+root Hermite factor). A fast reduction therefore never sends more than
+``FRAME_RATE`` events per second, and each event carries at most
+``MAX_POINTS`` measures and ``MAX_EVENTS`` operations. The counts of
+operations are always exact.
+
+The page appends each frame to its figure with ``Plotly.extendTraces``
+(assets/stream.js), so nothing is redrawn from scratch.
+
+Each stream holds a thread, so at most ``MAX_STREAMS`` run at the same
+time (``stream_slots``), and the reduction is stopped as soon as the
+response ends, including when the page closes the connection.
+"""
+import json
+import os
+import threading
+import time
+import plotly.graph_objects as go
+from dash import html, dcc
+from lattice_based.sampling import session_sampler
+from lattice_reduction.lll import lll_reduce
+from lattice_reduction.methods import random_bad_basis
+from lattice_reduction.quality import QualityTracker
+
+# Route of the stream in the Flask server
+STREAM_ROUTE = '/stream/lll'
+
+# Frames per second sent to the page
+FRAME_RATE = float(os.environ.get('AVACPQ_STREAM_FPS', 10))
+
+# Measures per frame (a faster reduction is subsampled)
+MAX_POINTS = 200
+
+# Operations listed per frame (the rest are only counted)
+MAX_EVENTS = 50
+
+# Largest dimension reduced live
+MAX_DIMENSION = 200
+
+# Reductions streamed at the same time (one thread each)
+MAX_STREAMS = int(os.environ.get('AVACPQ_MAX_STREAMS', 4))
+
+# Taken by the route before a stream starts and released when its response closes
+stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+
+# Measures streamed, in the order of the traces of the figure
+MEASURES = ('log_potential', 'hadamard_ratio', 'root_hermite')
+
+
+def stream_url(data):
+    """URL of the live reduction of an LLL session."""
+    return f"{STREAM_ROUTE}?dimension={data['dimension']}&seed={data['seed']}&delta={data['delta']}"
+
+
+def _frame(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+
+def _subsample(start, end, count):
+    """At most ``count`` indices of [start, end), always ending at end - 1."""
+    stride = max(1, -(-(end - start) // count))
+    return list(range(end - 1, start - 1, -stride))[::-1]
+
+
+def live_reduction(dimension, seed, delta=0.99, frame_rate=None):
+    """
+    Server-sent events of the LLL reduction of a session.
+
+    Args:
+        dimension (int): Dimension of the session.
+        seed (str): Seed of the session (the basis is generated again from it).
+        delta (float): The Lovász parameter.
+        frame_rate (float): Frames per second (defaults to ``FRAME_RATE``).
+
+    Yields:
+        str: ``frame`` events with the operations and measures appended since
+        the previous frame, then a ``done`` event with the totals. If the
+        generator is closed early, the reduction thread is stopped.
+    """
+    interval = 1 / (frame_rate or FRAME_RATE)
+    _, sampler = session_sampler(seed)
+    basis = random_bad_basis(dimension, sampler)
+    trace = []
+    tracker = QualityTracker(basis)
+    stop = threading.Event()
+    # Appends are atomic, so the frames read both lists while the thread runs
+    worker = threading.Thread(target=lll_reduce, args=(basis, delta),
+                              kwargs={'trace': trace, 'tracker': tracker, 'stop': stop}, daemon=True)
+    worker.start()
+    sent = 0
+    swaps = 0
+    start_time = time.perf_counter()
+    try:
+        while True:
+            running = worker.is_alive()
+            end = len(tracker.history)
+            if end > sent:
+                events = trace[max(sent - 1, 0):end - 1]
+                swaps += sum(event[0] == 'swap' for event in events)
+                steps = _subsample(sent, end, MAX_POINTS)
+                yield _frame('frame', {
+                    'steps': steps,
+                    **{name: [tracker.history[i][name] for i in steps] for name in MEASURES},
+                    'events': events[-MAX_EVENTS:],
+                    'operations': end - 1,
+                    'swaps': swaps,
+                })
+                sent = end
+            if not running:
+                break
+            time.sleep(interval)
+        yield _frame('done', {'operations': len(trace), 'swaps': swaps,
+                              'time': time.perf_counter() - start_time})
+    finally:
+        # The client left (or the stream ended): do not keep reducing for nobody
+        stop.set()
+
+
+def live_figure():
+    """Empty figure of the measures, extended by the frames of the stream."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=[], y=[], mode='lines', name='Log potencial'))
+    fig.add_trace(go.Scatter(x=[], y=[], mode='lines', name='Razão de Hadamard', yaxis='y2'))
+    fig.add_trace(go.Scatter(x=[], y=[], mode='lines', name='Fator de Hermite (raiz)', yaxis='y2'))
+    fig.update_layout(title='Redução ao Vivo', xaxis_title='Operação', template='plotly_dark',
+                      yaxis=dict(title='Log potencial'),
+                      yaxis2=dict(overlaying='y', side='right'))
+    return fig
+
+
+def live_panel(data):
+    """Button, status and figure of the live reduction of an LLL session."""
+    return html.Div([
+        html.Button("Reduzir ao vivo", id='stream-btn', n_clicks=0),
+        html.Div(id='stream-status'),
+        dcc.Store(id='stream-url', data=stream_url(data)),
+        dcc.Graph(id='stream-graph', figure=live_figure())
+    ])
@@ -1,11 +1,12 @@
 from dash import Dash, html, dcc, page_container
 import os
 from callbacks import get_callbacks 
+from jobs import background_callback_manager
 from components.Header import create_header
 from components.Footer import create_footer
 import json
 import sqlite3
-from flask import Flask, redirect, request, url_for
+from flask import Flask, Response, abort, redirect, request, url_for
 from flask_login import (
     LoginManager,
     current_user,
@@ -16,6 +17,7 @@ from flask_login import (
 from oauthlib.oauth2 import WebApplicationClient
 import requests
 from db import init_db_command
+from lattice_reduction.stream import MAX_DIMENSION, STREAM_ROUTE, live_reduction, stream_slots
 from user import User
 from dotenv import load_dotenv
 
@@ -126,10 +128,35 @@ def logout():
     logout_user()
     return redirect("/")
 
+# Live LLL reduction of a session, as server-sent events (see lattice_reduction/stream.py).
+# Open to anonymous users like the rest of the demo: the load is bounded by
+# MAX_DIMENSION and by the stream slots
+@server.route(STREAM_ROUTE)
+def stream_reduction():
+    dimension = request.args.get("dimension", type=int)
+    seed = request.args.get("seed")
+    delta = request.args.get("delta", 0.99, type=float)
+    frame_rate = request.args.get("fps", type=float)
+    if not dimension or not 2 <= dimension <= MAX_DIMENSION or not 0.25 < delta < 1:
+        abort(400)
+    if not seed or len(seed) > 64:
+        abort(400)
+    if frame_rate is not None and not 0 < frame_rate <= 60:
+        abort(400)
+    # Too many reductions running: the page may try again later
+    if not stream_slots.acquire(blocking=False):
+        abort(429)
+    response = Response(live_reduction(dimension, seed, delta, frame_rate),
+                        mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    response.call_on_close(stream_slots.release)
+    return response
+
 app = Dash(
     __name__,
     server=server,
     use_pages=True,
+    background_callback_manager=background_callback_manager,
     prevent_initial_callbacks=False,
     assets_folder='assets',
     meta_tags=[{"name": "viewport", "content": "width=device-width, initial-scale=1"}],
@@ -26,6 +26,8 @@ def generate_control_card():
                                 options=[
                                     {'label': 'LWE (1 bit)', 'value': 'LWE'},
                                     {'label': 'GGH', 'value': 'GGH'},
+                                    {'label': 'GGH (ataque)', 'value': 'Ataque GGH'},
+                                    {'label': 'NTRU', 'value': 'NTRU'},
                                     {'label': 'Alkaline', 'value': 'Alkaline'}
                                 ]
                             ),
@@ -41,6 +43,8 @@ def generate_control_card():
                         id="checklist-Methods",
                         options=[
                             {'label': 'Redução de Gauss', 'value': 'Redução de Gauss'},
+                            {'label': 'Redução de Gauss (exemplo do livro)',
+                             'value': 'Redução de Gauss (exemplo do livro)'},
                             {'label': 'LLL', 'value': 'LLL'},
                             {'label': 'BKZ', 'value': 'BKZ'},
                         ],
@@ -48,15 +52,28 @@ def generate_control_card():
                     ])
                 ]
             ),html.Div(id='dimension-input-container', className='dimension-input-container'),
+            # Saved sessions: open one by name (Enter) or export the current one
+            html.Div(
+                className='dimension-input-container',
+                children=[
+                    html.Label("Sessão salva:"),
+                    dcc.Input(id='session-bundle', type='text', placeholder='nome', debounce=True),
+                    html.Div(id='export-status')
+                ]
+            ),
             # buttons
             html.Div(
                 className="button_control",
                 children=[
                     html.Button(id="start", children="Iniciar", n_clicks=0),
                     html.Button("Próximo", id="btn-next", n_clicks=0, className="btn-nav", disabled=True),
-                    html.Button(id="reset-btn", children="Reset", n_clicks=0)
+                    html.Button(id="reset-btn", children="Reset", n_clicks=0),
+                    html.Button(id="export-btn", children="Exportar", n_clicks=0)
                 ]
-            )
+            ),
+            # Progress of the session being initialized (a background job)
+            html.Progress(id='job-progress', value='0', max='100', style={'display': 'none'}),
+            html.Div(id='job-status')
         ],
     )
 
@@ -64,6 +81,8 @@ def step_navigation():
     return html.Div([
 
         dcc.Store(id='keygen-data'),
+        # Session and step shown in the visualization (for the partial updates)
+        dcc.Store(id='rendered-step'),
         
             html.Div(id="step-content", className="step-content"),
         
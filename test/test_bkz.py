@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from lattice_based.multimodular import determinant, solve_exact
+from lattice_based.sampling import Sampler
+from lattice_reduction.bkz import bkz_reduce
+from lattice_reduction.enumeration import enumerate_svp, gram_schmidt, pruning_coefficients
+from lattice_reduction.lll import is_lll_reduced, lll_reduce
+from lattice_reduction.methods import random_qary_basis
+
+
+def shorter_in_block(basis, k, block_size, delta):
+    """Whether enumeration finds a vector shorter than delta·||b*_k|| in the block at k."""
+    mu, B = gram_schmidt(basis)
+    end = min(k + block_size, len(basis))
+    coefficients, norm2, _ = enumerate_svp(mu[k:end, k:end], B[k:end], B[k] * (1 + 1e-9),
+                                           pruning_coefficients(end - k, 'none'))
+    return coefficients is not None and norm2 < delta * B[k]
+
+
+@pytest.mark.parametrize('dimension, block_size', [(16, 6), (20, 20)])
+def test_bkz_reduces(dimension, block_size):
+    basis = random_qary_basis(dimension, 4 * dimension, Sampler(f'bkz-{dimension}'))
+    reduced = bkz_reduce(basis, block_size, max_tours=32, stall_tours=32)
+    # Same lattice: an integral change of basis with the same volume
+    _, denominator = solve_exact(np.array(basis, dtype=object).T, np.array(reduced, dtype=object).T)
+    assert denominator == 1 and abs(determinant(reduced)) == abs(determinant(basis))
+    assert is_lll_reduced(reduced)
+    assert not any(shorter_in_block(reduced, k, block_size, 0.99) for k in range(dimension - 1))
+    lll = lll_reduce(basis)
+    assert sum(x * x for x in reduced[0]) <= sum(x * x for x in lll[0])
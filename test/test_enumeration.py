@@ -0,0 +1,22 @@
+import pytest
+from lattice_based.sampling import Sampler
+from lattice_reduction.enumeration import (coefficients_to_vector, enumerate_svp, gram_schmidt,
+                                           iter_parallel_svp, parallel_svp)
+from lattice_reduction.lll import lll_reduce
+from lattice_reduction.methods import random_qary_basis
+
+
+@pytest.mark.parametrize('dimension', [12, 20])
+def test_parallel_svp_matches_serial(dimension):
+    basis = lll_reduce(random_qary_basis(dimension, 3 * dimension, Sampler(f'svp-{dimension}')))
+    coefficients, norm2, _ = enumerate_svp(*gram_schmidt(basis))
+    serial = coefficients_to_vector(basis, coefficients) if coefficients is not None else basis[0]
+
+    vector, parallel_norm2, nodes = parallel_svp(basis, workers=2)
+    assert parallel_norm2 == pytest.approx(norm2)
+    assert sum(x * x for x in vector) == sum(x * x for x in serial)
+    assert nodes > 0
+
+    reports = list(iter_parallel_svp(basis, workers=2))
+    assert [report['done'] for report in reports] == list(range(1, reports[-1]['total'] + 1))
+    assert reports[-1]['norm2'] == pytest.approx(norm2)
@@ -0,0 +1,61 @@
+import itertools
+import numpy as np
+import pytest
+from lattice_based.failure import (DECODERS, add_pmf, alkaline_failure_probability, centered_binomial_pmf,
+                                   fold_pmf, lwe_failure_probability, negate_pmf, product_pmf,
+                                   repeat_add_pmf, uniform_pmf)
+
+
+def as_dict(pmf):
+    probs, low = pmf
+    return {low + i: p for i, p in enumerate(probs) if p}
+
+
+def test_centered_binomial():
+    probs, low = centered_binomial_pmf(2)
+    assert low == -2
+    assert np.allclose(probs, np.array([1, 4, 6, 4, 1]) / 16)
+
+
+def test_operations_match_enumeration():
+    a, b = centered_binomial_pmf(1), uniform_pmf(-1, 2)
+    expected_sum, expected_product = {}, {}
+    for (x, p), (y, r) in itertools.product(as_dict(a).items(), as_dict(b).items()):
+        expected_sum[x + y] = expected_sum.get(x + y, 0) + p * r
+        expected_product[x * y] = expected_product.get(x * y, 0) + p * r
+    for pmf, expected in ((add_pmf(a, b), expected_sum), (product_pmf(a, b), expected_product)):
+        result = as_dict(pmf)
+        assert result.keys() == expected.keys()
+        assert all(np.isclose(result[x], expected[x]) for x in expected)
+    assert as_dict(negate_pmf(b)) == {-x: p for x, p in as_dict(b).items()}
+
+
+def test_repeat_add_and_fold():
+    a = uniform_pmf(0, 3)
+    repeated = a
+    for _ in range(4):
+        repeated = add_pmf(repeated, a)
+    assert np.allclose(repeat_add_pmf(a, 5)[0], repeated[0])
+    folded = fold_pmf(repeat_add_pmf(a, 5), 7)
+    assert len(folded) == 7 and np.isclose(folded.sum(), 1)
+
+
+@pytest.mark.parametrize('decoder', sorted(DECODERS))
+def test_lwe_failure_matches_enumeration(decoder):
+    q, low, high, count = 17, 1, 4, 3
+    table = DECODERS[decoder](q)
+    failures = [0, 0]
+    for errors in itertools.product(range(low, high + 1), repeat=count):
+        for m in (0, 1):
+            failures[m] += table[(sum(errors) + (q // 2) * m) % q] != m
+    total = (high - low + 1) ** count
+    result = lwe_failure_probability(4 * count, q, (low, high), decoder=decoder)
+    assert np.isclose(result['bit_0'], failures[0] / total)
+    assert np.isclose(result['bit_1'], failures[1] / total)
+
+
+def test_alkaline_failure_shrinks_with_q():
+    small = alkaline_failure_probability(16, 2, 97, 2)
+    large = alkaline_failure_probability(16, 2, 3329, 2)
+    assert 0 <= large['coefficient'] < small['coefficient'] <= 1
+    assert large['message_independent'] <= large['message_union_bound']
@@ -0,0 +1,30 @@
+import numpy as np
+from lattice_based.formatting import CHUNK_ROWS, array_chunks, cached_value, format_array
+from lattice_based.sampling import Sampler
+
+
+def test_summary_and_chunks_round_trip():
+    values = Sampler('format').uniform_below(1 << 32, (40, 12))
+    # Entries beyond int64, as in the exact GGH and q-ary bases
+    matrix = np.array([[int(x) << 100 for x in row] for row in values], dtype=object)
+    summary = format_array(matrix, 'M', 'format-session')
+    assert not isinstance(summary, str)
+    assert '40 × 12' in summary.children[1].children
+
+    chunks = -(-len(matrix) // CHUNK_ROWS)
+    assert array_chunks('format-session/M', 1).endswith(f"{len(matrix) - CHUNK_ROWS} linhas restantes")
+    lines = array_chunks('format-session/M', chunks + 1).split('\n')
+    assert len(lines) == len(matrix)
+    rows = [[int(x) for x in line.split('] ')[1].split()] for line in lines]
+    assert rows == matrix.tolist()
+    # Shown again: the summary comes from the cache, without the array
+    assert format_array(lambda: 1 / 0, 'M', 'format-session').children[1].children == summary.children[1].children
+
+
+def test_small_arrays_and_evicted_chunks():
+    assert format_array([1, 2, 3], 'v', 'format-session') == '[1, 2, 3]'
+    assert 'saiu do cache' in array_chunks('other-session/M', 1)
+    calls = []
+    for _ in range(2):
+        assert cached_value('format-session', 'value', lambda: calls.append(1) or 7) == 7
+    assert len(calls) == 1
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from lattice_based.sampling import Sampler
+from lattice_reduction.gauss import BOOK_EXAMPLE, batch_gauss_reduce, gauss_reduce, replay_gauss
+from lattice_reduction.methods import random_bad_basis
+
+
+def is_gauss_reduced(v1, v2):
+    """||v1|| <= ||v2|| and |v1·v2| <= ||v1||² / 2."""
+    norm1, norm2 = v1[0] ** 2 + v1[1] ** 2, v2[0] ** 2 + v2[1] ** 2
+    return norm1 <= norm2 and 2 * abs(v1[0] * v2[0] + v1[1] * v2[1]) <= norm1
+
+
+def test_gauss_reduce_and_replay():
+    basis = random_bad_basis(2, Sampler('gauss'), rounds=6, multiplier=8)
+    v1, v2, trace = gauss_reduce(*basis)
+    assert is_gauss_reduced(v1, v2)
+    assert abs(v1[0] * v2[1] - v1[1] * v2[0]) == abs(basis[0][0] * basis[1][1] - basis[0][1] * basis[1][0])
+    assert replay_gauss(*basis, trace, len(trace)) == (v1, v2)
+
+
+def test_batch_matches_single():
+    sampler = Sampler('batch')
+    bases = [random_bad_basis(2, sampler, rounds=6, multiplier=8) for _ in range(20)]
+    reduced, iterations = batch_gauss_reduce(bases)
+    for basis, (v1, v2), count in zip(bases, reduced, iterations):
+        r1, r2, trace = gauss_reduce(*basis)
+        assert [list(map(int, v1)), list(map(int, v2))] == [r1, r2]
+        assert count == len(trace)
+
+
+def test_huge_coordinates_stay_exact():
+    v1, v2, _ = gauss_reduce([66586820 << 40, 65354729 << 40], [6513996 << 40, 6393464 << 40])
+    reduced, _ = batch_gauss_reduce([[[66586820 << 40, 65354729 << 40], [6513996 << 40, 6393464 << 40]]])
+    assert [list(reduced[0, 0]), list(reduced[0, 1])] == [v1, v2]
+
+
+@pytest.mark.parametrize('basis', [[[0, 0], [3, 4]], [[2, 4], [3, 6]]])
+def test_dependent_vectors_are_rejected(basis):
+    with pytest.raises(ValueError):
+        gauss_reduce(*basis)
+    with pytest.raises(ValueError):
+        batch_gauss_reduce(np.array([[[1, 0], [0, 1]], basis]))
+
+
+def test_book_example():
+    # Reduced basis given in the book
+    v1, v2, _ = gauss_reduce(*BOOK_EXAMPLE)
+    assert (v1, v2) == ([2280, -1001], [-1324, -2376])
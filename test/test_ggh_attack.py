@@ -0,0 +1,66 @@
+import numpy as np
+from lattice_based.ggh.attack import attack, embedding_basis, extract_plaintext
+from lattice_based.ggh.ggh import GGH, generate_random_plaintext
+from lattice_based.sampling import Sampler
+
+
+def instance(n, bound, seed):
+    ggh = GGH(n)
+    ggh.sampler = Sampler(seed)
+    B, B_prime, U, _ = ggh.generate_keys()
+    plaintext = generate_random_plaintext(n, ggh.rand, ggh.sampler)
+    error = ggh.generate_error(bound)
+    return ggh, B, B_prime, U, plaintext, error, ggh.encrypt(U, plaintext, error)
+
+
+def test_attack_recovers_small_errors():
+    _, _, _, U, plaintext, error, ciphertext = instance(10, 1, 'small')
+    result = attack(U, ciphertext)
+    assert result['method'] == 'LLL'
+    assert np.array_equal(result['plaintext'], plaintext)
+    assert np.array_equal(result['error'], error)
+
+
+def test_attack_rejects_errors_beyond_the_bound():
+    # Every row (±e, ±M) gives a lattice vector c - e; with errors up to 100
+    # the rows found are not the planted error and must not count as success
+    for seed in ('large0', 'large1'):
+        ggh, B, B_prime, U, plaintext, error, ciphertext = instance(30, 100, seed)
+        result = attack(U, ciphertext, block_sizes=(10,), error_bound=100)
+        if result['plaintext'] is not None:
+            assert max(abs(x) for x in result['error']) <= 100
+            assert np.array_equal(np.dot(result['plaintext'], U) + result['error'], ciphertext)
+
+
+def test_extract_plaintext_needs_the_error_within_the_bound():
+    _, _, _, U, plaintext, error, ciphertext = instance(8, 3, 'extract')
+    # A row (c - v, M) for another lattice vector v has a large "error"
+    other = np.dot(plaintext + 5, U)
+    wrong = [int(x) for x in ciphertext - other] + [1]
+    assert extract_plaintext([wrong], U, ciphertext, error_bound=3) is None
+    right = [int(x) for x in error] + [1]
+    assert extract_plaintext([wrong, right], U, ciphertext, error_bound=3) == (list(plaintext), list(error))
+
+
+def test_embedding_basis_shape():
+    _, _, _, U, _, _, ciphertext = instance(4, 1, 'shape')
+    basis = embedding_basis(U, ciphertext, factor=3)
+    assert len(basis) == 5 and basis[-1][-1] == 3 and all(row[-1] == 0 for row in basis[:-1])
+
+
+def test_steps_read_the_attack_from_the_session(tmp_path, monkeypatch):
+    from lattice_based.ggh import attack as attack_module
+    from lattice_based.session import export_session, load_session
+    walkthrough = attack_module.GGHAttack(8)
+    data = walkthrough.initialize(8, seed='walkthrough')
+    export_session(data, str(tmp_path / 'bundle'))
+    bundle = load_session(str(tmp_path / 'bundle'))
+    # Another process (the web server) renders the steps: it must not attack again
+    monkeypatch.setattr(attack_module, 'attack', None)
+    attack_module._SESSION_CACHE.clear()
+    for session in (data, bundle):
+        for step in range(1, walkthrough.get_max_steps() + 1):
+            walkthrough.process_step(step, session)
+        result = attack_module.session_attack(session)
+        assert np.array_equal(result['plaintext'], data['plaintext'])
+    assert not attack_module._SESSION_CACHE
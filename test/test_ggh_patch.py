@@ -0,0 +1,59 @@
+import json
+import pytest
+from dash import Patch
+from plotly.utils import PlotlyJSONEncoder
+from lattice_based.ggh.ggh import GGH
+
+
+def as_json(value):
+    return json.loads(json.dumps(value, cls=PlotlyJSONEncoder, sort_keys=True))
+
+
+def apply_patch(state, patch):
+    """Applies the Extend/Insert/Assign operations of a Patch as the page does."""
+    for operation in patch.to_plotly_json()['operations']:
+        *path, last = operation['location']
+        target = state
+        for key in path:
+            target = target[key]
+        value = as_json(operation['params']['value'])
+        if operation['operation'] == 'Extend':
+            target[last].extend(value)
+        elif operation['operation'] == 'Insert':
+            target[last].insert(operation['params']['index'], value)
+        elif operation['operation'] == 'Assign':
+            target[last] = value
+        else:
+            raise AssertionError(f"Unexpected operation {operation['operation']}")
+    return state
+
+
+@pytest.mark.parametrize('dimension', [2, 4])
+def test_patch_adds_only_the_new_step(dimension):
+    ggh = GGH(dimension)
+    data = ggh.initialize(dimension, seed='patch')
+    previous, _ = ggh.process_step(5, data)
+    full, _ = ggh.process_step(6, data)
+    patch, _ = ggh.process_step_patch(6, data)
+    assert isinstance(patch, Patch)
+    if dimension == 2:
+        state = {'props': {'figure': as_json(previous.figure)}}
+        figure = apply_patch(state, patch)['props']['figure']
+        expected = as_json(full.figure)
+        assert figure['data'] == expected['data']
+        assert figure['layout']['annotations'] == expected['layout']['annotations']
+        # Only the ciphertext is sent
+        sent = patch.to_plotly_json()['operations'][0]['params']['value']
+        assert [trace['name'] for trace in sent] == ['Ciphertext']
+    else:
+        state = {'props': {'children': as_json(previous.children)}}
+        assert apply_patch(state, patch)['props']['children'] == as_json(full.children)
+        assert len(patch.to_plotly_json()['operations']) == 1
+
+
+def test_patch_falls_back_when_the_step_is_not_an_addition():
+    ggh = GGH(2)
+    data = ggh.initialize(2, seed='patch')
+    # Step 9 drops the private key drawn at step 8: the whole figure is sent
+    figure, _ = ggh.process_step_patch(9, data)
+    assert not isinstance(figure, Patch)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from lattice_based.ggh.ggh import GGH
+from lattice_based.sampling import Sampler
+
+MESSAGES = [f"mensagem {i}" for i in range(12)]
+
+
+def keys(exact, hnf):
+    ggh = GGH(12, exact=exact)
+    ggh.sampler = Sampler(f'sign-{exact}-{hnf}')
+    if hnf:
+        B_prime, public_key = ggh.generate_hnf_keys()
+    else:
+        _, B_prime, public_key, _ = ggh.generate_keys()
+    return ggh, B_prime, public_key
+
+
+@pytest.mark.parametrize('exact', [False, True])
+@pytest.mark.parametrize('hnf', [False, True])
+def test_signatures_verify(exact, hnf):
+    ggh, B_prime, public_key = keys(exact, hnf)
+    radius = ggh.signature_radius(B_prime)
+    transcript = []
+    signatures = ggh.sign(B_prime, MESSAGES, transcript)
+    assert ggh.verify(public_key, MESSAGES, signatures, radius).all()
+    assert len(transcript) == len(MESSAGES)
+
+
+@pytest.mark.parametrize('exact', [False, True])
+@pytest.mark.parametrize('hnf', [False, True])
+def test_forgeries_are_rejected(exact, hnf):
+    ggh, B_prime, public_key = keys(exact, hnf)
+    radius = ggh.signature_radius(B_prime)
+    signatures = ggh.sign(B_prime, MESSAGES)
+    # Off the lattice by one unit: close to the hash, but not a lattice vector
+    moved = np.array(signatures, dtype=object)
+    moved[:, 0] += 1
+    assert not ggh.verify(public_key, MESSAGES, moved, radius).any()
+    # A lattice vector, but the signature of another message
+    assert not ggh.verify(public_key, MESSAGES[1:] + MESSAGES[:1], signatures, radius).any()
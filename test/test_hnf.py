@@ -0,0 +1,41 @@
+import numpy as np
+from lattice_based.multimodular import determinant, integer_array, solve_exact
+from lattice_based.sampling import Sampler
+from lattice_reduction.hnf import hermite_normal_form, is_hermite_normal_form, reduce_modulo_hnf
+
+
+def same_lattice(B, H):
+    """H generates the lattice of B: H = X·B with X integral and |det H| = |det B|."""
+    _, denominator = solve_exact(integer_array(B).T, integer_array(H).T)
+    return denominator == 1 and abs(determinant(H)) == abs(determinant(B))
+
+
+def test_hnf_of_random_basis():
+    B = Sampler('hnf').uniform(-10, 10, (12, 12))
+    H = hermite_normal_form(B)
+    assert is_hermite_normal_form(H)
+    assert same_lattice(B, H)
+
+
+def test_hnf_of_non_cyclic_lattice():
+    # diag(2, 2, 1, ...)·U is not cyclic: the general elimination must run
+    U = np.eye(8, dtype=np.int64) + np.tril(Sampler('cyclic').uniform(-3, 3, (8, 8)), -1)
+    B = np.diag([2, 2] + [1] * 6) @ U
+    H = hermite_normal_form(B)
+    assert is_hermite_normal_form(H)
+    assert list(np.diag(H)).count(1) == 6
+    assert same_lattice(B, H)
+
+
+def test_is_hermite_normal_form_rejects():
+    assert not is_hermite_normal_form([[2, 1], [0, 3]])
+    assert not is_hermite_normal_form([[2, 0], [3, 1]])
+    assert is_hermite_normal_form([[5, 0], [3, 1]])
+
+
+def test_reduce_modulo_hnf():
+    B = Sampler('reduce').uniform(-10, 10, (6, 6))
+    H = hermite_normal_form(B)
+    v = Sampler('vector').uniform(-50, 50, 6)
+    lattice_vector = integer_array(Sampler('coefficients').uniform(-5, 5, 6)) @ integer_array(B)
+    assert np.array_equal(reduce_modulo_hnf(v, H), reduce_modulo_hnf(integer_array(v) + lattice_vector, H))
@@ -0,0 +1,51 @@
+import pytest
+from lattice_based.sampling import Sampler
+from lattice_reduction.lll import (PrecisionError, fits_float, is_lll_reduced, lll_reduce, lll_reduce_exact,
+                                   lll_reduce_float)
+from lattice_reduction.methods import random_bad_basis, random_qary_basis
+
+
+@pytest.mark.parametrize('dimension', [10, 30, 60])
+def test_float_lll_reduces_without_the_exact_fallback(dimension):
+    basis = random_bad_basis(dimension, Sampler(f'float-{dimension}'))
+    assert is_lll_reduced(lll_reduce_float(basis))
+
+
+def test_exact_lll_reduces():
+    basis = random_qary_basis(20, 100, Sampler('exact'))
+    assert is_lll_reduced(lll_reduce_exact(basis))
+    assert is_lll_reduced(lll_reduce(basis))
+
+
+def test_large_entries_skip_float64():
+    basis = random_qary_basis(60, 600, Sampler('large'))
+    assert not fits_float(basis)
+    with pytest.raises(PrecisionError):
+        lll_reduce_float(basis)
+    assert fits_float(random_qary_basis(60, 20, Sampler('small')))
+
+
+def test_step_text_and_curve_are_bounded():
+    from lattice_reduction.lll import LLL, SHOWN_OPERATIONS
+    from lattice_reduction.quality import MAX_TRACE_POINTS
+    lll = LLL(20)
+    data = lll.initialize(20, seed='bounded')
+    assert len(data['trace']) > SHOWN_OPERATIONS and len(data['quality']) > MAX_TRACE_POINTS
+    figure, text = lll.process_step(lll.get_max_steps(), data)
+    boxes = [child for child in text.children if getattr(child, 'className', None) == 'step-box']
+    assert len(boxes) <= SHOWN_OPERATIONS + 4
+    curve = figure.children[1].figure.data[0]
+    assert len(curve.x) <= MAX_TRACE_POINTS and curve.x[-1] == len(data['trace'])
+
+
+@pytest.mark.parametrize('dimension, exact', [(20, False), (30, False), (20, True)])
+def test_tracked_quality_matches_the_reduced_basis(dimension, exact):
+    from lattice_reduction.quality import QualityTracker, basis_quality
+    basis = random_qary_basis(dimension, 2 * dimension, Sampler(f'tracker-{dimension}'))
+    tracker = QualityTracker(basis)
+    reduced = lll_reduce(basis, exact=exact, tracker=tracker)
+    assert len(tracker.history) > 1
+    expected = basis_quality(reduced, condition=False)
+    for key, value in tracker.history[-1].items():
+        assert value == pytest.approx(expected[key], rel=1e-6), key
+    assert tracker.profile() == pytest.approx(expected['profile'], rel=1e-6, abs=1e-6)
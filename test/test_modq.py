@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from lattice_based import modq
+from lattice_based.sampling import Sampler
+
+# Small, just below the int64 limit of the kernel, and a large (object dtype) modulus
+MODULI = [97, 3329, (1 << 31) - 1, (1 << 61) - 1]
+
+
+def operands(q, shape, seed):
+    sampler = Sampler(f'{seed}-{q}')
+    values = sampler.uniform_below(1 << 31, shape)
+    if modq._is_large(q):
+        # Entries up to q, beyond int64 products
+        values = np.array([int(x) << 30 for x in values.flat], dtype=object).reshape(shape)
+    return modq.reduce(values, q)
+
+
+def as_objects(array):
+    return np.array(array, dtype=object)
+
+
+def negacyclic_reference(a, b, q):
+    n = len(a)
+    result = [0] * n
+    for i in range(n):
+        for j in range(n):
+            sign = 1 if i + j < n else -1
+            result[(i + j) % n] += sign * int(a[i]) * int(b[j])
+    return [x % q for x in result]
+
+
+@pytest.mark.parametrize('q', MODULI)
+def test_elementwise(q):
+    a, b = operands(q, (50,), 'a'), operands(q, (50,), 'b')
+    A, B = as_objects(a), as_objects(b)
+    assert list(modq.add(a, b, q)) == list((A + B) % q)
+    assert list(modq.sub(a, b, q)) == list((A - B) % q)
+    assert list(modq.neg(a, q)) == list((-A) % q)
+    assert list(modq.mul(a, b, q)) == list((A * B) % q)
+
+
+@pytest.mark.parametrize('q', MODULI)
+def test_matmul_and_dot(q):
+    a, b = operands(q, (7, 300), 'a'), operands(q, (300, 5), 'b')
+    expected = (as_objects(a).dot(as_objects(b))) % q
+    assert np.array_equal(as_objects(modq.matmul(a, b, q)), expected)
+    assert np.array_equal(as_objects(modq.dot(a, b.T[0], q)), expected[:, 0])
+
+
+@pytest.mark.parametrize('q', MODULI)
+def test_poly_mul(q):
+    a, b = operands(q, (16,), 'pa'), operands(q, (16,), 'pb')
+    assert [int(x) for x in modq.poly_mul(a, b, q)] == negacyclic_reference(a, b, q)
+
+
+@pytest.mark.parametrize('q', MODULI[:3])
+def test_poly_mul_batched(q):
+    # Shapes of the Alkaline keys: (batch, k, k, n) times (batch, 1, k, n)
+    a, b = operands(q, (3, 2, 2, 32), 'ba'), operands(q, (3, 1, 2, 32), 'bb')
+    expected = modq.matmul(a[..., None, :], modq.negacyclic_matrix(b), q)[..., 0, :]
+    assert np.array_equal(modq.poly_mul(a, b, q), expected)
@@ -0,0 +1,83 @@
+from fractions import Fraction
+import numpy as np
+import pytest
+from lattice_based.multimodular import determinant, integer_array, inverse_exact, round_division, solve_exact
+from lattice_based.sampling import Sampler
+
+
+def fraction_solve(A, Y):
+    """Gauss-Jordan elimination over the rationals (reference)."""
+    n = len(A)
+    M = [[Fraction(int(x)) for x in A[i]] + [Fraction(int(x)) for x in Y[i]] for i in range(n)]
+    for c in range(n):
+        pivot = next(r for r in range(c, n) if M[r][c])
+        M[c], M[pivot] = M[pivot], M[c]
+        M[c] = [x / M[c][c] for x in M[c]]
+        for r in range(n):
+            if r != c and M[r][c]:
+                M[r] = [x - M[r][c] * y for x, y in zip(M[r], M[c])]
+    return [row[n:] for row in M]
+
+
+def bareiss(A):
+    """Fraction-free determinant (reference)."""
+    M = [[int(x) for x in row] for row in A]
+    n, sign, previous = len(M), 1, 1
+    for k in range(n - 1):
+        if M[k][k] == 0:
+            swap = next((r for r in range(k + 1, n) if M[r][k]), None)
+            if swap is None:
+                return 0
+            M[k], M[swap], sign = M[swap], M[k], -sign
+        for i in range(k + 1, n):
+            for j in range(k + 1, n):
+                M[i][j] = (M[i][j] * M[k][k] - M[i][k] * M[k][j]) // previous
+        previous = M[k][k]
+    return sign * M[-1][-1]
+
+
+@pytest.mark.parametrize('scale', [1, 1 << 70])
+def test_solve_exact_matches_fractions(scale):
+    sampler = Sampler(f'solve-{scale}')
+    A = integer_array(sampler.uniform(-50, 50, (8, 8))) * scale + integer_array(np.eye(8, dtype=np.int64))
+    Y = integer_array(sampler.uniform(-50, 50, (8, 3)))
+    N, d = solve_exact(A, Y)
+    expected = fraction_solve(A, Y)
+    assert d > 0
+    assert all(Fraction(int(N[i, j]), d) == expected[i][j] for i in range(8) for j in range(3))
+    vector, vector_d = solve_exact(A, Y[:, 0])
+    assert vector.shape == (8,) and all(Fraction(int(vector[i]), vector_d) == expected[i][0] for i in range(8))
+
+
+def test_determinant_matches_bareiss():
+    sampler = Sampler('determinant')
+    for size in (1, 5, 12):
+        A = sampler.uniform(-1000, 1000, (size, size))
+        assert determinant(A) == bareiss(A)
+    singular = np.array([[1, 2, 3], [2, 4, 6], [0, 1, 5]])
+    assert determinant(singular) == 0
+    with pytest.raises(ValueError):
+        solve_exact(singular, [1, 2, 3])
+
+
+def test_unimodular_inverse_is_integral():
+    U = np.eye(6, dtype=np.int64) + np.triu(Sampler('unimodular').uniform(-9, 9, (6, 6)), 1)
+    U = U @ U.T
+    inverse, d = inverse_exact(U)
+    assert d == 1
+    assert np.array_equal(integer_array(U) @ inverse, integer_array(np.eye(6, dtype=np.int64)))
+
+
+def test_round_division():
+    numerators = integer_array([-7, -5, 5, 7, 10 ** 30 + 1])
+    assert list(round_division(numerators, 2)) == [-3, -2, 3, 4, 5 * 10 ** 29 + 1]
+
+
+def test_lists_of_large_integers_stay_exact():
+    # NumPy would turn this list into float64 (an entry above 2**63 next to a negative one)
+    p = 12073067044377381077
+    A = [[p, -1], [5, 1]]
+    assert determinant(A) == p + 5
+    assert determinant([[p, 0], [5, 1]]) == p
+    N, d = solve_exact(A, [1, 1])
+    assert [Fraction(int(x), d) for x in N] == [Fraction(2, p + 5), Fraction(p - 5, p + 5)]
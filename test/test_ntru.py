@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from lattice_based.ntru.ntru import NTRU, center, cyclic_convolution, poly_inverse
+from lattice_based.sampling import Sampler
+
+
+def naive_convolution(a, b):
+    n = len(a)
+    return [sum(int(a[i]) * int(b[(k - i) % n]) for i in range(n)) for k in range(n)]
+
+
+def test_cyclic_convolution_matches_naive():
+    sampler = Sampler('convolution')
+    a, b = sampler.uniform(-1000, 1000, 31), sampler.uniform(-(1 << 40), 1 << 40, 31)
+    assert list(cyclic_convolution(a, b)) == naive_convolution(a, b)
+    assert list(cyclic_convolution(a, b, 2048)) == [x % 2048 for x in naive_convolution(a, b)]
+
+
+@pytest.mark.parametrize('N', [11, 53, 107])
+def test_keys_are_inverses(N):
+    ntru = NTRU(N, sampler=Sampler(f'keys-{N}'))
+    f, g, F_p, F_q, h = ntru.generate_keys()
+    one = np.eye(1, ntru.N, dtype=np.int64)[0]
+    assert np.array_equal(cyclic_convolution(f, F_p, ntru.p), one)
+    assert np.array_equal(cyclic_convolution(f, F_q, ntru.q), one)
+    assert poly_inverse(np.zeros(ntru.N, dtype=np.int64), ntru.q) is None
+
+
+@pytest.mark.parametrize('N', [11, 53, 107])
+def test_decrypt_recovers_the_messages(N):
+    ntru = NTRU(N, sampler=Sampler(f'decrypt-{N}'))
+    f, _, F_p, _, h = ntru.generate_keys()
+    messages = ntru.random_messages(20)
+    ciphertexts = ntru.encrypt(h, messages)
+    assert np.array_equal(ntru.decrypt(f, F_p, ciphertexts), messages)
+    assert np.array_equal(ntru.decrypt(f, F_p, ciphertexts[0]), messages[0])
+
+
+def test_session_is_replayed_from_its_seed():
+    data = NTRU().initialize(20, seed='ntru')
+    again = NTRU().initialize(20, seed='ntru')
+    assert data == again
+    ntru = NTRU(data['N'])
+    assert ntru.decrypt(np.array(data['f']), np.array(data['F_p']), np.array(data['ciphertext'])).tolist() \
+        == data['message']
+    assert list(center([0, 1, 2046, 2047], 2048)) == [0, 1, -2, -1]
@@ -0,0 +1,55 @@
+import numpy as np
+from lattice_based import modq
+from lattice_based.primal import embedding, estimate_primal, primal_attack, solve_mod
+from lattice_based.sampling import Sampler
+
+
+def lwe_sample(seed, n, m, q, bound):
+    sampler = Sampler(seed)
+    A = sampler.uniform_below(q, (m, n))
+    s = sampler.uniform_below(q, n)
+    e = sampler.uniform(-bound, bound, m)
+    return A, s, e, (A @ s + e) % q
+
+
+def test_solve_mod():
+    A, s, _, _ = lwe_sample('solve', 6, 8, 97, 0)
+    x = solve_mod(A, (A @ s) % 97, 97)
+    assert np.array_equal(modq.matmul(A, x, 97), (A @ s) % 97)
+
+
+def test_attack_recovers_small_errors():
+    A, s, e, b = lwe_sample('small', 25, 45, 3329, 2)
+    result = primal_attack(A, b, 3329, 2)
+    assert result['method'] is not None
+    assert np.array_equal(np.array(result['secret']) % 3329, s)
+    assert np.array_equal(np.abs(result['error']), np.abs(e))
+
+
+def test_attack_rejects_rows_beyond_the_error_bound():
+    # Every row (..., ±M) solves A·s + e = b; with errors up to 20 the short
+    # rows found here are not the planted ones and must not be accepted
+    A, s, e, b = lwe_sample('case0', 25, 45, 3329, 20)
+    result = primal_attack(A, b, 3329, 20, block_sizes=(10,))
+    if result['secret'] is None:
+        assert result['method'] is None
+    else:
+        assert max(abs(x) for x in result['error']) <= 20
+        assert np.array_equal(np.array(result['secret']) % 3329, s)
+
+
+def test_small_secret_embedding_contains_the_short_vector():
+    sampler = Sampler('embedding')
+    A = sampler.uniform_below(17, (5, 3))
+    s = sampler.uniform(-1, 1, 3)
+    e = sampler.uniform(-1, 1, 5)
+    b = (A @ s + e) % 17
+    basis = np.array(embedding(A, b, 17, small_secret=True), dtype=object)
+    target = np.concatenate([s, e, [1]]).astype(object)
+    # The short vector is an integer combination of the rows
+    coefficients = np.linalg.solve(basis.T.astype(float), target.astype(float))
+    assert np.allclose(coefficients, np.round(coefficients))
+
+
+def test_estimate_grows_with_the_error():
+    assert estimate_primal(256, 3329, 1.0)['beta'] < estimate_primal(256, 3329, 3.0)['beta']
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from lattice_based.sampling import Sampler
+from lattice_based.serialization import (alkaline_sizes, compress, decode_alkaline_ciphertext,
+                                         decode_alkaline_public_key, decode_alkaline_secret_key,
+                                         decode_lwe_ciphertext, decode_lwe_public_key, decompress,
+                                         encode_alkaline_ciphertext, encode_alkaline_public_key,
+                                         encode_alkaline_secret_key, encode_lwe_ciphertext,
+                                         encode_lwe_public_key, expand_matrix, pack_bits, unpack_bits)
+
+Q, K, N = 3329, 2, 16
+
+
+@pytest.mark.parametrize('bits', [1, 7, 12, 33, 64])
+def test_pack_round_trip(bits):
+    values = Sampler(f'pack-{bits}').uniform_below(1 << min(bits, 62), 37).astype(np.uint64)
+    if bits == 64:
+        values[0] = np.uint64((1 << 64) - 1)
+    data = pack_bits(values, bits)
+    assert len(data) == (37 * bits + 7) // 8
+    assert np.array_equal(unpack_bits(data, bits, 37), values)
+
+
+def test_lwe_round_trip():
+    sampler = Sampler('lwe')
+    A, B = sampler.uniform_below(97, 20), sampler.uniform_below(97, 20)
+    decoded_A, decoded_B, q = decode_lwe_public_key(encode_lwe_public_key(A, B, 97))
+    assert q == 97 and np.array_equal(decoded_A, A) and np.array_equal(decoded_B, B)
+    assert decode_lwe_ciphertext(encode_lwe_ciphertext(5, 96, 97)) == (5, 96, 97)
+
+
+def test_alkaline_keys_round_trip():
+    sampler = Sampler('alkaline')
+    A, t = sampler.uniform_below(Q, (K, K, N)), sampler.uniform_below(Q, (K, N))
+    decoded_A, decoded_t, _ = decode_alkaline_public_key(encode_alkaline_public_key(t, Q, A=A))
+    assert np.array_equal(decoded_A, A) and np.array_equal(decoded_t, t)
+    seeded = encode_alkaline_public_key(t, Q, A=expand_matrix(b'seed', K, N, Q), seed=b'seed')
+    decoded_A, decoded_t, _ = decode_alkaline_public_key(seeded)
+    assert np.array_equal(decoded_A, expand_matrix(b'seed', K, N, Q)) and np.array_equal(decoded_t, t)
+    sizes = alkaline_sizes(N, K, Q, seed_bytes=4)
+    assert len(seeded) == sizes['seeded_public_key'] < sizes['public_key']
+    s = sampler.uniform(-2, 2, (K, N))
+    decoded_s, _ = decode_alkaline_secret_key(encode_alkaline_secret_key(s, Q))
+    assert np.array_equal(decoded_s, s)
+
+
+def test_alkaline_ciphertext_round_trip():
+    sampler = Sampler('ciphertext')
+    u, v = sampler.uniform_below(Q, (K, N)), sampler.uniform_below(Q, N)
+    decoded_u, decoded_v, _ = decode_alkaline_ciphertext(encode_alkaline_ciphertext(u, v, Q))
+    assert np.array_equal(decoded_u, u) and np.array_equal(decoded_v, v)
+    # Compressed parts come back within q / 2**(d + 1) (distance modulo q)
+    data = encode_alkaline_ciphertext(u, v, Q, d_u=10, d_v=4)
+    assert len(data) == alkaline_sizes(N, K, Q, d_u=10, d_v=4)['ciphertext']
+    decoded_u, decoded_v, _ = decode_alkaline_ciphertext(data)
+    for original, decoded, d in ((u, decoded_u, 10), (v, decoded_v, 4)):
+        distance = np.abs((decoded - original + Q // 2) % Q - Q // 2)
+        assert distance.max() <= Q / 2 ** (d + 1) + 1
+
+
+def test_compress_bounds():
+    x = np.arange(Q)
+    error = np.abs((decompress(compress(x, Q, 4), Q, 4) - x + Q // 2) % Q - Q // 2)
+    assert error.max() <= Q / 2 ** 5 + 1
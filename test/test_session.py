@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from lattice_based.ggh.ggh import GGH
+from lattice_based.session import bundle_name, export_session, load_session, session_path
+from lattice_reduction.gauss import GaussReduction
+from lattice_reduction.lll import LLL
+
+
+def plain(value):
+    """Nested lists of Python scalars, whatever the arrays or integer types."""
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [plain(x) for x in value]
+    if isinstance(value, dict):
+        return {key: plain(x) for key, x in value.items()}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def sessions():
+    ggh = GGH(6, exact=True)
+    yield ggh, ggh.initialize(6, seed='bundle')
+    lll = LLL(8)
+    yield lll, lll.initialize(8, seed='bundle')
+    gauss = GaussReduction()
+    yield gauss, gauss.initialize(2, seed='bundle')
+
+
+@pytest.mark.parametrize('suffix', ['', '.npz'])
+def test_round_trip(tmp_path, suffix):
+    for instance, data in sessions():
+        path = tmp_path / f"{bundle_name(data)}{suffix}"
+        export_session(data, str(path))
+        bundle = load_session(str(path))
+        assert set(bundle) == set(data)
+        for key, value in data.items():
+            assert plain(bundle[key]) == plain(value), key
+        # Every step renders from the bundle as from the original data
+        for step in range(instance.get_max_steps() + 1):
+            instance.process_step(step, bundle)
+
+
+def test_large_integers_survive(tmp_path):
+    data = {'method': 'LLL', 'dimension': 2, 'seed': 'x', 'basis': [[1 << 100, -(1 << 70)], [-3, 5]]}
+    export_session(data, str(tmp_path / 'big'))
+    assert load_session(str(tmp_path / 'big'))['basis'].tolist() == data['basis']
+
+
+def test_session_path_stays_inside(tmp_path):
+    assert session_path('a', str(tmp_path)).startswith(str(tmp_path))
+    for name in ('../escape', '/etc', '.'):
+        with pytest.raises(ValueError):
+            session_path(name, str(tmp_path))
@@ -0,0 +1,33 @@
+import pytest
+from lattice_based.sampling import Sampler
+from lattice_reduction.enumeration import enumerate_svp, gram_schmidt
+from lattice_reduction.lll import lll_reduce
+from lattice_reduction.methods import random_qary_basis
+from lattice_reduction.sieve import compare_with_enumeration, gauss_sieve
+
+
+@pytest.mark.parametrize('dimension', [10, 20, 30])
+def test_sieve_matches_enumeration(dimension):
+    basis = random_qary_basis(dimension, 2 * dimension, Sampler(f'sieve-{dimension}'))
+    vector, norm2, stats = gauss_sieve(basis, sampler=Sampler(f'sieve-run-{dimension}'))
+    reduced = lll_reduce(basis)
+    _, enum_norm2, _ = enumerate_svp(*gram_schmidt(reduced))
+    assert norm2 == pytest.approx(enum_norm2)
+    assert sum(x * x for x in vector) == round(norm2)
+    assert stats['list_size'] > 0
+
+
+def test_sieve_without_iterations():
+    basis = random_qary_basis(10, 20, Sampler('sieve-empty'))
+    vector, norm2, stats = gauss_sieve(basis, max_iterations=0, sampler=Sampler('sieve-empty'))
+    assert stats['iterations'] == 0 and stats['list_size'] == 0
+    assert vector in lll_reduce(basis) and sum(x * x for x in vector) == norm2
+
+
+def test_compare_with_enumeration():
+    basis = random_qary_basis(12, 24, Sampler('sieve-compare'))
+    result = compare_with_enumeration(basis, Sampler('sieve-compare'))
+    sieve, enumeration = result['sieve'], result['enumeration']
+    assert {'iterations', 'collisions', 'peak_list_size', 'memory', 'time'} <= sieve.keys()
+    assert {'nodes', 'memory', 'time'} <= enumeration.keys()
+    assert sieve['norm2'] == pytest.approx(enumeration['norm2'])
@@ -0,0 +1,28 @@
+import threading
+import time
+from lattice_based.sampling import session_sampler
+from lattice_reduction.lll import lll_reduce
+from lattice_reduction.methods import random_bad_basis
+from lattice_reduction.stream import live_reduction
+
+
+def test_stopped_reduction_returns_the_basis_reached():
+    _, sampler = session_sampler('stop')
+    basis = random_bad_basis(10, sampler)
+    stop = threading.Event()
+    stop.set()
+    trace = []
+    assert lll_reduce(basis, stop=stop, trace=trace) == [[int(x) for x in row] for row in basis]
+    assert trace == []
+
+
+def test_closing_the_stream_stops_the_reduction():
+    before = threading.active_count()
+    events = live_reduction(120, 'close', frame_rate=50)
+    assert next(events).startswith('event: frame')
+    assert threading.active_count() == before + 1
+    events.close()
+    deadline = time.time() + 2
+    while threading.active_count() > before and time.time() < deadline:
+        time.sleep(0.01)
+    assert threading.active_count() == before